@@ -1,10 +1,14 @@
-from flask import Flask, jsonify, request, Response
+from flask import Flask, jsonify, request, Response, g
 from database_service import db_service
+import loaders
+from pagination import decode_sync_token, parse_page_args
+from projections import resolve_fields
+from autocomplete import normalize as normalize_text
+from recipe_attributes import CATEGORY_FILTERS
+from leaderboards import METRICS as LEADERBOARD_METRICS
 from flask_cors import CORS
 import logging
-from decimal import Decimal
 import json
-from datetime import datetime
 from flask_jwt_extended import jwt_required, JWTManager, create_access_token, get_jwt_identity
 import traceback
 from datetime import timedelta
@@ -14,18 +18,16 @@ import pyodbc
 import re
 import requests
 import os
-
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+import atexit
+from urllib.parse import quote
+from http_cache import ResponseCache, cache_policy
+from json_stream import stream_json_array, stream_json_rows
+from json_provider import FastJSONProvider
+from fanout import FanOut, Part
 
 app = Flask(__name__)
-app.config['JSON_AS_ASCII'] = False  # Türkçe karakter desteği
-app.json_encoder = CustomJSONEncoder  # Özel JSON encoder'ı ayarla
+# Türkçe karakterler kaçışsız, Decimal sayı, tarih ISO 8601 (orjson kuruluysa onunla)
+app.json = FastJSONProvider(app)
 
 # JWT ayarları
 app.config['JWT_SECRET_KEY'] = 'gizli-anahtar-123'  # Güvenli bir anahtar kullanın
@@ -35,15 +37,79 @@ jwt = JWTManager(app)
 # CORS ayarlarını güncelle
 CORS(app, resources={r"/api/*": {"origins": "*", "methods": ["GET", "POST", "PUT", "DELETE"]}})
 
+# ETag/304, Cache-Control ve gzip/brotli sıkıştırma (rotalar @cache_policy ile işaretlenir)
+response_cache = ResponseCache(app)
+
+# Mobil ekran uç noktalarının parçaları paralel yüklenir (bağlantı havuzundan küçük tutulur)
+screen_fanout = FanOut(max_workers=8, name='screen')
+
+# Toplu favori/puan sorgusunda kabul edilen en fazla tarif sayısı
+MAX_BULK_RECIPE_IDS = 500
+
+# /api/batch isteğinde kabul edilen en fazla işlem sayısı
+MAX_BATCH_OPERATIONS = 100
+
+# /api/sync yanıtında tür başına en fazla değişiklik sayısı
+MAX_SYNC_LIMIT = 2000
+
 # Logging ayarları
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+def recipe_list_payload(recipes, limit):
+    """Sayfalama istenmişse listeyi `next_cursor` ile birlikte sarar.
+
+    `limit`/`cursor` gönderilmeyen eski istemciler düz listeyi almaya devam eder.
+    """
+    if limit is None:
+        return recipes
+    return {'recipes': recipes, 'next_cursor': recipes.next_cursor}
+
+def wants_stream(args, limit):
+    """Sayfasız tam liste `?stream=1` ile istenmişse bellekte kurulmadan akıtılır.
+
+    Akış yanıtları ETag almaz (304 dönemez) ve okuma önbelleğinden geçmez;
+    dışa aktarma gibi büyük listeler içindir. Varsayılan tamponlu yoldur.
+    """
+    return limit is None and args.get('stream') in ('1', 'true')
+
+@app.before_request
+def open_loader_scope():
+    # İstek boyunca nokta sorguları toplanıp tek IN sorgusunda çalıştırılır
+    g.loader_scope = db_service.begin_request_scope()
+
+@app.teardown_request
+def close_loader_scope(exc):
+    token = g.pop('loader_scope', None)
+    if token is not None:
+        db_service.end_request_scope(token)
+
 @app.route('/')
 def home():
     return jsonify({'message': 'Lezzetli Tarifler API çalışıyor!'})
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Bağlantı havuzu gibi iç bileşenlerin metriklerini döndürür"""
+    return jsonify({
+        'pool': db_service.pool.stats(),
+        'user_state_cache': db_service.user_states.stats(),
+        'read_cache': db_service.read_cache.stats(),
+        'loaders': loaders.stats.snapshot(),
+        'view_counter': db_service.views.stats(),
+        'search_index': db_service.search_index.stats(),
+        'spelling': db_service.spelling.stats(),
+        'ingredient_index': db_service.ingredient_index.stats(),
+        'autocomplete': db_service.autocomplete.stats(),
+        'similarity': db_service.similarity.stats(),
+        'recommendations': db_service.recommendations.stats(),
+        'leaderboards': db_service.leaderboards.stats(),
+        'http_cache': response_cache.stats(),
+        'screen_fanout': screen_fanout.stats()
+    })
+
 @app.route('/api/categories', methods=['GET'])
+@cache_policy(max_age=3600)
 def get_categories():
     try:
         categories = db_service.get_categories()
@@ -54,44 +120,121 @@ def get_categories():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/recipes', methods=['GET'])
+@cache_policy(max_age=60)
 def get_recipes():
     try:
-        recipes = db_service.get_recipes()
-        return jsonify(recipes)
+        limit, after = parse_page_args(request.args)
+        fields = resolve_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        if wants_stream(request.args, limit):
+            return stream_json_rows(db_service.stream_recipes(fields=fields))
+        recipes = db_service.get_recipes(limit=limit, after=after, fields=fields)
+        return jsonify(recipe_list_payload(recipes, limit))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/recipes/category/<int:category_id>', methods=['GET'])
+@cache_policy(max_age=60)
 def get_recipes_by_category(category_id):
     try:
-        recipes = db_service.get_recipes_by_category(category_id)
+        limit, after = parse_page_args(request.args)
+        fields = resolve_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        if wants_stream(request.args, limit):
+            return stream_json_rows(db_service.stream_recipes_by_category(category_id, fields=fields))
+        recipes = db_service.get_recipes_by_category(category_id, limit=limit, after=after, fields=fields)
         print(f"Category {category_id} recipes response:", recipes)  # Debug print
-        return jsonify(recipes)
+        return jsonify(recipe_list_payload(recipes, limit))
     except Exception as e:
         print(f"Error in category recipes endpoint: {str(e)}")  # Debug print
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/top-recipes', methods=['GET'])
+@cache_policy(max_age=60)
 def get_top_recipes():
+    """Ölçüte göre en iyi tarifler: ?by=views|rating|favorites|trending&category=&limit="""
+    by = request.args.get('by', 'views')
+    if by not in LEADERBOARD_METRICS:
+        return jsonify({'error': f"by şunlardan biri olmalı: {', '.join(LEADERBOARD_METRICS)}"}), 400
+    try:
+        fields = resolve_fields(request.args.get('fields'))
+        category_id = request.args.get('category', type=int)
+        limit = int(request.args.get('limit', 10))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not 1 <= limit <= 50:
+        return jsonify({'error': 'limit 1 ile 50 arasında olmalı'}), 400
     try:
-        recipes = db_service.get_top_recipes()
-        print("Top recipes endpoint response:", recipes)  # Debug print
+        recipes = db_service.get_top_recipes(fields=fields, by=by, category_id=category_id, limit=limit)
         return jsonify(recipes)
     except Exception as e:
         print(f"Error in top recipes endpoint: {str(e)}")  # Debug print
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/recipes/search', methods=['GET'])
+@cache_policy(max_age=60, shared=False)
 def search_recipes():
+    try:
+        limit, after = parse_page_args(request.args)
+        fields = resolve_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
         query = request.args.get('q', '')
-        recipes = db_service.search_recipes(query)
+        mode = request.args.get('mode')
+        if mode not in ('and', 'or', 'fuzzy'):
+            mode = 'and'
+        if wants_stream(request.args, limit):
+            did_you_mean, recipes = db_service.stream_search_recipes(query, fields=fields, mode=mode)
+            response = stream_json_array(recipes)
+            if did_you_mean:
+                response.headers['X-Did-You-Mean'] = quote(did_you_mean)
+            return response
+        try:
+            recipes = db_service.search_recipes(query, limit=limit, after=after, fields=fields, mode=mode)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         print(f"Search recipes response for query '{query}':", recipes)  # Debug print
-        return jsonify(recipes)
+        did_you_mean = getattr(recipes, 'did_you_mean', None)
+        payload = recipe_list_payload(recipes, limit)
+        if isinstance(payload, dict):
+            payload['did_you_mean'] = did_you_mean
+        response = jsonify(payload)
+        if did_you_mean:
+            # Düz liste dönen eski istemciler öneriyi başlıktan okuyabilir
+            response.headers['X-Did-You-Mean'] = quote(did_you_mean)
+        return response
     except Exception as e:
         print(f"Error in search recipes endpoint: {str(e)}")  # Debug print
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/autocomplete', methods=['GET'])
+@cache_policy(max_age=300, shared=False)
+def autocomplete():
+    """Yazarken tamamlama: öneke uyan tarif başlıkları ve malzeme adları"""
+    prefix = request.args.get('q', '')
+    kind = request.args.get('type', 'all')
+    kinds = {'all': ('recipes', 'ingredients'), 'recipes': ('recipes',), 'ingredients': ('ingredients',)}.get(kind)
+    if kinds is None:
+        return jsonify({'error': "type 'all', 'recipes' ya da 'ingredients' olmalı"}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({'error': 'limit bir sayı olmalı'}), 400
+    if not 1 <= limit <= 10:
+        return jsonify({'error': 'limit 1 ile 10 arasında olmalı'}), 400
+    try:
+        result = db_service.autocomplete_prefix(prefix, limit, kinds)
+        result['query'] = prefix
+        return jsonify(result)
+    except Exception as e:
+        app.logger.exception("Error in autocomplete endpoint")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/auth/login', methods=['POST'])
 def login():
     try:
@@ -192,17 +335,22 @@ def change_password():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/recipes/user/<user_id>', methods=['GET'])
+@cache_policy(max_age=60)
 def get_user_recipes(user_id):
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
         logger.info(f"Received request for user_id: {user_id}")
         # user_id'yi int'e çevir
         user_id = int(user_id)
         logger.info(f"Converted user_id to int: {user_id}")
         
-        recipes = db_service.get_user_recipes(user_id)
+        recipes = db_service.get_user_recipes(user_id, limit=limit, after=after)
         logger.info(f"Successfully retrieved {len(recipes)} recipes")
         
-        response = jsonify(recipes)
+        response = jsonify(recipe_list_payload(recipes, limit))
         response.headers.add('Access-Control-Allow-Origin', '*')
         return response
         
@@ -253,6 +401,7 @@ def remove_from_favorites():
         return jsonify({'message': str(e)}), 500
 
 @app.route('/api/favorites/check', methods=['GET'])
+@cache_policy(private=True)
 def check_favorite():
     try:
         user_id = request.args.get('user_id')
@@ -271,24 +420,86 @@ def check_favorite():
     except Exception as e:
         return jsonify({'message': str(e)}), 500
 
+@app.route('/api/recipes/user-status', methods=['POST'])
+def get_user_recipe_states():
+    """Birden çok tarif için favori durumunu ve kullanıcının puanını tek istekte döndürür"""
+    try:
+        data = request.get_json()
+        user_id = data.get('user_id')
+        recipe_ids = data.get('recipe_ids')
+
+        if not user_id or not isinstance(recipe_ids, list):
+            return jsonify({'message': 'Kullanıcı ID ve tarif ID listesi gerekli'}), 400
+        if len(recipe_ids) > MAX_BULK_RECIPE_IDS:
+            return jsonify({'message': f'En fazla {MAX_BULK_RECIPE_IDS} tarif sorgulanabilir'}), 400
+        try:
+            recipe_ids = [int(recipe_id) for recipe_id in recipe_ids]
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Tarif ID listesi yalnızca sayı içermelidir'}), 400
+
+        states, error = db_service.get_user_recipe_states(user_id, recipe_ids)
+
+        if error:
+            return jsonify({'message': error}), 400
+
+        return jsonify({'states': {str(recipe_id): state for recipe_id, state in states.items()}}), 200
+
+    except Exception as e:
+        return jsonify({'message': str(e)}), 500
+
 @app.route('/api/favorites', methods=['GET'])
+@cache_policy(private=True)
 def get_user_favorites():
     try:
         user_id = request.args.get('user_id')
         
         if not user_id:
             return jsonify({'message': 'Kullanıcı ID gerekli'}), 400
+
+        try:
+            limit, after = parse_page_args(request.args)
+            fields = resolve_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
             
-        recipes, error = db_service.get_user_favorites(user_id)
+        recipes, error = db_service.get_user_favorites(user_id, limit=limit, after=after, fields=fields)
         
         if error:
             return jsonify({'message': error}), 400
             
-        return jsonify({'recipes': recipes}), 200
+        return jsonify({'recipes': recipes, 'next_cursor': recipes.next_cursor}), 200
             
     except Exception as e:
         return jsonify({'message': str(e)}), 500
 
+@app.route('/api/recommendations', methods=['GET'])
+@cache_policy(max_age=60, private=True)
+def get_recommendations():
+    """Kullanıcının favori ve puanlarına göre önerilen tarifler"""
+    try:
+        user_id = int(request.args.get('user_id', ''))
+    except ValueError:
+        return jsonify({'message': 'Kullanıcı ID gerekli'}), 400
+    try:
+        limit = int(request.args.get('limit', 20))
+        fields = resolve_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    if not 1 <= limit <= 50:
+        return jsonify({'message': 'limit 1 ile 50 arasında olmalı'}), 400
+    try:
+        recipes = db_service.get_recommendations(user_id, limit, fields)
+        if recipes is None:
+            return jsonify({'message': 'Öneri modeli şu anda kullanılamıyor'}), 503
+        return jsonify({
+            'user_id': user_id,
+            'personalized': any(r['recommendation_source'] == 'personal' for r in recipes),
+            'recipes': recipes,
+        })
+    except Exception:
+        app.logger.exception("Error getting recommendations")
+        return jsonify({'message': 'Öneriler alınırken bir hata oluştu'}), 500
+
 @app.route('/api/recipes/create', methods=['POST'])
 def create_recipe():
     try:
@@ -323,6 +534,50 @@ def create_recipe():
         print(f"Create recipe endpoint error: {str(e)}")  # Debug print
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/recipes/<int:recipe_id>', methods=['GET'])
+def get_recipe_detail(recipe_id):
+    """Tarif detayını döndürür ve görüntülenmeyi sayar"""
+    try:
+        fields = resolve_fields(request.args.get('fields'), default='full')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        recipe = db_service.get_recipe_detail(recipe_id, fields=fields)
+        if not recipe:
+            return jsonify({'error': 'Tarif bulunamadı'}), 404
+
+        # Aynı kullanıcının kısa sürede tekrar açması tekrar sayılmaz
+        viewer = request.args.get('user_id') or request.remote_addr
+        db_service.record_view(recipe_id, viewer)
+        if 'views' in recipe:
+            recipe['views'] = (recipe['views'] or 0) + db_service.views.pending_for(recipe_id)
+        return jsonify(recipe)
+    except Exception:
+        app.logger.exception("Error getting recipe detail")
+        return jsonify({'error': 'Tarif detayı alınırken bir hata oluştu'}), 500
+
+@app.route('/api/recipes/<int:recipe_id>/similar', methods=['GET'])
+@cache_policy(max_age=600)
+def get_similar_recipes(recipe_id):
+    """Malzemeleri en çok benzeyen tarifler; her kartta `similarity` (0-1) skoru bulunur"""
+    try:
+        fields = resolve_fields(request.args.get('fields'))
+        limit = int(request.args.get('limit', 10))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not 1 <= limit <= 10:
+        return jsonify({'error': 'limit 1 ile 10 arasında olmalı'}), 400
+    try:
+        recipes = db_service.get_similar_recipes(recipe_id, limit, fields)
+        if recipes is None:
+            if not db_service.similarity.ready:
+                return jsonify({'error': 'Benzer tarif indeksi şu anda kullanılamıyor'}), 503
+            return jsonify({'error': 'Tarif bulunamadı'}), 404
+        return jsonify(recipes)
+    except Exception:
+        app.logger.exception("Error getting similar recipes")
+        return jsonify({'error': 'Benzer tarifler alınırken bir hata oluştu'}), 500
+
 @app.route('/api/recipes/<int:recipe_id>/rate', methods=['POST'])
 def rate_recipe(recipe_id):
     try:
@@ -341,7 +596,8 @@ def rate_recipe(recipe_id):
             return jsonify({
                 'message': 'Puan başarıyla verildi',
                 'average_rating': result['average_rating'],
-                'rating_count': result['rating_count']
+                'rating_count': result['rating_count'],
+                'histogram': result['histogram']
             }), 200
         else:
             return jsonify({'error': result.get('message')}), 400
@@ -351,6 +607,7 @@ def rate_recipe(recipe_id):
         return jsonify({'error': 'Puan verme işlemi sırasında bir hata oluştu'}), 500
 
 @app.route('/api/recipes/<int:recipe_id>/user-rating', methods=['GET'])
+@cache_policy(private=True)
 def get_user_rating(recipe_id):
     try:
         user_id = request.args.get('user_id')
@@ -365,6 +622,7 @@ def get_user_rating(recipe_id):
         return jsonify({'error': 'Kullanıcı puanı alınırken bir hata oluştu'}), 500
 
 @app.route('/api/recipes/<int:recipe_id>/comments', methods=['GET'])
+@cache_policy()
 def get_recipe_comments(recipe_id):
     """Tarife ait yorumları getirir"""
     try:
@@ -419,125 +677,207 @@ def delete_comment(comment_id):
         print(f"Error deleting comment: {str(e)}")
         return jsonify({'error': 'Yorum silinirken bir hata oluştu'}), 500
 
-def extract_minutes(cooking_time):
-    if not cooking_time:
-        return 0
-    # Sadece ilk bulduğu sayıyı alır
-    match = re.search(r'(\d+)', str(cooking_time))
-    if match:
-        return int(match.group(1))
-    return 0
-
 @app.route('/api/mobile/suggest_recipes', methods=['POST'])
 def suggest_recipes():
+    """Seçili malzemeleri en çok karşılayan ilk 15 tarifi döndürür"""
     data = request.get_json(force=True)
-    print('[DEBUG] Received request data:', data)
+    logger.debug('suggest_recipes isteği: %s', data)
     
     selected_ingredients = data.get('selectedIngredients', [])
     filters = data.get('filters', {})
-    print('[DEBUG] Selected ingredients:', selected_ingredients)
-    print('[DEBUG] Filters:', filters)
 
     if not selected_ingredients:
-        print('[DEBUG] No ingredients selected, returning empty list')
         return jsonify([])
 
-    like_clauses = []
-    params = []
-    for ing in selected_ingredients:
-        like_clauses.append("ingredients LIKE ?")
-        params.append(f"%{ing}%")
-    where_sql = "(" + " OR ".join(like_clauses) + ")"
-
-    # Kategori ve porsiyon filtrelerini SQL'de uygula
-    if filters.get('yemek_turu') and filters['yemek_turu'] != 'Tümü':
-        print('[DEBUG] Adding category filter:', filters['yemek_turu'])
-        where_sql += " AND category_id = ?"
-        kategori_map = {
-            'Ana Yemek': 1,
-            'Aperatif': 5,
-            'Çorba': 2,
-            'İçecek': 6,
-            'Kahvaltılık': 7,
-            'Salata': 3,
-            'Tatlı': 4,
-        }
-        category_id = kategori_map.get(filters['yemek_turu'])
-        print('[DEBUG] Mapped category ID:', category_id)
-        params.append(category_id)
-
-    if filters.get('porsiyon') and filters['porsiyon'] != 'Tümü':
-        porsiyon = filters['porsiyon']
-        print('[DEBUG] Adding serving size filter:', porsiyon)
-        if porsiyon == '1-2 Kişilik':
-            where_sql += " AND serving_size LIKE ?"
-            params.append('%1-2%')
-        elif porsiyon == '3-4 Kişilik':
-            where_sql += " AND serving_size LIKE ?"
-            params.append('%3-4%')
-        elif porsiyon == '5-6 Kişilik':
-            where_sql += " AND serving_size LIKE ?"
-            params.append('%5-6%')
-        elif porsiyon == '6+ Kişilik':
-            where_sql += " AND (serving_size LIKE ? OR TRY_CAST(serving_size AS INT) >= ?)"
-            params.extend(['%6+%', 6])
-
-    query = f"""
-    SELECT r.*, 
-           (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
-    FROM [YemekTarifleri].[dbo].[Recipe] r
-    WHERE {where_sql}
-    """
-    print('[DEBUG] Final SQL query:', query)
-    print('[DEBUG] Query parameters:', params)
-
-    try:
-        conn = pyodbc.connect(r'Driver={SQL Server};Server=YAREN\SQLEXPRESS;Database=YemekTarifleri;Trusted_Connection=yes;')
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in cursor.fetchall():
-            recipe = dict(zip(columns, row))
-            # Tüm alanları string'e çevir
-            for k, v in recipe.items():
-                if v is not None:
-                    recipe[k] = str(v)
-                else:
-                    recipe[k] = ""
-            # Favori sayısını int olarak ekle
-            if 'favorite_count' in recipe:
-                try:
-                    recipe['favorite_count'] = int(recipe['favorite_count'])
-                except:
-                    recipe['favorite_count'] = 0
-            results.append(recipe)
-        conn.close()
-        print('[DEBUG] Found recipes before time filter:', len(results))
-        print('[DEBUG] First recipe before time filter:', results[0] if results else None)
-            
-        # Pişirme süresi filtresini Python tarafında uygula
-        if filters.get('pisirme_suresi') and filters['pisirme_suresi'] != 'Tümü':
-            sure = filters['pisirme_suresi']
-            filtered = []
-            for recipe in results:
-                minutes = extract_minutes(recipe.get('cooking_time', ''))
-                if sure == '30 dakikadan az' and minutes < 30:
-                    filtered.append(recipe)
-                elif sure == '30-60 dakika' and 30 <= minutes <= 60:
-                    filtered.append(recipe)
-                elif sure == '60 dakikadan fazla' and minutes > 60:
-                    filtered.append(recipe)
-            print(f'[DEBUG] Recipes after time filter ({sure}):', len(filtered))
-            results = filtered
-
-        print('[DEBUG] Found recipes after all filters:', len(results))
-        print('[DEBUG] First recipe after all filters:', results[0] if results else None)
-        return jsonify(results[:15])
+    def selected_filter(name):
+        value = filters.get(name)
+        return value if value and value != 'Tümü' else None
+
+    category_id = None
+    if selected_filter('yemek_turu'):
+        category_id = CATEGORY_FILTERS.get(filters['yemek_turu'])
+        if category_id is None:
+            return jsonify([])
+
+    try:
+        results = db_service.suggest_recipes(
+            selected_ingredients,
+            category_id=category_id,
+            portion=selected_filter('porsiyon'),
+            cooking_time=selected_filter('pisirme_suresi'),
+            limit=15
+        )
+        logger.debug('suggest_recipes: %d tarif', len(results))
+        return jsonify(results)
+    except Exception as e:
+        app.logger.exception("Error in suggest recipes endpoint")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/mobile/filter_facets', methods=['POST'])
+def filter_facets():
+    """Filtre ekranı için her yemek türü, porsiyon ve süre seçeneğinin sonuç sayısını döndürür"""
+    data = request.get_json(force=True) or {}
+    selected_ingredients = data.get('selectedIngredients', [])
+    filters = data.get('filters', {})
+    selection = {
+        name: value for name, value in filters.items()
+        if name in ('yemek_turu', 'porsiyon', 'pisirme_suresi') and value and value != 'Tümü'
+    }
+    try:
+        facets = db_service.recipe_facets(selected_ingredients, selection)
+        if facets is None:
+            return jsonify({'error': 'Filtre sayıları şu anda hesaplanamıyor'}), 503
+        return jsonify(facets)
     except Exception as e:
-        print('[DEBUG] Database error:', str(e))
+        app.logger.exception("Error in filter facets endpoint")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/mobile/home', methods=['GET'])
+@cache_policy(private=True)
+def mobile_home():
+    """Ana ekran tek istekte: kategoriler, en iyi tarifler ve user_id verilmişse bu tariflerin favori/puan durumu.
+
+    Parçalar paralel yüklenir; zaman aşımına uğrayan ya da hata veren parça
+    boş döner ve `errors` içinde adıyla belirtilir. ?by=&limit=&fields=
+    /api/top-recipes'takiyle aynıdır.
+    """
+    by = request.args.get('by', 'views')
+    if by not in LEADERBOARD_METRICS:
+        return jsonify({'error': f"by şunlardan biri olmalı: {', '.join(LEADERBOARD_METRICS)}"}), 400
+    try:
+        fields = resolve_fields(request.args.get('fields'))
+        limit = int(request.args.get('limit', 10))
+        user_id = request.args.get('user_id')
+        user_id = int(user_id) if user_id else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not 1 <= limit <= 50:
+        return jsonify({'error': 'limit 1 ile 50 arasında olmalı'}), 400
+
+    parts = {
+        'categories': Part(db_service.get_categories, timeout=1.0, default=[]),
+        'top_recipes': Part(lambda: db_service.get_top_recipes(fields=fields, by=by, limit=limit),
+                            timeout=1.5, default=[]),
+    }
+    if user_id is not None:
+        parts['user_state'] = Part(lambda: db_service.user_states.snapshot(user_id), timeout=1.0)
+    results, errors = screen_fanout.run(parts)
+
+    payload = {
+        'categories': results['categories'],
+        'top_recipes': results['top_recipes'],
+        'errors': errors,
+    }
+    if user_id is not None:
+        payload['states'] = None
+        if results['user_state'] is not None:
+            favorites, ratings = results['user_state']
+            payload['states'] = {
+                str(recipe['id']): {'is_favorite': recipe['id'] in favorites, 'rating': ratings.get(recipe['id'])}
+                for recipe in results['top_recipes']
+            }
+    if len(errors) == len(parts):
+        return jsonify(payload), 503
+    return jsonify(payload)
+
+@app.route('/api/mobile/recipe/<int:recipe_id>', methods=['GET'])
+def mobile_recipe(recipe_id):
+    """Tarif ekranı tek istekte: detay, yorumlar ve user_id verilmişse favori/puan durumu.
+
+    Parçalar paralel yüklenir; yorumlar ya da kullanıcı durumu yüklenemezse
+    ekran onlarsız döner (`errors`). Detay yüklenemezse 503 döner.
+    """
+    try:
+        fields = resolve_fields(request.args.get('fields'), default='full')
+        user_id = request.args.get('user_id')
+        user_id = int(user_id) if user_id else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    parts = {
+        'recipe': Part(lambda: db_service.get_recipe_detail(recipe_id, fields=fields), timeout=1.5),
+        'comments': Part(lambda: db_service.get_recipe_comments(recipe_id), timeout=1.0, default=[]),
+    }
+    if user_id is not None:
+        parts['user_state'] = Part(lambda: db_service.user_states.get_states(user_id, [recipe_id])[recipe_id],
+                                   timeout=1.0)
+    results, errors = screen_fanout.run(parts)
+
+    recipe = results['recipe']
+    if recipe is None:
+        if 'recipe' in errors:
+            return jsonify({'error': 'Tarif detayı şu anda alınamıyor', 'errors': errors}), 503
+        return jsonify({'error': 'Tarif bulunamadı'}), 404
+
+    # Görüntülenme /api/recipes/<id> ile aynı şekilde sayılır
+    viewer = request.args.get('user_id') or request.remote_addr
+    db_service.record_view(recipe_id, viewer)
+    if 'views' in recipe:
+        recipe['views'] = (recipe['views'] or 0) + db_service.views.pending_for(recipe_id)
+
+    payload = {'recipe': recipe, 'comments': results['comments'], 'errors': errors}
+    if user_id is not None:
+        state = results['user_state']
+        payload['user_state'] = None if state is None else {'is_favorite': state[0], 'rating': state[1]}
+    return jsonify(payload)
+
+@app.route('/api/batch', methods=['POST'])
+def batch_operations():
+    """Çevrimdışıyken kuyruğa alınmış favori, puan ve yorum işlemlerini tek istekte uygular.
+
+    Gövde: {'user_id', 'operations': [{'op_id', 'type', 'recipe_id', 'rating'?, 'content'?}]}
+    type: favorite_add | favorite_remove | rate | comment_add. `results`
+    gönderilen sırayla her işlemin durum kodunu ve tekil uç noktanın
+    gövdesini içerir. Aynı op_id ile tekrar gönderilen işlem yeniden
+    uygulanmaz (`replayed`).
+    """
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id')
+    operations = data.get('operations')
+    if not user_id or not isinstance(operations, list):
+        return jsonify({'error': 'Kullanıcı ID ve işlem listesi gerekli'}), 400
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Kullanıcı ID bir sayı olmalıdır'}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({'error': f'En fazla {MAX_BATCH_OPERATIONS} işlem gönderilebilir'}), 400
+    try:
+        return jsonify({'results': db_service.apply_batch(user_id, operations)}), 200
+    except Exception:
+        app.logger.exception("Error in batch endpoint")
+        return jsonify({'error': 'İşlemler uygulanamadı, tekrar deneyin'}), 500
+
+@app.route('/api/sync', methods=['GET'])
+@cache_policy(private=True)
+def sync_changes():
+    """Mobil istemcinin yerel kopyası için `since` jetonundan bu yana değişen kayıtlar.
+
+    Jetonsuz ilk istek her şeyi döndürür; yanıttaki `token` bir sonraki
+    isteğin `since` değeridir. `has_more` True ise istemci yeni jetonla
+    hemen tekrar ister, `reset` True ise yerel kopyasını baştan kurar.
+    Yalnızca sayaçları değişen tarifler `counters` ile gelir (?counters=0
+    ile istenmez). ?since=&user_id=&fields=&limit=&counters=
+    """
+    try:
+        since = request.args.get('since')
+        since = decode_sync_token(since) if since else None
+        user_id = request.args.get('user_id')
+        user_id = int(user_id) if user_id else None
+        fields = resolve_fields(request.args.get('fields'))
+        limit = int(request.args.get('limit', 500))
+        counters = request.args.get('counters', '1') not in ('0', 'false')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not 1 <= limit <= MAX_SYNC_LIMIT:
+        return jsonify({'error': f'limit 1 ile {MAX_SYNC_LIMIT} arasında olmalı'}), 400
+    try:
+        return jsonify(db_service.get_changes(since, user_id=user_id, fields=fields, limit=limit,
+                                              counters=counters))
+    except Exception:
+        app.logger.exception("Error in sync endpoint")
+        return jsonify({'error': 'Değişiklikler alınırken bir hata oluştu'}), 500
+
 def translate_recipe_keys(recipe):
     """Gemini API'dan gelen Türkçe/karışık anahtarları İngilizce'ye çevirir ve eksik alanları tamamlar"""
     key_map = {
@@ -565,19 +905,26 @@ def translate_recipe_keys(recipe):
     return mapped
 
 # Basit malzeme çıkarıcı fonksiyon (örnek)
+# Katalogdan malzeme sözlüğü çıkarılamazsa kullanılan yedek liste
+DEFAULT_INGREDIENTS = [
+    'domates', 'peynir', 'makarna', 'biber', 'patates', 'yumurta', 'süt', 'un', 'tavuk', 'et',
+    'soğan', 'sarımsak', 'zeytinyağı', 'pirinç', 'bulgur', 'yoğurt', 'salça', 'şeker', 'tuz',
+    'elma', 'muz', 'limon', 'havuç', 'kabak', 'ıspanak', 'fasulye', 'mercimek', 'nohut', 'sucuk',
+    'balık', 'krema', 'tereyağı', 'maydanoz', 'dereotu', 'nane', 'kekik', 'karabiber', 'pul biber',
+    'zeytin', 'mısır', 'bezelye', 'karnabahar', 'brokoli', 'lahana', 'kereviz', 'patlıcan', 'kabak',
+    'ceviz', 'fındık', 'badem', 'fıstık', 'çikolata', 'vanilya', 'tarçın', 'susam', 'ketçap', 'mayonez'
+]
+
 def extract_ingredients_from_text(text, known_ingredients=None):
+    """Serbest metinde geçen malzeme adlarını bulur (kelime başından, Türkçe katlamalı eşleşme)"""
     if known_ingredients is None:
-        # Kendi veritabanındaki Ingredient tablosundan veya sabit bir listeden çekebilirsin
-        known_ingredients = [
-            'domates', 'peynir', 'makarna', 'biber', 'patates', 'yumurta', 'süt', 'un', 'tavuk', 'et',
-            'soğan', 'sarımsak', 'zeytinyağı', 'pirinç', 'bulgur', 'yoğurt', 'salça', 'şeker', 'tuz',
-            'elma', 'muz', 'limon', 'havuç', 'kabak', 'ıspanak', 'fasulye', 'mercimek', 'nohut', 'sucuk',
-            'balık', 'krema', 'tereyağı', 'maydanoz', 'dereotu', 'nane', 'kekik', 'karabiber', 'pul biber',
-            'zeytin', 'mısır', 'bezelye', 'karnabahar', 'brokoli', 'lahana', 'kereviz', 'patlıcan', 'kabak',
-            'ceviz', 'fındık', 'badem', 'fıstık', 'çikolata', 'vanilya', 'tarçın', 'susam', 'ketçap', 'mayonez'
-        ]
-    text_lower = text.lower()
-    found = [ing for ing in known_ingredients if ing in text_lower]
+        known_ingredients = db_service.ingredient_vocabulary() or DEFAULT_INGREDIENTS
+    text_folded = f" {normalize_text(text)}"
+    found = []
+    for ing in dict.fromkeys(known_ingredients):
+        ing_folded = normalize_text(ing)
+        if ing_folded and f" {ing_folded}" in text_folded:
+            found.append(ing)
     return found
 
 @app.route('/api/ai_recipe', methods=['POST'])
@@ -607,11 +954,7 @@ def ai_recipe():
         _, ai_recipes = parse_ai_recipes(reply)
         print('[DEBUG] Gemini yanıtı:', reply)
         print('[DEBUG] Parse edilen tarifler:', ai_recipes)
-        from flask import Response
-        return Response(
-            json.dumps(ai_recipes[:8], ensure_ascii=False),
-            content_type="application/json; charset=utf-8"
-        )
+        return jsonify(ai_recipes[:8])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -629,20 +972,11 @@ def ai_chat():
         response = requests.post(GEMINI_URL, json=data)
         response_json = response.json()
         if "candidates" not in response_json:
-            return Response(
-                json.dumps({"error": response_json}, ensure_ascii=False),
-                content_type="application/json; charset=utf-8"
-            )
+            return jsonify({"error": response_json})
         gemini_reply = response_json['candidates'][0]['content']['parts'][0]['text']
-        return Response(
-            json.dumps({"reply": gemini_reply}, ensure_ascii=False),
-            content_type="application/json; charset=utf-8"
-        )
+        return jsonify({"reply": gemini_reply})
     except Exception as e:
-        return Response(
-            json.dumps({"error": str(e)}, ensure_ascii=False),
-            content_type="application/json; charset=utf-8"
-        )
+        return jsonify({"error": str(e)})
 
 @app.errorhandler(NoAuthorizationError)
 def handle_auth_error(e):
@@ -692,11 +1026,19 @@ def to_try_recipes():
     if not user_id:
         return jsonify({'error': 'Kullanıcı ID gerekli'}), 400
     try:
-        recipes = db_service.get_to_try_recipes(user_id)
-        return jsonify({'recipes': recipes}), 200
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        recipes = db_service.get_to_try_recipes(user_id, limit=limit, after=after)
+        return jsonify({'recipes': recipes, 'next_cursor': recipes.next_cursor}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Kapanışta bekleyen görüntülenmeleri yaz ve bağlantıları kapat
+atexit.register(db_service.disconnect)
+atexit.register(screen_fanout.shutdown)
+
 if __name__ == '__main__':
     try:
         logger.info("Starting the server...")
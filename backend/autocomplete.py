@@ -0,0 +1,252 @@
+import bisect
+import heapq
+import threading
+from collections import Counter
+
+from ingredient_index import ingredient_name, split_ingredients
+from turkish_text import tokenize
+
+
+def normalize(text):
+    """Katlanmış, kelimeleri tek boşlukla ayrılmış hâl ("İçli  Köfte" -> "icli kofte")"""
+    return ' '.join(tokenize(text))
+
+
+def phrases(text):
+    """Bir girdinin aranabileceği ifadeler: her kelimeden başlayan son ek.
+
+    "İçli Köfte" hem "icli" hem "kofte" yazılınca önerilebilsin diye
+    ("icli kofte", "kofte") döner.
+    """
+    words = tokenize(text)
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """Sıralı ifade dizisi üzerinde ağırlıklı önek tamamlama.
+
+    İfadeler `(ifade, anahtar)` olarak sıralı tutulur; bir önekin eşleşmeleri
+    iki ikili arama ile bulunan bitişik bir aralıktır. Aralığı
+    `scan_limit`'ten büyük olan (kısa, yaygın) önekler için en ağır `top_k`
+    anahtar önceden hesaplanıp saklanır; küçük aralıklar sorguda heap ile
+    taranır. Böylece her tuş vuruşu aralık boyutundan bağımsız olarak en
+    fazla `scan_limit` girdiye bakar.
+
+    Ağırlıkların yalnızca arttığı varsayılır (görüntülenme, kullanım sayısı);
+    `add()` ve `set_weight()` saklı listeleri yerinde günceller.
+    """
+
+    def __init__(self, top_k=10, scan_limit=64):
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        self._lock = threading.RLock()
+        self._items = []
+        self._labels = {}
+        self._phrases = {}
+        self._weights = {}
+        self._top = {}
+
+    def __len__(self):
+        return len(self._labels)
+
+    def load(self, entries):
+        """Girdileri toplu yükler: [(anahtar, etiket, ağırlık)]; mevcut içerik silinir"""
+        with self._lock:
+            self._labels, self._phrases, self._weights = {}, {}, {}
+            items = []
+            for key, label, weight in entries:
+                entry_phrases = phrases(label)
+                if not entry_phrases:
+                    continue
+                self._labels[key] = label
+                self._phrases[key] = entry_phrases
+                self._weights[key] = weight or 0
+                items.extend((phrase, key) for phrase in entry_phrases)
+            items.sort()
+            self._items = items
+            self._top = {}
+            self._build_top(0, len(items), 1)
+
+    def add(self, key, label, weight=0):
+        """Tek girdi ekler ya da etiketini yeniler"""
+        entry_phrases = phrases(label)
+        with self._lock:
+            if key in self._labels:
+                self.remove(key)
+            if not entry_phrases:
+                return
+            self._labels[key] = label
+            self._phrases[key] = entry_phrases
+            self._weights[key] = weight or 0
+            for phrase in entry_phrases:
+                bisect.insort(self._items, (phrase, key))
+                for length in range(1, len(phrase) + 1):
+                    prefix = phrase[:length]
+                    if prefix in self._top:
+                        self._offer(prefix, key)
+                    else:
+                        lo, hi = self._range(prefix)
+                        if hi - lo <= self.scan_limit:
+                            break
+                        self._top[prefix] = self._scan(lo, hi)
+
+    def remove(self, key):
+        with self._lock:
+            entry_phrases = self._phrases.pop(key, None)
+            if entry_phrases is None:
+                return
+            self._labels.pop(key)
+            self._weights.pop(key)
+            for phrase in entry_phrases:
+                del self._items[bisect.bisect_left(self._items, (phrase, key))]
+            for phrase in entry_phrases:
+                for length in range(1, len(phrase) + 1):
+                    prefix = phrase[:length]
+                    top = self._top.get(prefix)
+                    if top is None:
+                        break
+                    if any(k == key for _, k in top):
+                        self._top[prefix] = self._scan(*self._range(prefix))
+
+    def weight(self, key):
+        return self._weights.get(key)
+
+    def set_weight(self, key, weight):
+        """Girdinin ağırlığını artırır ve ilgili önek listelerini günceller"""
+        with self._lock:
+            if key not in self._weights:
+                return
+            self._weights[key] = weight
+            for phrase in self._phrases[key]:
+                for length in range(1, len(phrase) + 1):
+                    prefix = phrase[:length]
+                    if prefix not in self._top:
+                        break
+                    self._offer(prefix, key)
+
+    def complete(self, prefix, limit=None):
+        """Öneke uyan en ağır girdileri [(anahtar, etiket)] olarak döndürür"""
+        limit = min(limit or self.top_k, self.top_k)
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            top = self._top.get(prefix)
+            if top is None:
+                top = self._scan(*self._range(prefix))
+            return [(key, self._labels[key]) for _, key in top[:limit]]
+
+    def _range(self, prefix):
+        lo = bisect.bisect_left(self._items, (prefix,))
+        hi = bisect.bisect_left(self._items, (prefix + '\uffff',), lo)
+        return lo, hi
+
+    def _rank(self, key):
+        return (-self._weights[key], self._labels[key])
+
+    def _scan(self, lo, hi):
+        keys = {key for _, key in self._items[lo:hi]}
+        best = heapq.nsmallest(self.top_k, keys, key=self._rank)
+        return [(self._weights[key], key) for key in best]
+
+    def _offer(self, prefix, key):
+        top = [(w, k) for w, k in self._top[prefix] if k != key]
+        top.append((self._weights[key], key))
+        top.sort(key=lambda item: self._rank(item[1]))
+        self._top[prefix] = top[:self.top_k]
+
+    def _build_top(self, lo, hi, length):
+        """Aralığı `length` uzunluğundaki öneklere böler; büyük olanlar için listeyi saklar"""
+        stack = [(lo, hi, length)]
+        while stack:
+            lo, hi, length = stack.pop()
+            start = lo
+            while start < hi:
+                phrase = self._items[start][0]
+                if len(phrase) < length:
+                    start += 1
+                    continue
+                prefix = phrase[:length]
+                end = bisect.bisect_left(self._items, (prefix + '\uffff',), start, hi)
+                if end - start > self.scan_limit:
+                    self._top[prefix] = self._scan(start, end)
+                    stack.append((start, end, length + 1))
+                start = end
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._labels),
+                'phrases': len(self._items),
+                'precomputed_prefixes': len(self._top),
+            }
+
+
+class Autocomplete:
+    """Tarif başlıkları ve katalogdan çıkarılan malzeme adları için yazarken tamamlama.
+
+    Başlıklar görüntülenme sayısıyla, malzemeler kullanıldıkları tarif
+    sayısıyla ağırlıklandırılır.
+    """
+
+    def __init__(self, top_k=10):
+        self.titles = PrefixIndex(top_k)
+        self.ingredients = PrefixIndex(top_k)
+        self._ingredient_counts = Counter()
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def load(self, recipes):
+        """[(tarif_id, başlık, malzemeler, görüntülenme)] listesinden baştan kurar"""
+        counts = Counter()
+        titles = []
+        for recipe_id, title, ingredients, views in recipes:
+            titles.append((recipe_id, title or '', views))
+            counts.update(self._names(ingredients))
+        self.titles.load(titles)
+        self.ingredients.load((name, name, count) for name, count in counts.items())
+        with self._lock:
+            self._ingredient_counts = counts
+
+    def add_recipe(self, recipe_id, title, ingredients, views=0):
+        self.titles.add(recipe_id, title or '', views)
+        with self._lock:
+            for name in self._names(ingredients):
+                self._ingredient_counts[name] += 1
+                count = self._ingredient_counts[name]
+                if count == 1:
+                    self.ingredients.add(name, name, count)
+                else:
+                    self.ingredients.set_weight(name, count)
+
+    def add_views(self, recipe_id, delta):
+        weight = self.titles.weight(recipe_id)
+        if weight is not None:
+            self.titles.set_weight(recipe_id, weight + delta)
+
+    def vocabulary(self, min_count=2):
+        """En az `min_count` tarifte geçen malzeme adları, yaygından seyreğe"""
+        with self._lock:
+            return [name for name, count in self._ingredient_counts.most_common() if count >= min_count]
+
+    def complete(self, prefix, limit=10, kinds=('recipes', 'ingredients')):
+        result = {}
+        if 'recipes' in kinds:
+            result['recipes'] = [
+                {'id': recipe_id, 'title': title}
+                for recipe_id, title in self.titles.complete(prefix, limit)
+            ]
+        if 'ingredients' in kinds:
+            result['ingredients'] = [name for name, _ in self.ingredients.complete(prefix, limit)]
+        return result
+
+    @staticmethod
+    def _names(ingredients):
+        return {name for name in map(ingredient_name, split_ingredients(ingredients)) if name}
+
+    def stats(self):
+        return {
+            'ready': self.ready,
+            'titles': self.titles.stats(),
+            'ingredients': self.ingredients.stats(),
+        }
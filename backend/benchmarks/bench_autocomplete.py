@@ -0,0 +1,56 @@
+"""Yazarken tamamlama: her tuş vuruşundaki önek sorgusunun süresi.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_autocomplete.py
+    python benchmarks/bench_autocomplete.py --db        # gerçek katalog
+"""
+import argparse
+import time
+
+from catalog import load_catalog_from_db, synthetic_catalog
+from autocomplete import Autocomplete
+
+WORDS = ['mercimek çorbası', 'içli köfte', 'KARNIYARIK', 'pul biber', 'zeytinyağlı', 'sütlaç']
+
+
+def run(catalog, repeat):
+    start = time.perf_counter()
+    index = Autocomplete()
+    index.load((r['id'], r['title'], r['ingredients'], r['views']) for r in catalog)
+    build_ms = (time.perf_counter() - start) * 1000
+    stats = index.stats()
+    print(f"Katalog: {len(catalog)} tarif, kurulum {build_ms:.1f} ms, "
+          f"{stats['titles']['precomputed_prefixes']} önceden hesaplanmış önek")
+
+    # Her kelime harf harf yazılıyormuş gibi tüm önekleri sorgula
+    prefixes = [word[:i] for word in WORDS for i in range(1, len(word) + 1)]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for prefix in prefixes:
+            index.complete(prefix, 10)
+    per_query_us = (time.perf_counter() - start) / (repeat * len(prefixes)) * 1e6
+    print(f"{len(prefixes)} önek x {repeat}: sorgu başına ortalama {per_query_us:.1f} µs")
+
+    start = time.perf_counter()
+    next_id = max(r['id'] for r in catalog) + 1
+    for i in range(1000):
+        index.add_recipe(next_id + i, f"Yeni Tarif {i}", "1 adet soğan\n2 su bardağı bulgur")
+    print(f"Artımlı ekleme: tarif başına {(time.perf_counter() - start):.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', action='store_true', help="Gerçek kataloğu kullan")
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--sizes', default='1000,10000,50000', help="Sentetik katalog boyutları")
+    args = parser.parse_args()
+    if args.db:
+        run(load_catalog_from_db(), args.repeat)
+        return
+    for size in (int(s) for s in args.sizes.split(',')):
+        run(synthetic_catalog(size), args.repeat)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Yazım düzeltme: simetrik silme sözlüğü ile kaba kuvvet Levenshtein karşılaştırması.
+
+Sözlük katalog başlıklarından ve malzemelerinden, sentetik katalogda kelime
+çeşitliliği az olduğundan ek olarak hecelerden üretilmiş kelimelerden kurulur.
+Sorgular sözlük kelimelerine rastgele 1-2 düzenleme (silme, ekleme,
+değiştirme, yer değiştirme) uygulanarak üretilir.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_fuzzy.py
+    python benchmarks/bench_fuzzy.py --vocab 50000 --queries 500
+    python benchmarks/bench_fuzzy.py --db
+"""
+import argparse
+import random
+import string
+import time
+
+from catalog import load_catalog_from_db, synthetic_catalog
+from spelling import SpellIndex, edit_distance, max_distance_for
+from turkish_text import fold
+
+SYLLABLES = ['ba', 'ka', 'lı', 'ma', 'ne', 'sü', 'tö', 'ça', 'şe', 'ğı', 'ye', 'ri', 'mu', 'ko', 'an', 'er', 'iz', 'ül']
+LETTERS = string.ascii_lowercase + 'çğıöşü'
+
+
+def synthetic_words(count, rng):
+    return {''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))) for _ in range(count)}
+
+
+def misspell(word, rng):
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(word))
+        op = rng.choice('dist')
+        if op == 'd' and len(word) > 3:
+            word = word[:i] + word[i + 1:]
+        elif op == 'i':
+            word = word[:i] + rng.choice(LETTERS) + word[i:]
+        elif op == 's':
+            word = word[:i] + rng.choice(LETTERS) + word[i + 1:]
+        elif i < len(word) - 1:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def brute_force(vocabulary, index, word):
+    """Sözlükteki her kelimeyle uzaklık hesaplayan referans arama"""
+    word = fold(word)
+    limit = min(index.max_distance, max_distance_for(word))
+    best = []
+    for candidate, count in vocabulary:
+        distance = edit_distance(word, candidate, limit)
+        if distance <= limit:
+            best.append((candidate, distance, count))
+    best.sort(key=lambda item: (item[1], -item[2], item[0]))
+    return best[:1]
+
+
+def run(catalog, vocab_size, query_count, seed):
+    rng = random.Random(seed)
+    index = SpellIndex()
+    start = time.perf_counter()
+    for r in catalog:
+        index.add_text(r['title'])
+        index.add_text(r['ingredients'])
+    for word in synthetic_words(vocab_size, rng):
+        index.add_word(word)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Sözlük: {len(index)} kelime, {index.stats()['delete_variants']} silme varyantı, kurulum {build_ms:.1f} ms")
+
+    vocabulary = index.items()
+    words = [w for w, _ in vocabulary if len(w) >= 5]
+    queries = [misspell(w, rng) for w in rng.sample(words, min(query_count, len(words)))]
+
+    start = time.perf_counter()
+    fast = [index.lookup(q, limit=1) for q in queries]
+    fast_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    start = time.perf_counter()
+    slow = [brute_force(vocabulary, index, q) for q in queries]
+    slow_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    # Geri çağırma: kaba kuvvetin bulduğu en iyi adayın simetrik silme ile de bulunma oranı
+    found = [s for s in slow if s]
+    agree = sum(1 for f, s in zip(fast, slow) if s and f and f[0][1] == s[0][1])
+    print(f"{'yöntem':<24}{'sorgu başına ms':>16}")
+    print(f"{'simetrik silme':<24}{fast_ms:>16.3f}")
+    print(f"{'kaba kuvvet':<24}{slow_ms:>16.3f}")
+    print(f"Geri çağırma (aynı uzaklıkta aday bulunan): {agree}/{len(found)}"
+          f" = {agree / max(len(found), 1):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', action='store_true', help="Gerçek kataloğu kullan")
+    parser.add_argument('--size', type=int, default=10000, help="Sentetik katalog boyutu")
+    parser.add_argument('--vocab', type=int, default=20000, help="Eklenecek sentetik kelime sayısı")
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    catalog = load_catalog_from_db() if args.db else synthetic_catalog(args.size)
+    run(catalog, args.vocab, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Koşullu istekler ve sıkıştırma: yanıt boyutu ve istek başına süre.
+
+Sentetik tarif kartlarından oluşan bir liste yanıtı Flask test istemcisiyle
+dört şekilde istenir: sıkıştırmasız, gzip/brotli (önceden sıkıştırılmış
+gövde önbelleğiyle ve önbelleksiz) ve If-None-Match ile (304).
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_http_cache.py
+    python benchmarks/bench_http_cache.py --cards 200 --requests 2000
+"""
+import argparse
+import time
+
+from flask import Flask, jsonify
+
+from catalog import synthetic_catalog
+from http_cache import ResponseCache, brotli, cache_policy
+from projections import CARD_FIELDS
+
+
+def make_app(cards, cached):
+    app = Flask(__name__)
+    app.config['JSON_AS_ASCII'] = False
+    ResponseCache(app, cache_bytes=8 * 2 ** 20 if cached else 0)
+
+    @app.route('/cards')
+    @cache_policy(max_age=60)
+    def list_cards():
+        return jsonify(cards)
+
+    return app
+
+
+def measure(client, requests, headers):
+    response = client.get('/cards', headers=headers)
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get('/cards', headers=headers)
+    return (time.perf_counter() - start) / requests * 1000, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cards', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+    cards = [{field: r.get(field) for field in CARD_FIELDS} for r in synthetic_catalog(args.cards)]
+
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    print(f"{'durum':<32}{'bayt':>10}{'ms/istek':>12}")
+    client = make_app(cards, cached=True).test_client()
+    elapsed, response = measure(client, args.requests, {})
+    print(f"{'sıkıştırmasız':<32}{len(response.data):>10}{elapsed:>12.3f}")
+    for encoding in encodings:
+        for cached in (False, True):
+            client = make_app(cards, cached).test_client()
+            elapsed, response = measure(client, args.requests, {'Accept-Encoding': encoding})
+            label = f"{encoding} ({'önbellekli' if cached else 'önbelleksiz'})"
+            print(f"{label:<32}{len(response.data):>10}{elapsed:>12.3f}")
+    headers = {'Accept-Encoding': encodings[-1], 'If-None-Match': response.headers['ETag']}
+    elapsed, response = measure(client, args.requests, headers)
+    print(f"{'If-None-Match -> ' + str(response.status_code):<32}{len(response.data):>10}{elapsed:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Liste uç noktalarının serileştirme hızı: eski yol ile RowPlan + FastJSONProvider.
+
+Satırlar pyodbc'nin döndürdüğü gibi demetlerdir (average_rating DECIMAL,
+created_at datetime). Ölçülen, imleçten yanıt gövdesine kadar geçen
+süredir (sorgu hariç):
+
+    eski      dict(zip) + satır başına isoformat + Flask'ın varsayılan
+              sağlayıcısı (ASCII kaçışlı, Decimal metin)
+    json      RowPlan.dicts + FastJSONProvider, standart json
+    orjson    RowPlan.dicts + FastJSONProvider, orjson (kuruluysa)
+    akış      sayfasız liste: RowPlan.encode ile demetlerden doğrudan bayt
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_json.py
+    python benchmarks/bench_json.py --catalog 20000 --fields full
+"""
+import argparse
+import datetime
+import decimal
+import time
+
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from catalog import synthetic_catalog
+from json_provider import FastJSONProvider
+from projections import PROJECTIONS
+from row_plan import RowPlan, orjson
+
+COLUMN_TYPES = {
+    'id': int, 'user_id': int, 'category_id': int, 'views': int, 'rating_count': int,
+    'favorite_count': int, 'average_rating': decimal.Decimal, 'created_at': datetime.datetime,
+}
+
+
+class _Cursor:
+    """RowPlan için yalnızca `description` taşıyan imleç yerine geçen nesne"""
+
+    def __init__(self, fields):
+        self.description = [(field, COLUMN_TYPES.get(field, str)) for field in fields]
+
+
+def make_rows(catalog, fields):
+    created = datetime.datetime(2024, 5, 1, 12, 30, 15)
+    rows = []
+    for recipe in catalog:
+        values = dict(recipe, created_at=created,
+                      average_rating=decimal.Decimal(f"{recipe.get('average_rating') or 0:.2f}"))
+        rows.append(tuple(values.get(field) for field in fields))
+    return rows
+
+
+def old_path(fields, rows):
+    columns = list(fields)
+    recipes = []
+    for recipe in [dict(zip(columns, row)) for row in rows]:
+        if recipe.get('created_at'):
+            recipe['created_at'] = recipe['created_at'].isoformat()
+        recipes.append(recipe)
+    return jsonify(recipes).get_data()
+
+
+def new_path(cursor, rows):
+    return jsonify(RowPlan.for_cursor(cursor).dicts(rows)).get_data()
+
+
+def stream_path(cursor, rows, backend, batch_size=500):
+    plan = RowPlan.for_cursor(cursor)
+    chunks = [b'[']
+    for start in range(0, len(rows), batch_size):
+        chunks.append(plan.encode(rows[start:start + batch_size], backend)[1:-1])
+        chunks.append(b',')
+    chunks[-1] = b']\n'
+    return b''.join(chunks)
+
+
+def throughput(fn, min_seconds):
+    """(saniyedeki çağrı, gövde bayt)"""
+    body = fn()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls / elapsed, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--catalog', type=int, default=5000, help="Sayfasız liste için satır sayısı")
+    parser.add_argument('--fields', default='card', choices=sorted(PROJECTIONS))
+    parser.add_argument('--seconds', type=float, default=1.0, help="Her ölçüm için en az süre")
+    args = parser.parse_args()
+
+    fields = PROJECTIONS[args.fields]
+    cursor = _Cursor(fields)
+    rows = make_rows(synthetic_catalog(args.catalog), fields)
+
+    apps = {'eski': Flask(__name__)}
+    apps['eski'].json = DefaultJSONProvider(apps['eski'])
+    backends = ['json'] + (['orjson'] if orjson is not None else [])
+    for backend in backends:
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        app.json.backend = backend
+        apps[backend] = app
+
+    print(f"{'liste':>14}{'yol':>9}{'istek/s':>12}{'satır/s':>13}{'bayt':>11}{'hız':>8}")
+    for label, count in (('sayfa 20', 20), ('sayfa 100', 100), (f'sayfasız {len(rows)}', len(rows))):
+        page = rows[:count]
+        baseline = None
+        for name, app in apps.items():
+            with app.app_context():
+                if name == 'eski':
+                    rate, size = throughput(lambda: old_path(fields, page), args.seconds)
+                else:
+                    rate, size = throughput(lambda: new_path(cursor, page), args.seconds)
+            baseline = baseline or rate
+            print(f"{label:>14}{name:>9}{rate:>12.0f}{rate * count:>13.0f}{size:>11}{rate / baseline:>7.1f}x")
+        if count == len(rows):
+            for backend in backends:
+                rate, size = throughput(lambda: stream_path(cursor, page, backend), args.seconds)
+                print(f"{label:>14}{'akış/' + backend:>9}{rate:>12.0f}{rate * count:>13.0f}{size:>11}"
+                      f"{rate / baseline:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
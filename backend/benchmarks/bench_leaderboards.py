@@ -0,0 +1,68 @@
+"""Sıralama listeleri: kurulum, yazma yolu güncellemesi ve okuma süreleri.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_leaderboards.py
+    python benchmarks/bench_leaderboards.py --sizes 10000,200000
+"""
+import argparse
+import random
+import time
+
+from catalog import synthetic_catalog
+from leaderboards import METRICS, Leaderboards
+
+
+def run(catalog, updates, reads, seed):
+    rng = random.Random(seed)
+    rows = [
+        (r['id'], r['category_id'], r['views'], round(r['average_rating'] * r['rating_count']),
+         r['rating_count'], r['favorite_count'])
+        for r in catalog
+    ]
+    boards = Leaderboards()
+    start = time.perf_counter()
+    boards.load(rows)
+    boards.set_cards({'id': recipe_id} for recipe_id in boards.missing_cards())
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Yazma yollarının karışımı: görüntülenme ağırlıklı, arada favori ve puan
+    ids = [r['id'] for r in catalog]
+    ratings = {row[0]: [row[3], row[4]] for row in rows}
+    start = time.perf_counter()
+    for _ in range(updates):
+        recipe_id = rng.choice(ids)
+        roll = rng.random()
+        if roll < 0.8:
+            boards.add_views(recipe_id, 1)
+        elif roll < 0.9:
+            boards.add_favorite(recipe_id)
+        elif roll < 0.93:
+            boards.remove_favorite(recipe_id)
+        else:
+            rating = rng.randint(1, 5)
+            ratings[recipe_id][0] += rating
+            ratings[recipe_id][1] += 1
+            boards.set_rating(recipe_id, *ratings[recipe_id], rating)
+    update_us = (time.perf_counter() - start) / updates * 1e6
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        boards.top(rng.choice(METRICS), rng.choice([None, 1, 2, 3, 4, 5, 6, 7]), 10)
+    read_us = (time.perf_counter() - start) / reads * 1e6
+    print(f"{len(catalog):>10}{build_ms:>14.1f}{update_us:>16.1f}{read_us:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,50000', help="Sentetik katalog boyutları")
+    parser.add_argument('--updates', type=int, default=50000)
+    parser.add_argument('--reads', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    print(f"{'tarif':>10}{'kurulum ms':>14}{'güncelleme µs':>16}{'okuma µs':>14}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        run(synthetic_catalog(size), args.updates, args.reads, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Okuma önbelleği: isabet maliyeti ve süresi dolan anahtarda yığılma (stampede).
+
+Veritabanı, `--latency` ms bekleyip bir sayfa kart döndüren bir yükleyiciyle
+taklit edilir. Yığılma testinde `--threads` iş parçacığı aynı anda süresi
+dolmuş tek bir anahtarı ister; önbelleksiz yolda her istek sorgu çalıştırır,
+single-flight ile tek sorgu çalışır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_read_cache.py
+    python benchmarks/bench_read_cache.py --threads 16,64,256 --latency 50
+"""
+import argparse
+import threading
+import time
+
+from catalog import synthetic_catalog
+from pagination import Page
+from projections import CARD_FIELDS
+from read_cache import ReadCache
+
+
+def make_loader(page, latency, calls):
+    def load():
+        calls.append(1)
+        time.sleep(latency / 1000)
+        return Page([dict(recipe) for recipe in page], next_cursor='c')
+    return load
+
+
+def stampede(threads, load):
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        load()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', default='8,32,128', help="Eşzamanlı istek sayıları")
+    parser.add_argument('--latency', type=float, default=20.0, help="Taklit sorgu süresi (ms)")
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--reads', type=int, default=20000)
+    args = parser.parse_args()
+
+    page = [{field: recipe.get(field) for field in CARD_FIELDS}
+            for recipe in synthetic_catalog(args.page_size)]
+
+    cache = ReadCache()
+    calls = []
+    loader = make_loader(page, 0, calls)
+    key = ('recipes', None, args.page_size, None, CARD_FIELDS)
+    cache.get_or_load(key, ('Recipe', 'User'), loader)
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        cache.get_or_load(key, ('Recipe', 'User'), loader)
+    hit_us = (time.perf_counter() - start) / args.reads * 1e6
+    print(f"isabet: {hit_us:.1f} µs ({args.page_size} kartlık sayfa, kopyalama dahil)\n")
+
+    print(f"{'istek':>8}{'önbelleksiz sorgu':>20}{'ms':>10}{'single-flight sorgu':>22}{'ms':>10}")
+    for threads in (int(t) for t in args.threads.split(',')):
+        direct_calls = []
+        direct_ms = stampede(threads, make_loader(page, args.latency, direct_calls))
+
+        cache = ReadCache()
+        flight_calls = []
+        flight_loader = make_loader(page, args.latency, flight_calls)
+        cache.bump('Recipe')  # anahtarın geçersiz kaldığı an
+        flight_ms = stampede(threads, lambda: cache.get_or_load(key, ('Recipe', 'User'), flight_loader))
+        print(f"{threads:>8}{len(direct_calls):>20}{direct_ms:>10.1f}{len(flight_calls):>22}{flight_ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
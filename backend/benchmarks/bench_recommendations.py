@@ -0,0 +1,71 @@
+"""Tarif-tarif öneri modeli: kurulum, artımlı yenileme ve sorgu süreleri.
+
+Sentetik favori ve puanlardan komşular baştan hesaplanır; ardından yeni
+etkileşimlerden etkilenen tarifler artımlı olarak yeniden hesaplanır ve
+sonuçların tam kurulumla aynı olduğu doğrulanır. Son olarak rastgele
+kullanıcılar için öneri sorgusunun süresi ölçülür.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_recommendations.py
+    python benchmarks/bench_recommendations.py --recipes 50000 --users 200000
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+from catalog import synthetic_interactions
+from recommendations import Recommender, co_occurring, interaction_values, item_neighbours, np
+
+
+def run(recipe_count, user_count, backends, recent, queries, seed):
+    favorites, ratings = synthetic_interactions(recipe_count, user_count, seed)
+    print(f"{recipe_count} tarif, {user_count} kullanıcı, {len(favorites)} favori, {len(ratings)} puan")
+    values = interaction_values(favorites, ratings)
+
+    builds = {}
+    for backend in backends:
+        start = time.perf_counter()
+        builds[backend] = item_neighbours(values, backend=backend)
+        print(f"  tam kurulum ({backend}): {time.perf_counter() - start:.2f} sn, {len(builds[backend])} tarif")
+    neighbours = builds[backends[0]]
+
+    # Rastgele `recent` favori "watermark'tan sonra gelenler" sayılır
+    rng = random.Random(seed)
+    touched = {recipe_id for _, recipe_id in rng.sample(favorites, min(recent, len(favorites)))}
+    start = time.perf_counter()
+    affected = co_occurring(values, touched)
+    refreshed = item_neighbours(values, recipe_ids=affected, backend=backends[0])
+    elapsed = time.perf_counter() - start
+    same = all(refreshed[recipe_id] == neighbours[recipe_id] for recipe_id in refreshed)
+    print(f"  artımlı yenileme: {len(touched)} değişen, {len(affected)} etkilenen tarif, "
+          f"{elapsed:.2f} sn, tam kurulumla aynı: {same}")
+
+    by_user = defaultdict(lambda: (set(), {}))
+    for user_id, recipe_id in favorites:
+        by_user[user_id][0].add(recipe_id)
+    for user_id, recipe_id, rating in ratings:
+        by_user[user_id][1][recipe_id] = rating
+    recommender = Recommender(neighbours, popular=range(1, 101))
+    users = [rng.randint(1, user_count) for _ in range(queries)]
+    start = time.perf_counter()
+    for user_id in users:
+        recommender.recommend(*by_user.get(user_id, ((), {})), limit=20)
+    per_query_ms = (time.perf_counter() - start) * 1000 / queries
+    print(f"  öneri sorgusu: {per_query_ms:.3f} ms/kullanıcı")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recipes', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--recent', type=int, default=100, help="Artımlı yenilemedeki yeni favori sayısı")
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    backends = ['numpy', 'python'] if np is not None else ['python']
+    run(args.recipes, args.users, backends, args.recent, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
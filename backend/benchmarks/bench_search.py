@@ -0,0 +1,72 @@
+"""Bellek içi arama indeksi ile LIKE taramasının karşılaştırması.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_search.py            # sentetik katalog
+    python benchmarks/bench_search.py --db       # gerçek katalog + SQL LIKE sorgusu
+"""
+import argparse
+import statistics
+import time
+
+from catalog import load_catalog_from_db, synthetic_catalog
+from search_index import SearchIndex
+
+QUERIES = ['mercimek', 'çorba', 'tavuk sote', 'IŞIK', 'patlican', 'köfte', 'peynirli börek', 'zeytinyağlı fasulye']
+
+
+def like_scan(catalog, query):
+    """`LIKE '%q%'` ile aynı işi yapan tam tarama: her satırda üç alanda alt dize arar"""
+    q = query.lower()
+    hits = [r for r in catalog
+            if q in (r['title'] or '').lower()
+            or q in (r['ingredients'] or '').lower()
+            or q in (r['instructions'] or '').lower()]
+    hits.sort(key=lambda r: -r['views'])
+    return hits
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def run(catalog, repeat, use_db):
+    start = time.perf_counter()
+    index = SearchIndex()
+    for r in catalog:
+        index.add(r['id'], r['title'], r['ingredients'], r['instructions'], r['views'])
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Katalog: {len(catalog)} tarif, indeks kurulumu {build_ms:.1f} ms, {index.stats()['terms']} terim")
+    print(f"{'sorgu':<24}{'LIKE tarama ms':>16}{'sonuç':>8}{'indeks ms':>12}{'sonuç':>8}" + (f"{'SQL LIKE ms':>14}" if use_db else ''))
+    for query in QUERIES:
+        like_ms, like_hits = timed(lambda: like_scan(catalog, query), repeat)
+        index_ms, index_hits = timed(lambda: index.search(query, limit=20), repeat)
+        line = f"{query:<24}{like_ms:>16.3f}{len(like_hits):>8}{index_ms:>12.3f}{len(index_hits):>8}"
+        if use_db:
+            from database_service import db_service
+            sql_ms, _ = timed(lambda: db_service._search_recipes_like(query, limit=20), repeat)
+            line += f"{sql_ms:>14.3f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', action='store_true', help="Gerçek kataloğu kullan ve SQL LIKE yolunu da ölç")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sizes', default='1000,10000,50000', help="Sentetik katalog boyutları")
+    args = parser.parse_args()
+    if args.db:
+        run(load_catalog_from_db(), args.repeat, use_db=True)
+        return
+    for size in (int(s) for s in args.sizes.split(',')):
+        run(synthetic_catalog(size), args.repeat, use_db=False)
+        print()
+
+
+if __name__ == '__main__':
+    main()
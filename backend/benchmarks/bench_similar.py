@@ -0,0 +1,67 @@
+"""Benzer tarifler: komşu hesaplamanın kurulum süresi ve bellek kullanımı.
+
+Her katalog boyutu için tüm tariflerin en yakın komşuları baştan hesaplanır;
+süre ve tracemalloc ile ölçülen en yüksek bellek raporlanır. NumPy yolu
+blok blok çalıştığından en yüksek bellek `--chunk-mb` ile sınırlı kalır.
+Saf Python yolu yavaş olduğu için yalnızca `--python-max` boyutuna kadar
+ölçülür.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_similar.py
+    python benchmarks/bench_similar.py --sizes 10000,100000 --chunk-mb 32
+    python benchmarks/bench_similar.py --db
+"""
+import argparse
+import time
+import tracemalloc
+
+from catalog import load_catalog_from_db, synthetic_catalog
+from similarity import SimilarityIndex, np
+
+
+def measure(recipes, backend, chunk_bytes):
+    index = SimilarityIndex(chunk_bytes=chunk_bytes, backend=backend)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index.build(recipes)
+    build_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    next_id = max(recipe_id for recipe_id, _ in recipes) + 1
+    additions = recipes[:200]
+    start = time.perf_counter()
+    for offset, (_, ingredients) in enumerate(additions):
+        index.add(next_id + offset, ingredients)
+    add_ms = (time.perf_counter() - start) * 1000 / len(additions)
+    return build_s, peak / 2 ** 20, add_ms
+
+
+def run(catalog, backends, chunk_bytes, python_max):
+    recipes = [(r['id'], r['ingredients']) for r in catalog]
+    for backend in backends:
+        if backend == 'python' and len(recipes) > python_max:
+            continue
+        build_s, peak_mb, add_ms = measure(recipes, backend, chunk_bytes)
+        print(f"{len(recipes):>10}{backend:>10}{build_s:>14.2f}{peak_mb:>14.1f}{add_ms:>18.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', action='store_true', help="Gerçek kataloğu kullan")
+    parser.add_argument('--sizes', default='1000,10000,50000', help="Sentetik katalog boyutları")
+    parser.add_argument('--chunk-mb', type=int, default=64, help="Blok başına yoğun skor matrisi sınırı")
+    parser.add_argument('--python-max', type=int, default=10000)
+    args = parser.parse_args()
+    backends = ['numpy', 'python'] if np is not None else ['python']
+    chunk_bytes = args.chunk_mb * 2 ** 20
+    print(f"{'tarif':>10}{'yol':>10}{'kurulum sn':>14}{'tepe MB':>14}{'ekleme ms/tarif':>18}")
+    if args.db:
+        run(load_catalog_from_db(), backends, chunk_bytes, args.python_max)
+        return
+    for size in (int(s) for s in args.sizes.split(',')):
+        run(synthetic_catalog(size), backends, chunk_bytes, args.python_max)
+
+
+if __name__ == '__main__':
+    main()
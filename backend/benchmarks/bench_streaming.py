@@ -0,0 +1,67 @@
+"""Akış JSON yanıtı: tamponlu `jsonify` ile tepe bellek ve süre karşılaştırması.
+
+Veritabanı imleci, satırları tek tek üreten bir üreteçle taklit edilir
+(tamponlu yol `fetchall` gibi önce listeyi kurar). Tepe bellek tracemalloc
+ile ölçülür; iki yolun gövdelerinin bayt bayt aynı olduğu da denetlenir.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --sizes 10000,100000 --fields full
+"""
+import argparse
+import hashlib
+import time
+import tracemalloc
+
+from flask import Flask, jsonify
+
+from catalog import synthetic_catalog
+from json_stream import stream_json_array
+from projections import PROJECTIONS
+
+
+def rows(templates, count):
+    for i in range(count):
+        recipe = dict(templates[i % len(templates)])
+        recipe['id'] = i + 1
+        yield recipe
+
+
+def measure(build):
+    """(gövde özeti, tepe bellek MB, süre ms)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in build():
+        digest.update(chunk)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return digest.hexdigest(), peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,50000', help="Satır sayıları")
+    parser.add_argument('--fields', default='card', choices=sorted(PROJECTIONS))
+    args = parser.parse_args()
+
+    fields = PROJECTIONS[args.fields]
+    templates = []
+    for recipe in synthetic_catalog(1000):
+        recipe.setdefault('tips', recipe.get('instructions'))
+        templates.append({field: recipe.get(field) for field in fields})
+
+    app = Flask(__name__)
+    print(f"{'satır':>8}{'tamponlu MB':>14}{'ms':>9}{'akış MB':>11}{'ms':>9}{'aynı':>7}")
+    for count in (int(s) for s in args.sizes.split(',')):
+        with app.app_context():
+            buffered = measure(lambda: [jsonify(list(rows(templates, count))).get_data()])
+            streamed = measure(lambda: (
+                chunk.encode('utf-8') for chunk in stream_json_array(rows(templates, count)).response))
+        print(f"{count:>8}{buffered[1]:>14.1f}{buffered[2]:>9.1f}{streamed[1]:>11.2f}{streamed[2]:>9.1f}"
+              f"{'evet' if buffered[0] == streamed[0] else 'HAYIR':>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Malzeme önerisi: LIKE/OR taraması ile malzeme indeksinin karşılaştırması.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_suggest.py                   # sentetik katalog
+    python benchmarks/bench_suggest.py --sizes 1000,100000
+"""
+import argparse
+import math
+import re
+import statistics
+import time
+
+from catalog import synthetic_catalog
+from ingredient_index import IngredientIndex
+from recipe_attributes import PORTION_FILTERS, TIME_FILTERS, parse_recipe_attributes
+
+CASES = [
+    (['domates'], ()),
+    (['domates', 'biber', 'soğan'], ()),
+    (['tavuk', 'yoğurt', 'sarımsak', 'pul biber'], (('category', 1),)),
+    (['un', 'şeker', 'yumurta', 'süt', 'tereyağı'], (('porsiyon', '3-4 Kişilik'), ('pisirme_suresi', '30-60 dakika'))),
+]
+OLD_PORTION_PATTERNS = {'1-2 Kişilik': '1-2', '3-4 Kişilik': '3-4', '5-6 Kişilik': '5-6', '6+ Kişilik': '6+'}
+
+
+def old_minutes(text):
+    """Eski `extract_minutes`: metindeki ilk sayı"""
+    match = re.search(r'(\d+)', str(text or ''))
+    return int(match.group(1)) if match else 0
+
+
+def like_scan(catalog, ingredients, filters):
+    """Eski uç noktanın yaptığı iş: OR'lu `LIKE '%malzeme%'`, filtreler ve ilk 15 satır"""
+    wanted = dict(filters)
+    hits = []
+    for r in catalog:
+        text = (r['ingredients'] or '').lower()
+        if not any(i.lower() in text for i in ingredients):
+            continue
+        if 'category' in wanted and r['category_id'] != wanted['category']:
+            continue
+        if 'porsiyon' in wanted and OLD_PORTION_PATTERNS[wanted['porsiyon']] not in r['serving_size']:
+            continue
+        if 'pisirme_suresi' in wanted:
+            low, high = TIME_FILTERS[wanted['pisirme_suresi']]
+            minutes = old_minutes(r['cooking_time'])
+            if (low is not None and minutes < low) or (high is not None and minutes > high):
+                continue
+        hits.append({k: str(v) for k, v in r.items()})
+    return hits[:15]
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def run(catalog, repeat):
+    start = time.perf_counter()
+    index = IngredientIndex()
+    for r in catalog:
+        attributes = parse_recipe_attributes(r['preparation_time'], r['cooking_time'], r['serving_size'])
+        servings_max = attributes['servings_max']
+        if attributes['servings_min'] is not None and servings_max is None:
+            servings_max = math.inf
+        index.add(r['id'], r['ingredients'], [('category', r['category_id'])], r['views'], {
+            'cooking_minutes': attributes['cooking_minutes'],
+            'servings_min': attributes['servings_min'],
+            'servings_max': servings_max,
+        })
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Katalog: {len(catalog)} tarif, indeks kurulumu {build_ms:.1f} ms, {index.stats()['terms']} terim")
+    print(f"{'malzemeler':<44}{'LIKE tarama ms':>16}{'indeks ms':>12}{'en iyi eşleşme':>16}")
+    for ingredients, filters in CASES:
+        like_ms, _ = timed(lambda: like_scan(catalog, ingredients, filters), repeat)
+        tags, ranges = [], []
+        for name, value in filters:
+            if name == 'porsiyon':
+                low, high = PORTION_FILTERS[value]
+                ranges += [('servings_min', None, high), ('servings_max', low, None)]
+            elif name == 'pisirme_suresi':
+                ranges.append(('cooking_minutes',) + TIME_FILTERS[value])
+            else:
+                tags.append((name, value))
+        index_ms, hits = timed(lambda: index.suggest(ingredients, tags, ranges, 15), repeat)
+        best = f"{len(hits[0][1])}/{len(ingredients)}" if hits else '-'
+        print(f"{', '.join(ingredients):<44}{like_ms:>16.3f}{index_ms:>12.3f}{best:>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sizes', default='1000,10000,50000', help="Sentetik katalog boyutları")
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(',')):
+        run(synthetic_catalog(size), args.repeat)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Yanıt biçimleri: JSON, MessagePack ve CBOR boyut ve kodlama/çözme süreleri.
+
+Gövdeler gerçekçi katalog yanıtlarıdır (kart sayfaları, tam tarif
+detayları, sayfasız liste). Ham ve gzip'li boyutlar ile sunucudaki kodlama
+ve istemci tarafındaki çözme süresi (Python'da) ölçülür. JSON kodlaması
+uygulamanın sağlayıcısıyla (orjson kuruluysa onunla) yapılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_wire.py
+    python benchmarks/bench_wire.py --catalog 20000
+"""
+import argparse
+import gzip
+import json
+import time
+
+from flask import Flask
+
+from catalog import synthetic_catalog
+from json_provider import FastJSONProvider
+from projections import CARD_FIELDS, FULL_FIELDS
+import wire_format
+
+
+def best_ms(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--catalog', type=int, default=5000, help="Sayfasız liste için tarif sayısı")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    catalog = synthetic_catalog(args.catalog)
+    for recipe in catalog:
+        recipe['created_at'] = '2024-05-01T12:30:15'
+        recipe.setdefault('tips', recipe.get('instructions'))
+
+    def project(recipes, fields):
+        return [{field: recipe.get(field) for field in fields} for recipe in recipes]
+
+    responses = (
+        ('kart sayfası 20', {'recipes': project(catalog[:20], CARD_FIELDS), 'next_cursor': 'eyJ2IjoxfQ'}),
+        ('kart sayfası 100', {'recipes': project(catalog[:100], CARD_FIELDS), 'next_cursor': 'eyJ2IjoxfQ'}),
+        ('tarif detayı', project(catalog[:1], FULL_FIELDS)[0]),
+        (f'sayfasız {len(catalog)}', project(catalog, CARD_FIELDS)),
+    )
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    codecs = [('json', app.json.dumps_bytes, json.loads)]
+    if wire_format.msgpack is not None:
+        codecs.append(('msgpack', lambda obj: wire_format.encode(obj, wire_format.MSGPACK),
+                       lambda body: wire_format.msgpack.unpackb(body)))
+    if wire_format.cbor2 is not None:
+        codecs.append(('cbor', lambda obj: wire_format.encode(obj, wire_format.CBOR), wire_format.cbor2.loads))
+
+    print(f"{'yanıt':>18}{'biçim':>9}{'bayt':>10}{'gzip':>9}{'oran':>7}{'kodlama ms':>12}{'çözme ms':>10}")
+    for label, payload in responses:
+        json_size = None
+        for name, encode, decode in codecs:
+            body = encode(payload)
+            assert decode(body) == json.loads(app.json.dumps_bytes(payload))
+            json_size = json_size or len(body)
+            encode_ms = best_ms(lambda: encode(payload), args.repeat)
+            decode_ms = best_ms(lambda: decode(body), args.repeat)
+            print(f"{label:>18}{name:>9}{len(body):>10}{len(gzip.compress(body, 6)):>9}"
+                  f"{len(body) / json_size:>7.2f}{encode_ms:>12.3f}{decode_ms:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
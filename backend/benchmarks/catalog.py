@@ -0,0 +1,106 @@
+"""Benchmark'lar için tarif kataloğu: gerçek veritabanından ya da sentetik.
+
+Benchmark'lar `backend/` dizinindeki modülleri içe aktarır; bu yüzden
+`python benchmarks/<betik>.py` şeklinde backend dizininden çalıştırılmalıdır.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DISHES = [
+    'Mercimek Çorbası', 'Karnıyarık', 'İmam Bayıldı', 'Mantı', 'İçli Köfte', 'Menemen',
+    'Sütlaç', 'Baklava', 'Çoban Salatası', 'Kısır', 'Ayran', 'Pilav', 'Tavuk Sote',
+    'Fırın Makarna', 'Kabak Tatlısı', 'Yayla Çorbası', 'Ezogelin Çorbası', 'Lahmacun',
+    'Hünkar Beğendi', 'Etli Nohut', 'Zeytinyağlı Fasulye', 'Patlıcan Musakka',
+    'Sigara Böreği', 'Su Böreği', 'Revani', 'Kazandibi', 'Şakşuka', 'Cacık',
+    'Muhammara', 'Humus', 'Ispanaklı Börek', 'Tarhana Çorbası', 'Kuru Fasulye',
+]
+ADJECTIVES = ['Anne Usulü', 'Kolay', 'Pratik', 'Fırında', 'Ev Yapımı', 'Köy Usulü', 'Hafif', 'Baharatlı']
+INGREDIENTS = [
+    'domates', 'peynir', 'makarna', 'biber', 'patates', 'yumurta', 'süt', 'un', 'tavuk', 'kıyma',
+    'soğan', 'sarımsak', 'zeytinyağı', 'pirinç', 'bulgur', 'yoğurt', 'salça', 'şeker', 'tuz',
+    'limon', 'havuç', 'kabak', 'ıspanak', 'fasulye', 'mercimek', 'nohut', 'sucuk', 'tereyağı',
+    'maydanoz', 'dereotu', 'nane', 'kekik', 'karabiber', 'pul biber', 'patlıcan', 'ceviz',
+    'fındık', 'tarçın', 'susam', 'irmik', 'kaşar', 'lor', 'mantar', 'bezelye', 'mısır',
+]
+STEPS = [
+    'Soğanları yemeklik doğrayın ve tereyağında kavurun.',
+    'Salçayı ekleyip kokusu çıkana kadar karıştırın.',
+    'Tencereye sıcak su ekleyin ve kısık ateşte pişirin.',
+    'Fırını 180 dereceye ısıtın ve 35 dakika pişirin.',
+    'Servis etmeden önce maydanoz ile süsleyin.',
+    'Tüm malzemeleri geniş bir kapta yoğurun.',
+]
+SERVINGS = ['1-2 kişilik', '2 kişilik', '3-4 kişilik', '4 kişilik', '5-6 kişilik', '6+', '8 kişilik']
+TIMES = ['10 dakika', '20 dk', '30 dakika', '45 dakika', '1 saat', '1 saat 15 dakika', '90 dakika', '2 saat']
+
+
+def synthetic_catalog(size, seed=42):
+    """Gerçeğe yakın dağılımlı sentetik tarif listesi üretir"""
+    rng = random.Random(seed)
+    catalog = []
+    for recipe_id in range(1, size + 1):
+        dish = rng.choice(DISHES)
+        ingredients = rng.sample(INGREDIENTS, rng.randint(4, 12))
+        catalog.append({
+            'id': recipe_id,
+            'title': f"{rng.choice(ADJECTIVES)} {dish}",
+            'ingredients': '\n'.join(f"{rng.randint(1, 5)} adet {ing}" for ing in ingredients),
+            'instructions': ' '.join(rng.choice(STEPS) for _ in range(rng.randint(3, 8))),
+            'category_id': rng.randint(1, 7),
+            'views': int(rng.paretovariate(1.2) * 10),
+            'serving_size': rng.choice(SERVINGS),
+            'preparation_time': rng.choice(TIMES),
+            'cooking_time': rng.choice(TIMES),
+            'user_id': rng.randint(1, 200),
+            'username': f"kullanici{rng.randint(1, 200)}",
+            'average_rating': round(rng.uniform(0, 5), 2),
+            'rating_count': rng.randint(0, 300),
+            'favorite_count': rng.randint(0, 500),
+            'image_filename': f"recipe_{recipe_id}.jpg",
+            'tips': 'Afiyet olsun.',
+            'created_at': None,
+        })
+    return catalog
+
+
+def synthetic_interactions(recipe_count, user_count, seed=42):
+    """Sentetik favori [(kullanıcı, tarif)] ve puan [(kullanıcı, tarif, puan)] listeleri.
+
+    Her kullanıcı birkaç "zevk kümesi"nden tarif seçer, seçimler popüler
+    tariflere yığılır; böylece birlikte beğenilme yapısı gerçeğe benzer.
+    """
+    rng = random.Random(seed)
+    clusters = max(1, recipe_count // 200)
+    favorites, ratings = set(), {}
+    for user_id in range(1, user_count + 1):
+        tastes = [rng.randrange(clusters) for _ in range(rng.randint(1, 3))]
+        for _ in range(int(rng.paretovariate(1.5) * 3)):
+            if rng.random() < 0.8:
+                base = rng.choice(tastes) * 200
+                recipe_id = base + min(int(rng.paretovariate(1.1)), 200)
+            else:
+                recipe_id = rng.randint(1, recipe_count)
+            recipe_id = min(recipe_id, recipe_count)
+            if rng.random() < 0.5:
+                favorites.add((user_id, recipe_id))
+            else:
+                ratings[(user_id, recipe_id)] = rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 4])[0]
+    return sorted(favorites), sorted((u, r, rating) for (u, r), rating in ratings.items())
+
+
+def load_catalog_from_db():
+    """Gerçek kataloğu veritabanından okur (pyodbc ve SQL Server gerekir)"""
+    from database_service import db_service
+    with db_service.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT [id], [title], [ingredients], [instructions], [category_id],
+                   COALESCE([views], 0) AS views, [serving_size], [preparation_time],
+                   [cooking_time]
+            FROM [dbo].[Recipe]
+        """)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
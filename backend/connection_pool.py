@@ -0,0 +1,276 @@
+import logging
+import threading
+import time
+
+import pyodbc
+
+
+class PoolTimeoutError(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadığında fırlatılır"""
+
+
+class _PoolEntry:
+    """Havuzdaki tek bir fiziksel bağlantı ve onun zaman bilgileri"""
+    __slots__ = ('raw', 'created_at', 'last_used', 'depth')
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used = now
+        self.depth = 0
+
+
+class PooledConnection:
+    """`with` bloğu boyunca havuzdan bir bağlantı ödünç alır.
+
+    pyodbc bağlantısının kendi context manager davranışını korur: blok hatasız
+    biterse commit, hata ile biterse rollback yapılır. Ardından bağlantı
+    kapatılmak yerine havuza geri verilir.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._entry = None
+
+    def __enter__(self):
+        self._entry = self._pool.acquire()
+        return self._entry.raw
+
+    def __exit__(self, exc_type, exc, tb):
+        entry, self._entry = self._entry, None
+        broken = exc_type is not None and issubclass(
+            exc_type, (pyodbc.OperationalError, pyodbc.InterfaceError))
+        # İç içe kullanımda işlemi yalnızca en dıştaki blok sonlandırır
+        if entry.depth == 1 and not broken:
+            try:
+                if exc_type is None:
+                    entry.raw.commit()
+                else:
+                    entry.raw.rollback()
+            except pyodbc.Error:
+                broken = True
+        self._pool.release(entry, broken=broken)
+        return False
+
+
+class ConnectionPool:
+    """Sınırlı boyutlu, thread-safe pyodbc bağlantı havuzu.
+
+    - `min_size` kadar bağlantı `warm()` ile önceden açılır, en fazla
+      `max_size` bağlantı açık tutulur.
+    - Havuz doluysa `timeout` saniye beklenir, sonra `PoolTimeoutError`.
+    - `validate_idle_after` saniyeden uzun boşta kalan bağlantılar ödünç
+      verilmeden önce `SELECT 1` ile doğrulanır.
+    - `max_lifetime` saniyeden eski bağlantılar kapatılıp yenilenir.
+    - Aynı thread içindeki iç içe istekler aynı bağlantıyı paylaşır; thread
+      bağlantıyı geri verdiğinde bir sonraki istekte yine aynısını almayı
+      tercih eder (`app.run(threaded=True)` için thread affinity).
+    """
+
+    def __init__(self, conn_str, min_size=2, max_size=10, timeout=10.0,
+                 max_lifetime=1800.0, validate_idle_after=30.0, connect=None):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Geçersiz havuz boyutu")
+        self.conn_str = conn_str
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.validate_idle_after = validate_idle_after
+        self._connect = connect or (lambda: pyodbc.connect(self.conn_str))
+        self.logger = logging.getLogger(__name__)
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle = []
+        self._size = 0
+        self._closed = False
+
+        self._waiting = 0
+        self._checkouts = 0
+        self._wait_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._validation_failures = 0
+
+    def connection(self):
+        """`with pool.connection() as conn:` kullanımı için kiralama nesnesi döndürür"""
+        return PooledConnection(self)
+
+    def warm(self):
+        """Havuzu `min_size` bağlantıya kadar doldurur"""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._create_entry()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def acquire(self):
+        """Havuzdan bir bağlantı ödünç alır"""
+        held = getattr(self._local, 'held', None)
+        if held is not None:
+            held.depth += 1
+            return held
+
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        while True:
+            create = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError("Bağlantı havuzu kapatıldı")
+                    entry = self._take_idle()
+                    if entry is not None:
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"{self.timeout} saniye içinde bağlantı alınamadı")
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if create:
+                try:
+                    entry = self._create_entry()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_usable(entry):
+                self._discard(entry)
+                continue
+            break
+
+        elapsed = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            if waited:
+                self._wait_count += 1
+                self._wait_total += elapsed
+                self._wait_max = max(self._wait_max, elapsed)
+        entry.depth = 1
+        self._local.held = entry
+        return entry
+
+    def release(self, entry, broken=False):
+        """Ödünç alınan bağlantıyı havuza geri verir"""
+        entry.depth -= 1
+        if entry.depth > 0:
+            return
+        self._local.held = None
+        now = time.monotonic()
+        if broken or self._closed or now - entry.created_at > self.max_lifetime:
+            if not broken and not self._closed:
+                with self._cond:
+                    self._recycled += 1
+            self._discard(entry)
+            return
+        entry.last_used = now
+        self._local.last = entry
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapatır ve yeni ödünç almayı engeller"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    def stats(self):
+        """Havuzun anlık durumunu döndürür (metrik toplama için)"""
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                'size': self._size,
+                'in_use': self._size - idle,
+                'idle': idle,
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'waits': self._wait_count,
+                'wait_time_total_ms': round(self._wait_total * 1000, 3),
+                'wait_time_max_ms': round(self._wait_max * 1000, 3),
+                'timeouts': self._timeouts,
+                'created': self._created,
+                'recycled': self._recycled,
+                'validation_failures': self._validation_failures,
+            }
+
+    def _take_idle(self):
+        # Önce bu thread'in en son kullandığı bağlantıyı dene
+        last = getattr(self._local, 'last', None)
+        if last is not None:
+            for i, entry in enumerate(self._idle):
+                if entry is last:
+                    return self._idle.pop(i)
+        if self._idle:
+            return self._idle.pop()
+        return None
+
+    def _create_entry(self):
+        entry = _PoolEntry(self._connect())
+        with self._cond:
+            self._created += 1
+        return entry
+
+    def _is_usable(self, entry):
+        now = time.monotonic()
+        if now - entry.created_at > self.max_lifetime:
+            with self._cond:
+                self._recycled += 1
+            return False
+        if now - entry.last_used < self.validate_idle_after:
+            return True
+        try:
+            cursor = entry.raw.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except pyodbc.Error as e:
+            with self._cond:
+                self._validation_failures += 1
+            self.logger.warning(f"Havuzdaki bağlantı doğrulanamadı: {str(e)}")
+            return False
+
+    def _discard(self, entry):
+        if getattr(self._local, 'last', None) is entry:
+            self._local.last = None
+        try:
+            entry.raw.close()
+        except pyodbc.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
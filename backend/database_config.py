@@ -12,4 +12,13 @@ def get_connection_string():
         "Server=YAREN\\SQLEXPRESS;"
         "Database=YemekTarifleri;"
         "Trusted_Connection=yes"
-    ) 
\ No newline at end of file
+    ) 
+
+# Bağlantı havuzu ayarları (bkz. connection_pool.ConnectionPool)
+POOL_CONFIG = {
+    'min_size': 2,
+    'max_size': 10,
+    'timeout': 10.0,           # Havuz doluyken en fazla bekleme (saniye)
+    'max_lifetime': 1800.0,    # Bağlantı en fazla bu kadar süre kullanılır (saniye)
+    'validate_idle_after': 30.0  # Bu süreden uzun boşta kalan bağlantı doğrulanır
+}
@@ -1,13 +1,94 @@
 import pyodbc
-from database_config import get_connection_string
+from database_config import get_connection_string, POOL_CONFIG
+from connection_pool import ConnectionPool
+from pagination import KeysetOrder, Page, encode_cursor, encode_sync_token
+from projections import CARD_FIELDS, FULL_FIELDS, select_list
+from user_cache import UserStateCache
+import loaders
+from view_counter import ViewCounter
+from search_index import SearchIndex
+from ingredient_index import IngredientIndex
+from autocomplete import Autocomplete
+from spelling import SpellIndex
+from similarity import SimilarityIndex
+from leaderboards import Leaderboards
+from read_cache import ReadCache
+from row_plan import RowPlan
+from recommendations import Recommender, co_occurring, interaction_values, item_neighbours
+from recipe_attributes import CATEGORY_FILTERS, PORTION_FILTERS, TIME_FILTERS, parse_recipe_attributes
+from turkish_text import terms
+from collections import defaultdict
+from datetime import datetime, timedelta
+import json
 import logging
+import math
 import re
+import threading
+import time
 import traceback
 
+# Liste sorgularının keyset sıralamaları (son anahtar benzersiz olmalı)
+VIEWS_ORDER = KeysetOrder(('r.[views]', 'DESC', 'views'), ('r.[id]', 'ASC', 'id'))
+CREATED_ORDER = KeysetOrder(('[created_at]', 'DESC', 'created_at'), ('[id]', 'ASC', 'id'))
+TITLE_ORDER = KeysetOrder(('r.[title]', 'ASC', 'title'), ('r.[id]', 'ASC', 'id'))
+
+# Silme kayıtları bu kadar gün saklanır; daha eski jetonla gelen istemci baştan senkronize edilir
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+# /api/sync'te içeriği değişmeyen tarifler için gönderilen sayaç alanları
+SYNC_COUNTER_FIELDS = ('id', 'views', 'favorite_count', 'average_rating', 'rating_count')
+# rowversion karşılaştırmalarında BIGINT parametre
+_ROW_VERSION = "CAST(CAST(? AS BIGINT) AS BINARY(8))"
+
+# /api/batch işlem türleri ve istemci işlem kimliğinin en fazla uzunluğu
+BATCH_OPERATION_TYPES = ('favorite_add', 'favorite_remove', 'rate', 'comment_add')
+MAX_OPERATION_ID_LENGTH = 64
+# İşlem sonuçları bu kadar gün saklanır; daha geç tekrar gönderilen işlem yeniden uygulanır
+BATCH_OPERATION_RETENTION_DAYS = 30
+
+class _BatchAborted(Exception):
+    """Toplu işlemin veritabanı işlemi bozuldu; hiçbir işlem uygulanmadan geri alındı"""
+
+def _is_transient(error):
+    """Kilitlenme, kilit/sorgu zaman aşımı ve bağlantı hataları: işlem aynen tekrar denenebilir"""
+    if isinstance(error, pyodbc.OperationalError):
+        return True
+    state = error.args[0] if error.args else ''
+    message = str(error)
+    return state in ('40001', 'HYT00', 'HYT01') or '(1205)' in message or '(1222)' in message
+
+def _retry_result(op_id):
+    return {'op_id': op_id, 'status': 500, 'replayed': False,
+            'body': {'error': 'İşlem uygulanamadı, tekrar deneyin'}}
+
+def _invalid_id_result():
+    return {'op_id': None, 'status': 400, 'replayed': False,
+            'body': {'error': f'op_id 1-{MAX_OPERATION_ID_LENGTH} karakterlik bir metin olmalı'}}
+
 class DatabaseService:
     def __init__(self):
         self.conn_str = get_connection_string()
-        self.connection = None
+        self.pool = ConnectionPool(self.conn_str, **POOL_CONFIG)
+        self.user_states = UserStateCache(self._load_user_state)
+        self.views = ViewCounter(self._flush_views)
+        self.search_index = SearchIndex()
+        self.spelling = SpellIndex()
+        self.ingredient_index = IngredientIndex()
+        self.autocomplete = Autocomplete()
+        self.similarity = SimilarityIndex()
+        self.recommendations = Recommender()
+        self.leaderboards = Leaderboards()
+        # Katalog okumaları; anahtarlar tablo/tarif sürümlerine bağlıdır (bkz. ReadCache)
+        self.read_cache = ReadCache()
+        self._leaderboard_reconcile_lock = threading.Lock()
+        self._recommendations_checked_at = 0.0
+        self._index_lock = threading.Lock()
+        self._index_retry_at = {}
+        # Nokta sorguları için varlık tipi başına toplu getirme fonksiyonları
+        self.batch_fns = {
+            'recipe': self._fetch_recipes_by_ids,
+            'user': self._fetch_users_by_ids,
+            'comment': self._fetch_comments_by_ids,
+        }
         self.setup_logging()
         
     def setup_logging(self):
@@ -15,243 +96,701 @@ class DatabaseService:
         self.logger = logging.getLogger(__name__)
         
     def get_connection(self):
-        return pyodbc.connect(self.conn_str)
+        """Havuzdan bağlantı kiralar; `with self.get_connection() as conn:` ile kullanılır"""
+        return self.pool.connection()
 
     def connect(self):
-        """Veritabanına bağlantı kurar"""
+        """Bağlantı havuzunu ısıtır ve veritabanına erişimi doğrular"""
         try:
-            if self.connection:
-                return True
-                
-            self.connection = pyodbc.connect(self.conn_str)
+            self.pool.warm()
+            with self.get_connection() as conn:
+                conn.cursor().execute("SELECT 1")
             self.logger.info("Veritabanı bağlantısı başarılı")
-            return True
         except Exception as e:
             self.logger.error(f"Veritabanı bağlantı hatası: {str(e)}")
             raise Exception(f"Veritabanı bağlantı hatası: {str(e)}")
-            
+        self.build_indexes()
+        return True
+
+    def build_indexes(self):
+        """Bellek içi indeksleri başlangıçta kurar; hata olursa SQL yollarına düşülür"""
+        for name in ('search_index', 'ingredient_index', 'autocomplete', 'similarity', 'recommendations',
+                     'leaderboards'):
+            try:
+                getattr(self, f'build_{name}')()
+            except Exception as e:
+                self.logger.warning(f"{name} kurulamadı, ilk kullanımda yeniden denenecek: {str(e)}")
+
+    def build_search_index(self):
+        """Tarif kataloğundan arama indeksini ve yazım düzeltme sözlüğünü baştan kurar"""
+        index = SearchIndex()
+        spelling = SpellIndex()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT [id], [title], [ingredients], [instructions], COALESCE([views], 0)
+                FROM [dbo].[Recipe]
+            """)
+            while True:
+                rows = cursor.fetchmany(500)
+                if not rows:
+                    break
+                for row in rows:
+                    index.add(row[0], row[1], row[2], row[3], row[4])
+                    spelling.add_text(row[1])
+                    spelling.add_text(row[2])
+        spelling.ready = True
+        self.spelling = spelling
+        # Eski indeksin imleçleri yeni indekste reddedilsin
+        index.version = self.search_index.version + 1
+        index.ready = True
+        self.search_index = index
+        self.logger.info(f"Arama indeksi kuruldu: {len(index)} tarif, {len(spelling)} kelime")
+        return index
+
+    def build_ingredient_index(self):
+        """Tarif kataloğundan malzeme indeksini baştan kurar ve eskisinin yerine koyar"""
+        index = IngredientIndex()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT [id], [ingredients], [category_id], COALESCE([views], 0),
+                       [cooking_minutes], [servings_min], [servings_max]
+                FROM [dbo].[Recipe]
+            """)
+            while True:
+                rows = cursor.fetchmany(500)
+                if not rows:
+                    break
+                for row in rows:
+                    index.add(row[0], row[1], [('category', row[2])], row[3],
+                              self._suggestion_values(row[4], row[5], row[6]))
+        index.ready = True
+        self.ingredient_index = index
+        self.logger.info(f"Malzeme indeksi kuruldu: {len(index)} tarif")
+        return index
+
+    def build_autocomplete(self):
+        """Tarif başlıkları ve malzeme adlarından yazarken tamamlama indeksini baştan kurar"""
+        index = Autocomplete()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT [id], [title], [ingredients], COALESCE([views], 0)
+                FROM [dbo].[Recipe]
+            """)
+
+            def rows():
+                while True:
+                    batch = cursor.fetchmany(500)
+                    if not batch:
+                        return
+                    yield from batch
+
+            index.load(tuple(row) for row in rows())
+        index.ready = True
+        self.autocomplete = index
+        self.logger.info(f"Otomatik tamamlama indeksi kuruldu: {len(index.titles)} başlık, "
+                         f"{len(index.ingredients)} malzeme")
+        return index
+
+    def build_similarity(self):
+        """Malzeme benzerliğine göre her tarifin en yakın komşularını baştan hesaplar"""
+        index = SimilarityIndex()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT [id], [ingredients] FROM [dbo].[Recipe]")
+            recipes = []
+            while True:
+                batch = cursor.fetchmany(500)
+                if not batch:
+                    break
+                recipes.extend(tuple(row) for row in batch)
+        started = time.perf_counter()
+        index.build(recipes)
+        index.ready = True
+        self.similarity = index
+        self.logger.info(f"Benzer tarif indeksi kuruldu ({index.backend}): {len(index)} tarif, "
+                         f"{(time.perf_counter() - started) * 1000:.0f} ms")
+        return index
+
+    def build_recommendations(self):
+        """Çevrimdışı kurulan tarif komşularını ve popüler tarifleri belleğe yükler"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT TOP 1 [id] FROM [dbo].[RecommendationBuild] ORDER BY [id] DESC")
+            row = cursor.fetchone()
+            build_id = row[0] if row else None
+            cursor.execute("""
+                SELECT [recipe_id], [neighbour_id], [score]
+                FROM [dbo].[RecipeNeighbour]
+                ORDER BY [recipe_id], [score] DESC
+            """)
+            neighbours = defaultdict(list)
+            while True:
+                batch = cursor.fetchmany(5000)
+                if not batch:
+                    break
+                for recipe_id, neighbour_id, score in batch:
+                    neighbours[recipe_id].append((neighbour_id, score))
+            cursor.execute("""
+                SELECT TOP 100 [id]
+                FROM [dbo].[Recipe]
+                ORDER BY [favorite_count] DESC, [average_rating] DESC, [views] DESC, [id]
+            """)
+            popular = [row[0] for row in cursor.fetchall()]
+        index = Recommender(dict(neighbours), popular, build_id)
+        index.ready = True
+        self.recommendations = index
+        self._recommendations_checked_at = time.monotonic()
+        self.logger.info(f"Öneri modeli yüklendi (kurulum {build_id}): {len(index)} tarif")
+        return index
+
+    def _refresh_recommendations(self):
+        """Çevrimdışı iş yeni bir model yazdıysa yeniden yükler; en fazla beş dakikada bir bakılır"""
+        if time.monotonic() - self._recommendations_checked_at < 300:
+            return
+        self._recommendations_checked_at = time.monotonic()
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT TOP 1 [id] FROM [dbo].[RecommendationBuild] ORDER BY [id] DESC")
+                row = cursor.fetchone()
+            if row and row[0] != self.recommendations.build_id:
+                self.build_recommendations()
+        except Exception as e:
+            self.logger.warning(f"Öneri modeli yenilenemedi: {str(e)}")
+
+    def build_leaderboards(self):
+        """Görüntülenme, puan, favori ve trend listelerini veritabanından baştan kurar"""
+        index = Leaderboards()
+        # Yaşı on yarı ömürden büyük olayların ağırlığı binde birin altındadır
+        window_hours = int(index.half_life_hours * 10)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT [id], [category_id], COALESCE([views], 0), COALESCE([rating_sum], 0),
+                       COALESCE([rating_count], 0), COALESCE([favorite_count], 0)
+                FROM [dbo].[Recipe]
+            """)
+            recipes = [tuple(row) for row in cursor.fetchall()]
+            # Her olayın şimdiki ağırlığı w * e^(-λ * yaş); index.epoch şimdidir
+            cursor.execute("""
+                SELECT e.[recipe_id], SUM(e.[weight] * EXP(-? * DATEDIFF(SECOND, e.[created_at], GETDATE())))
+                FROM (
+                    SELECT [recipe_id], [created_at], 1.0 AS [weight]
+                    FROM [dbo].[favorites]
+                    WHERE [created_at] >= DATEADD(HOUR, -?, GETDATE())
+                    UNION ALL
+                    SELECT [recipe_id], [created_at], [rating] / 5.0
+                    FROM [dbo].[RecipeRating]
+                    WHERE [created_at] >= DATEADD(HOUR, -?, GETDATE())
+                ) AS e
+                GROUP BY e.[recipe_id]
+            """, (index.decay, window_hours, window_hours))
+            trends = {row[0]: float(row[1]) for row in cursor.fetchall()}
+        index.load(recipes, trends)
+        self._fill_leaderboard_cards(index)
+        index.ready = True
+        self.leaderboards = index
+        self.logger.info(f"Sıralama listeleri kuruldu: {len(index)} tarif, {len(trends)} trend tarif")
+        return index
+
+    def _fill_leaderboard_cards(self, index=None):
+        """Listelere girip kartı bellekte olmayan tarifleri toplu yükler"""
+        index = index or self.leaderboards
+        missing = list(index.missing_cards())
+        for i in range(0, len(missing), 500):
+            recipes = self._fetch_recipes_by_ids(missing[i:i + 500])
+            index.set_cards({field: recipe.get(field) for field in CARD_FIELDS} for recipe in recipes.values())
+
+    def _update_leaderboards(self, apply):
+        """Yazma yolundan gelen değişikliği listelere uygular; hata yazmayı bozmaz"""
+        if not self.leaderboards.ready:
+            return
+        try:
+            apply(self.leaderboards)
+            self._fill_leaderboard_cards()
+        except Exception as e:
+            self.logger.warning(f"Sıralama listeleri güncellenemedi: {str(e)}")
+
+    def _schedule_leaderboard_reconcile(self):
+        """Listeler on dakikadan eskiyse arka planda veritabanından yeniden kurar.
+
+        Okumalar yeniden kurulum bitene kadar eski listelerden yapılır.
+        """
+        if time.monotonic() - self.leaderboards.built_at < 600:
+            return
+        if not self._leaderboard_reconcile_lock.acquire(blocking=False):
+            return
+
+        def reconcile():
+            try:
+                self.build_leaderboards()
+            except Exception as e:
+                # Başarısız uzlaştırma her istekte yeniden denenmesin
+                self.leaderboards.built_at = time.monotonic()
+                self.logger.warning(f"Sıralama listeleri uzlaştırılamadı: {str(e)}")
+            finally:
+                self._leaderboard_reconcile_lock.release()
+
+        threading.Thread(target=reconcile, name='leaderboard-reconcile', daemon=True).start()
+
+    @staticmethod
+    def _suggestion_values(cooking_minutes, servings_min, servings_max):
+        """Malzeme önerisi aralık filtreleri için tarifin sayısal alanları"""
+        if servings_min is not None and servings_max is None:
+            servings_max = math.inf  # "6+" gibi üst sınırı olmayan porsiyonlar
+        return {
+            'cooking_minutes': cooking_minutes,
+            'servings_min': servings_min,
+            'servings_max': servings_max,
+        }
+
+    def _ensure_index(self, name):
+        """İndeks hazır değilse kurmayı dener; hazırsa True döner.
+
+        Başarısız denemeden sonra bir dakika boyunca yeniden denenmez, böylece
+        her istek tüm kataloğu yeniden yüklemeye çalışmaz.
+        """
+        if getattr(self, name).ready:
+            return True
+        with self._index_lock:
+            if not getattr(self, name).ready and time.monotonic() >= self._index_retry_at.get(name, 0.0):
+                try:
+                    getattr(self, f'build_{name}')()
+                except Exception as e:
+                    self._index_retry_at[name] = time.monotonic() + 60
+                    self.logger.warning(f"{name} kurulamadı: {str(e)}")
+        return getattr(self, name).ready
+
     def disconnect(self):
-        """Veritabanı bağlantısını kapatır"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            self.logger.info("Veritabanı bağlantısı kapatıldı")
+        """Bekleyen görüntülenmeleri yazar ve havuzdaki tüm bağlantıları kapatır"""
+        self.views.stop()
+        self.pool.close()
+        self.logger.info("Veritabanı bağlantıları kapatıldı")
+
+    def begin_request_scope(self):
+        """İstek boyunca nokta sorgularını toplayıp hatırlayan yükleyici kapsamını açar"""
+        return loaders.begin_scope(self.batch_fns)
+
+    def end_request_scope(self, token):
+        loaders.end_scope(token)
+
+    def loaders(self):
+        """Aktif istek kapsamının yükleyicileri; kapsam yoksa bu çağrıya özel geçici olanlar"""
+        return loaders.current_scope() or loaders.RequestLoaders(self.batch_fns)
+
+    def _forget(self, name, key):
+        """Yazma sonrası istek içinde hatırlanan eski değeri düşürür"""
+        scope = loaders.current_scope()
+        if scope is not None:
+            scope.forget(name, key)
+
+    def _build_page_query(self, order, limit, after, conditions, params):
+        """Keyset sayfalama için TOP, WHERE ve ORDER BY parçalarını üretir.
+
+        `limit` verilirse bir fazla satır istenir; böylece `order.paginate`
+        sonraki sayfanın olup olmadığını ek sorgu olmadan anlar.
+        """
+        conditions = list(conditions)
+        params = list(params)
+        if after:
+            clause, clause_params = order.where(after)
+            conditions.append(clause)
+            params.extend(clause_params)
+        top = ""
+        if limit:
+            top = "TOP (?)"
+            params.insert(0, limit + 1)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        return top, where, order.order_by(), params
             
     def get_categories(self):
         """Tüm kategorileri getirir"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT [id] as id, [name] as name 
-                    FROM [dbo].[Category] 
-                    ORDER BY [name]
-                """)
-                columns = [column[0] for column in cursor.description]
-                categories = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                print("Categories from database:", categories)  # Debug print
-                return categories
+            return self.read_cache.get_or_load(('categories',), ('Category',), self._load_categories, ttl=3600)
         except Exception as e:
             self.logger.error(f"Kategorileri getirirken hata: {str(e)}")
             raise Exception(f"Kategorileri getirirken hata: {str(e)}")
 
-    def get_recipes(self, category_id=None):
-        """Tüm tarifleri veya belirli bir kategoriye ait tarifleri getirir"""
+    def _load_categories(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT [id] as id, [name] as name 
+                FROM [dbo].[Category] 
+                ORDER BY [name]
+            """)
+            columns = [column[0] for column in cursor.description]
+            categories = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return categories
+
+    def get_recipes(self, category_id=None, limit=None, after=None, fields=CARD_FIELDS):
+        """Tüm tarifleri veya belirli bir kategoriye ait tarifleri getirir.
+
+        `limit` verilirse keyset sayfalama yapılır; `after` bir önceki sayfanın
+        imlecinden çözülen sıralama değerleridir. `fields` yalnızca istenen
+        sütunların veritabanından çekilmesini sağlar.
+        """
         try:
-            print("[DEBUG] get_recipes çağrıldı")
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                if category_id:
-                    query = """
-                        SELECT 
-                            r.[id],
-                            r.[title],
-                            r.[ingredients],
-                            r.[instructions],
-                            r.[created_at],
-                            r.[user_id],
-                            r.[category_id],
-                            r.[views],
-                            r.[serving_size],
-                            r.[preparation_time],
-                            r.[cooking_time],
-                            r.[tips],
-                            r.[image_filename],
-                            r.[ingredients_sections],
-                            u.[username],
-                            COALESCE(r.[average_rating], 0.0) as average_rating,
-                            COALESCE(r.[rating_count], 0) as rating_count,
-                            (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
-                        FROM [dbo].[Recipe] r
-                        LEFT JOIN [dbo].[User] u ON r.[user_id] = u.[id]
-                        WHERE r.[category_id] = ?
-                        ORDER BY r.[views] DESC
-                    """
-                    print(f"[DEBUG] Kategori ID ile sorgu çalıştırılıyor: {category_id}")
-                    cursor.execute(query, category_id)
-                else:
-                    query = """
-                        SELECT 
-                            r.[id],
-                            r.[title],
-                            r.[ingredients],
-                            r.[instructions],
-                            r.[created_at],
-                            r.[user_id],
-                            r.[category_id],
-                            r.[views],
-                            r.[serving_size],
-                            r.[preparation_time],
-                            r.[cooking_time],
-                            r.[tips],
-                            r.[image_filename],
-                            r.[ingredients_sections],
-                            u.[username],
-                            COALESCE(r.[average_rating], 0.0) as average_rating,
-                            COALESCE(r.[rating_count], 0) as rating_count,
-                            (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
-                        FROM [dbo].[Recipe] r
-                        LEFT JOIN [dbo].[User] u ON r.[user_id] = u.[id]
-                        ORDER BY r.[views] DESC
-                    """
-                    print("[DEBUG] Tüm tarifler için sorgu çalıştırılıyor")
-                    cursor.execute(query)
-                
-                columns = [column[0] for column in cursor.description]
-                print(f"[DEBUG] Sütunlar: {columns}")
-                
-                recipes = []
-                for row in cursor.fetchall():
-                    try:
-                        recipe = dict(zip(columns, row))
-                        # Tarih alanlarını string'e çevir
-                        if recipe.get('created_at'):
-                            recipe['created_at'] = recipe['created_at'].isoformat()
-                        recipes.append(recipe)
-                    except Exception as e:
-                        print(f"[DEBUG] Satır dönüştürme hatası: {str(e)}")
-                        continue
-                
-                print(f"[DEBUG] Veritabanından {len(recipes)} tarif alındı")
-                if recipes:
-                    print("[DEBUG] İlk tarif örneği:", {
-                        'id': recipes[0].get('id'),
-                        'title': recipes[0].get('title'),
-                        'ingredients': recipes[0].get('ingredients')[:100] + '...' if recipes[0].get('ingredients') else None
-                    })
-                return recipes
-                
+            key = ('recipes', category_id, limit, tuple(after) if after else None, tuple(fields))
+            return self.read_cache.get_or_load(
+                key, ('Recipe', 'User'), lambda: self._load_recipes(category_id, limit, after, fields))
         except Exception as e:
-            print(f"[DEBUG] get_recipes hatası: {str(e)}")
-            print(f"[DEBUG] Hata detayı: {traceback.format_exc()}")
-            return []
+            self.logger.exception(f"get_recipes hatası: {str(e)}")
+            return Page()
+
+    def _recipes_query(self, category_id, limit, after, fields):
+        conditions, params = [], []
+        if category_id:
+            conditions.append("r.[category_id] = ?")
+            params.append(category_id)
+        top, where, order_by, params = self._build_page_query(
+            VIEWS_ORDER, limit, after, conditions, params)
+        select_columns = select_list(fields, VIEWS_ORDER.fields, overrides={'username': 'u.[username]'})
+        query = f"""
+            SELECT {top}
+                {select_columns}
+            FROM [dbo].[Recipe] r
+            LEFT JOIN [dbo].[User] u ON r.[user_id] = u.[id]
+            {where}
+            {order_by}
+        """
+        return query, params
+
+    def _load_recipes(self, category_id, limit, after, fields):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(*self._recipes_query(category_id, limit, after, fields))
+            
+            # Tarih ve DECIMAL sütunları plan tarafından dönüştürülür
+            plan = RowPlan.for_cursor(cursor)
+            recipes = VIEWS_ORDER.paginate(plan.dicts(cursor.fetchall()), limit)
+            self.logger.debug(f"Veritabanından {len(recipes)} tarif alındı")
+            return recipes
+
+    def stream_recipes(self, category_id=None, fields=CARD_FIELDS, batch_size=500):
+        """`get_recipes` ile aynı satırları sayfasız, (plan, satırlar) grupları olarak üretir"""
+        return self._stream_row_batches(*self._recipes_query(category_id, None, None, fields), batch_size)
+
+    def _stream_row_batches(self, query, params, batch_size=500):
+        """Sorgu sonucunu `fetchmany` ile okuyup (RowPlan, satır demetleri) grupları üretir.
+
+        Bellekte aynı anda en fazla `batch_size` satır bulunur. Havuz
+        bağlantısı üreteç tükenene ya da kapatılana kadar tutulur.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            plan = RowPlan.for_cursor(cursor)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield plan, rows
+
+    def search_recipes(self, search_term, limit=None, after=None, fields=CARD_FIELDS, mode='and'):
+        """Tariflerde arama yapar.
+
+        Sorgu bellek içi arama indeksinden BM25 + popülerlik skoruyla
+        yanıtlanır; `mode` 'and' ise tüm terimler, 'or' ise herhangi biri
+        aranır. 'fuzzy' kipinde sözlükte olmayan kelimeler önce en yakın
+        sözlük kelimesine düzeltilir ("mercimek corbsi" -> "mercimek
+        çorbası"). Kesin arama boş dönerse düzeltilmiş sorgu sonucun
+        `did_you_mean` alanında önerilir. İndeks hazır değilse ya da sorguda
+        terim yoksa LIKE aramasına düşülür.
+
+        İndeks imleci indeks sürümünü taşır; o sayfadan bu yana skorlar
+        değiştiyse (bkz. SearchIndex.search_page) ValueError fırlatılır.
+        """
+        if not terms(search_term) or not self._ensure_index('search_index'):
+            return self._search_recipes_like(search_term, limit, after, fields)
+        try:
+            hits, next_cursor, did_you_mean = self._search_hits(search_term, limit, after, mode)
+            recipes = self.get_recipes_by_ids([recipe_id for recipe_id, _ in hits], fields)
+            page = Page(recipes, next_cursor)
+            page.did_you_mean = did_you_mean
+            return page
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Tarif araması yapılırken hata: {str(e)}")
+            return Page()
 
-    def search_recipes(self, search_term):
-        """Tariflerde arama yapar"""
+    def _search_hits(self, search_term, limit, after, mode):
+        """İndeks araması: (isabetler [(tarif_id, skor)], sonraki imleç, did_you_mean)"""
+        query = search_term
+        did_you_mean = None
+        if mode == 'fuzzy':
+            did_you_mean = self.spelling.correct(search_term)
+            query = did_you_mean or search_term
+        version = None
+        if after:
+            # İmleç: [indeks sürümü, skor, tarif_id]
+            if len(after) != 3:
+                raise ValueError("Geçersiz sayfalama imleci")
+            version, after = after[0], tuple(after[1:])
+        hits, version = self.search_index.search_page(
+            query, mode='or' if mode == 'or' else 'and', limit=limit + 1 if limit else None,
+            after=after, version=version)
+        if not hits and not after and mode != 'fuzzy':
+            did_you_mean = self.spelling.correct(search_term)
+        next_cursor = None
+        if limit and len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = encode_cursor([version, hits[-1][1], hits[-1][0]])
+        return hits, next_cursor, did_you_mean
+
+    def stream_search_recipes(self, search_term, fields=CARD_FIELDS, mode='and', batch_size=500):
+        """Sayfasız arama sonuçlarını parça parça üretir; (did_you_mean, üreteç) döner.
+
+        İndeksten yalnızca id'ler alınır; tarifler `batch_size`'lık gruplar
+        hâlinde yüklenir. Sonuç `search_recipes` ile aynıdır.
+        """
+        if not terms(search_term) or not self._ensure_index('search_index'):
+            batches = self._stream_row_batches(*self._search_like_query(search_term, None, None, fields), batch_size)
+            return None, (recipe for plan, rows in batches for recipe in plan.dicts(rows))
+        hits, _, did_you_mean = self._search_hits(search_term, None, None, mode)
+        recipe_ids = [recipe_id for recipe_id, _ in hits]
+
+        def recipes():
+            for start in range(0, len(recipe_ids), batch_size):
+                yield from self.get_recipes_by_ids(recipe_ids[start:start + batch_size], fields)
+        return did_you_mean, recipes()
+
+    def _search_like_query(self, search_term, limit, after, fields):
+        pattern = f"%{search_term}%"
+        top, where, order_by, params = self._build_page_query(
+            VIEWS_ORDER, limit, after,
+            ["(r.[title] LIKE ? OR r.[ingredients] LIKE ? OR r.[instructions] LIKE ?)"],
+            [pattern, pattern, pattern])
+        select_columns = select_list(fields, VIEWS_ORDER.fields)
+        query = f"""
+            SELECT {top}
+                {select_columns}
+            FROM [dbo].[Recipe] r
+            {where}
+            {order_by}
+        """
+        return query, params
+
+    def _search_recipes_like(self, search_term, limit=None, after=None, fields=CARD_FIELDS):
+        """LIKE ile tam tablo taraması yapan eski arama yolu"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        r.[id],
-                        r.[title],
-                        r.[ingredients],
-                        r.[instructions],
-                        r.[created_at],
-                        r.[user_id],
-                        r.[category_id],
-                        r.[views],
-                        r.[serving_size],
-                        r.[preparation_time],
-                        r.[cooking_time],
-                        r.[tips],
-                        r.[image_filename],
-                        r.[ingredients_sections],
-                        r.[username],
-                        r.[average_rating],
-                        r.[rating_count]
-                    FROM [dbo].[Recipe] r
-                    WHERE r.[title] LIKE ? OR r.[ingredients] LIKE ? OR r.[instructions] LIKE ?
-                    ORDER BY r.[views] DESC
-                """, f"%{search_term}%", f"%{search_term}%", f"%{search_term}%")
-                columns = [column[0] for column in cursor.description]
-                recipes = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                return recipes
+                cursor.execute(*self._search_like_query(search_term, limit, after, fields))
+                recipes = RowPlan.for_cursor(cursor).dicts(cursor.fetchall())
+                return VIEWS_ORDER.paginate(recipes, limit)
         except Exception as e:
             self.logger.error(f"Tarif araması yapılırken hata: {str(e)}")
-            return []
+            return Page()
+
+    def suggest_recipes(self, ingredients, category_id=None, portion=None, cooking_time=None, limit=15):
+        """Eldeki malzemelere göre tarif önerir.
 
-    def get_top_recipes(self):
-        """En çok görüntülenen tarifleri getirir"""
+        Adaylar malzeme indeksinden gelir; kategori filtresi etiket, porsiyon
+        ve süre filtreleri ayrıştırılmış sütunlar üzerindeki aralık indeksleri
+        olarak uygulanır. Porsiyon filtresi, tarifin kişi aralığı filtreninkiyle
+        kesişiyorsa sağlanır ("2 kişilik" tarif "1-2 Kişilik"e uyar). Her tarife
+        `matching_ingredients` (seçilenlerden tarifte olanlar),
+        `unmatched_ingredients` (seçilenlerden tarifte olmayanlar),
+        `required_ingredients` (tarifin eksik kalan malzemeleri) ve
+        `match_count` eklenir.
+        """
+        if not self._ensure_index('ingredient_index'):
+            return []
+        filters = [('category', category_id)] if category_id is not None else []
+        ranges = []
+        for dimension, label in (('porsiyon', portion), ('pisirme_suresi', cooking_time)):
+            if label:
+                option = self._filter_option(dimension, label)
+                if option is None:
+                    return []
+                ranges.extend(option[1])
         try:
+            hits = self.ingredient_index.suggest(ingredients, filters, ranges, limit)
+            recipes = {
+                recipe['id']: recipe
+                for recipe in self.get_recipes_by_ids([hit[0] for hit in hits], FULL_FIELDS)
+            }
+            results = []
+            for recipe_id, matched, unmatched, missing in hits:
+                recipe = recipes.get(recipe_id)
+                if recipe is None:
+                    continue
+                recipe['matching_ingredients'] = matched
+                recipe['unmatched_ingredients'] = unmatched
+                recipe['required_ingredients'] = missing
+                recipe['match_count'] = len(matched)
+                results.append(recipe)
+            return results
+        except Exception as e:
+            self.logger.error(f"Tarif önerileri getirilirken hata: {str(e)}")
+            return []
+
+    @staticmethod
+    def _filter_option(dimension, label):
+        """Mobil filtre seçeneğinin indeks karşılığı: (etiketler, aralıklar); bilinmiyorsa None"""
+        if dimension == 'yemek_turu' and label in CATEGORY_FILTERS:
+            return [('category', CATEGORY_FILTERS[label])], []
+        if dimension == 'porsiyon' and label in PORTION_FILTERS:
+            # Tarifin kişi aralığı seçenekle kesişmeli: en_az <= üst ve en_çok >= alt
+            low, high = PORTION_FILTERS[label]
+            return [], [('servings_min', None, high), ('servings_max', low, None)]
+        if dimension == 'pisirme_suresi' and label in TIME_FILTERS:
+            low, high = TIME_FILTERS[label]
+            return [], [('cooking_minutes', low, high)]
+        return None
+
+    def recipe_facets(self, ingredients=(), selection=None):
+        """Filtre ekranı için her seçeneğin döndüreceği tarif sayısı.
+
+        `selection` {'yemek_turu'|'porsiyon'|'pisirme_suresi': etiket}
+        şeklindeki mevcut seçimdir. Malzeme verilmişse yalnızca en az birini
+        içeren tarifler sayılır (öneri uç noktasının aday kümesi).
+        """
+        facets = {
+            'yemek_turu': CATEGORY_FILTERS,
+            'porsiyon': PORTION_FILTERS,
+            'pisirme_suresi': TIME_FILTERS,
+        }
+        options = {
+            dimension: {label: self._filter_option(dimension, label) for label in labels}
+            for dimension, labels in facets.items()
+        }
+        if not self._ensure_index('ingredient_index'):
+            return None
+        total, counts = self.ingredient_index.facet_counts(ingredients, options, selection or {})
+        return {'total': total, 'facets': counts}
+
+    def autocomplete_prefix(self, prefix, limit=10, kinds=('recipes', 'ingredients')):
+        """Yazılan öneke uyan en popüler tarif başlıklarını ve malzeme adlarını döndürür"""
+        if not self._ensure_index('autocomplete'):
+            return {kind: [] for kind in kinds}
+        return self.autocomplete.complete(prefix, limit, kinds)
+
+    def ingredient_vocabulary(self):
+        """Katalogdaki tariflerden çıkarılmış malzeme adları; indeks hazır değilse boş liste"""
+        if not self._ensure_index('autocomplete'):
+            return []
+        return self.autocomplete.vocabulary()
+
+    def get_similar_recipes(self, recipe_id, limit=10, fields=CARD_FIELDS):
+        """Malzemeleri en çok benzeyen tarifler, benzerlik skoruyla birlikte.
+
+        Tarif indekste yoksa (ya da indeks kurulamadıysa) None döner.
+        """
+        if not self._ensure_index('similarity'):
+            return None
+        neighbours = self.similarity.similar(recipe_id, limit)
+        if neighbours is None:
+            return None
+        scores = dict(neighbours)
+        recipes = self.get_recipes_by_ids([other_id for other_id, _ in neighbours], fields)
+        for recipe in recipes:
+            recipe['similarity'] = scores.get(recipe.get('id'))
+        return recipes
+
+    def get_recommendations(self, user_id, limit=20, fields=CARD_FIELDS):
+        """Kullanıcının favori ve puanlarına göre kişisel öneriler; geçmişi yoksa popüler tarifler.
+
+        Her kartta `recommendation_score` ve `recommendation_source`
+        ('personal' / 'popular') bulunur. Model yüklenemediyse None döner.
+        """
+        if not self._ensure_index('recommendations'):
+            return None
+        self._refresh_recommendations()
+        favorites, ratings = self.user_states.snapshot(user_id)
+        hits = self.recommendations.recommend(favorites, ratings, limit)
+        details = {recipe_id: (score, source) for recipe_id, score, source in hits}
+        recipes = self.get_recipes_by_ids(list(details), fields)
+        for recipe in recipes:
+            recipe['recommendation_score'], recipe['recommendation_source'] = details[recipe['id']]
+        return recipes
+
+    def get_top_recipes(self, fields=CARD_FIELDS, by='views', category_id=None, limit=10):
+        """Ölçüte göre en iyi tarifler; her kartta ölçütün `score` değeri bulunur.
+
+        `by`: 'views', 'rating' (Bayes ortalaması), 'favorites' ya da
+        'trending'. Listeler bellekten okunur; kart alanları dışında alan
+        istenirse tarifler loader ile yüklenir. Listeler kurulamadıysa SQL'e
+        düşülür.
+        """
+        if self._ensure_index('leaderboards'):
+            self._schedule_leaderboard_reconcile()
+            entries = self.leaderboards.top(by, category_id, limit)
+            if set(fields) <= set(CARD_FIELDS) and all(card is not None for _, _, card in entries):
+                return [
+                    dict({field: card.get(field) for field in fields}, score=score)
+                    for _, score, card in entries
+                ]
+            recipes = {r['id']: r for r in self.get_recipes_by_ids([rid for rid, _, _ in entries], fields)}
+            return [dict(recipes[rid], score=score) for rid, score, _ in entries if rid in recipes]
+        return self._get_top_recipes_sql(fields, by, category_id, limit)
+
+    def _get_top_recipes_sql(self, fields, by, category_id, limit):
+        """Bellek içi listeler yokken yedek yol; trend yerine favori sayısı kullanılır"""
+        order_by = {
+            'views': "r.[views] DESC",
+            'rating': "COALESCE(r.[average_rating], 0) DESC, r.[rating_count] DESC",
+            'favorites': "r.[favorite_count] DESC",
+            'trending': "r.[favorite_count] DESC",
+        }[by]
+
+        def load():
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT TOP 10
-                        r.[id],
-                        r.[title],
-                        r.[ingredients],
-                        r.[instructions],
-                        r.[created_at],
-                        r.[user_id],
-                        r.[category_id],
-                        r.[views],
-                        r.[serving_size],
-                        r.[preparation_time],
-                        r.[cooking_time],
-                        r.[tips],
-                        r.[image_filename],
-                        r.[ingredients_sections],
-                        r.[username],
-                        r.[average_rating],
-                        r.[rating_count],
-                        (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
+                select_columns = select_list(fields)
+                where = "WHERE r.[category_id] = ?" if category_id is not None else ""
+                cursor.execute(f"""
+                    SELECT TOP {int(limit)}
+                        {select_columns}
                     FROM [dbo].[Recipe] r
-                    ORDER BY r.[views] DESC
-                """)
-                columns = [column[0] for column in cursor.description]
-                recipes = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                print("Top recipes from database:", recipes)  # Debug print
-                return recipes
+                    {where}
+                    ORDER BY {order_by}, r.[id]
+                """, [category_id] if category_id is not None else [])
+                return RowPlan.for_cursor(cursor).dicts(cursor.fetchall())
+
+        try:
+            key = ('top_recipes', by, category_id, limit, tuple(fields))
+            return self.read_cache.get_or_load(key, ('Recipe',), load)
         except Exception as e:
-            self.logger.error(f"En çok görüntülenen tarifler getirilirken hata: {str(e)}")
+            self.logger.error(f"En iyi tarifler getirilirken hata: {str(e)}")
             return []
 
-    def get_recipes_by_category(self, category_id):
-        try:
+    def get_recipes_by_category(self, category_id, limit=None, after=None, fields=CARD_FIELDS):
+        def load():
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        r.[id],
-                        r.[title],
-                        r.[ingredients],
-                        r.[instructions],
-                        r.[created_at],
-                        r.[user_id],
-                        r.[category_id],
-                        r.[views],
-                        r.[serving_size],
-                        r.[preparation_time],
-                        r.[cooking_time],
-                        r.[tips],
-                        r.[image_filename],
-                        r.[ingredients_sections],
-                        r.[username],
-                        r.[average_rating],
-                        r.[rating_count],
-                        (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
-                    FROM [dbo].[Recipe] r
-                    WHERE r.[category_id] = ?
-                    ORDER BY r.[views] DESC
-                """, category_id)
-                columns = [column[0] for column in cursor.description]
-                recipes = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                return recipes
+                cursor.execute(*self._category_recipes_query(category_id, limit, after, fields))
+                recipes = RowPlan.for_cursor(cursor).dicts(cursor.fetchall())
+                return VIEWS_ORDER.paginate(recipes, limit)
+
+        try:
+            key = ('recipes_by_category', category_id, limit, tuple(after) if after else None, tuple(fields))
+            return self.read_cache.get_or_load(key, ('Recipe',), load)
         except Exception as e:
             self.logger.error(f"Kategoriye göre tarifler getirilirken hata: {str(e)}")
-            return []
+            return Page()
+
+    def stream_recipes_by_category(self, category_id, fields=CARD_FIELDS, batch_size=500):
+        """`get_recipes_by_category` ile aynı satırları sayfasız, (plan, satırlar) grupları olarak üretir"""
+        return self._stream_row_batches(*self._category_recipes_query(category_id, None, None, fields), batch_size)
+
+    def _category_recipes_query(self, category_id, limit, after, fields):
+        top, where, order_by, params = self._build_page_query(
+            VIEWS_ORDER, limit, after, ["r.[category_id] = ?"], [category_id])
+        select_columns = select_list(fields, VIEWS_ORDER.fields)
+        query = f"""
+            SELECT {top}
+                {select_columns}
+            FROM [dbo].[Recipe] r
+            {where}
+            {order_by}
+        """
+        return query, params
 
     def login_user(self, username, password):
         """Kullanıcı girişi kontrolü yapar"""
@@ -355,6 +894,17 @@ class DatabaseService:
                 if existing_email:
                     return None, "Bu email adresi zaten kullanılıyor"
                     
+                # Kullanıcı adı tarif kartlarında görünür; değişirse tariflerin
+                # /api/sync içerik sürümü artırılır
+                cursor.execute("""
+                    UPDATE v
+                    SET v.[changed_at] = GETDATE()
+                    FROM [dbo].[RecipeSyncVersion] v
+                    INNER JOIN [dbo].[Recipe] r ON r.[id] = v.[recipe_id]
+                    INNER JOIN [dbo].[User] u ON u.[id] = r.[user_id]
+                    WHERE u.[email] = ? AND u.[username] != ?
+                """, (email, username))
+                
                 # Profili güncelle
                 cursor.execute("""
                     UPDATE [dbo].[User]
@@ -363,6 +913,8 @@ class DatabaseService:
                 """, (username, email, email))
                 
                 conn.commit()
+                # Kullanıcı adı tarif listelerine ve yorumlara join ile girer
+                self.read_cache.bump('User')
                 
                 # Güncellenmiş kullanıcı bilgilerini al
                 cursor.execute("""
@@ -421,29 +973,38 @@ class DatabaseService:
             self.logger.error(f"Şifre değiştirilirken hata: {str(e)}")
             return None, str(e)
 
-    def get_user_recipes(self, user_id):
+    def get_user_recipes(self, user_id, limit=None, after=None):
         """Kullanıcının tariflerini getirir"""
         try:
             print(f"Getting recipes for user_id: {user_id}")  # Debug log
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT
-                        id,
-                        title,
-                        views
+                top, where, order_by, params = self._build_page_query(
+                    CREATED_ORDER, limit, after, ["[user_id] = ?"], [user_id])
+                cursor.execute(f"""
+                    SELECT {top}
+                        [id],
+                        [title],
+                        [views],
+                        [created_at]
                     FROM [dbo].[Recipe]
-                    WHERE user_id = ?
-                    ORDER BY created_at DESC
-                """, (user_id,))
+                    {where}
+                    {order_by}
+                """, params)
                 
-                recipes = []
-                for row in cursor.fetchall():
-                    recipes.append({
+                rows = [
+                    {
                         'id': row[0],
                         'title': row[1],
-                        'views': row[2]
-                    })
+                        'views': row[2],
+                        'created_at': row[3]
+                    }
+                    for row in cursor.fetchall()
+                ]
+                recipes = CREATED_ORDER.paginate(rows, limit)
+                for recipe in recipes:
+                    if recipe['created_at']:
+                        recipe['created_at'] = recipe['created_at'].isoformat()
                 
                 print(f"Found {len(recipes)} recipes")  # Debug log
                 print("Recipes:", recipes)  # Debug log
@@ -458,88 +1019,264 @@ class DatabaseService:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Önce bu tarifin zaten favorilerde olup olmadığını kontrol et
-                cursor.execute("""
-                    SELECT COUNT(*) as count
-                    FROM [dbo].[favorites]
-                    WHERE user_id = ? AND recipe_id = ?
-                """, (user_id, recipe_id))
-                
-                if cursor.fetchone()[0] > 0:
+                if not self._insert_favorite(cursor, user_id, recipe_id):
                     return False, "Bu tarif zaten favorilerinizde"
-                
-                # Favorilere ekle
-                cursor.execute("""
-                    INSERT INTO [dbo].[favorites] (user_id, recipe_id)
-                    VALUES (?, ?)
-                """, (user_id, recipe_id))
-                
                 conn.commit()
-                return True, "Tarif favorilere eklendi"
+            self._favorite_added(user_id, recipe_id)
+            return True, "Tarif favorilere eklendi"
                 
         except Exception as e:
             self.logger.error(f"Favori ekleme hatası: {str(e)}")
             return False, f"Tarif favorilere eklenirken hata oluştu: {str(e)}"
 
+    def _insert_favorite(self, cursor, user_id, recipe_id):
+        """Favoriyi ve tarifin sayacını verilen imleçte yazar (commit çağıranındır); eklenmediyse False"""
+        # Kontrol ve ekleme tek ifadede; kilit ipuçları eşzamanlı
+        # isteklerin aynı favoriyi iki kez eklemesini engeller
+        cursor.execute("""
+            INSERT INTO [dbo].[favorites] (user_id, recipe_id)
+            SELECT ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM [dbo].[favorites] WITH (UPDLOCK, HOLDLOCK)
+                WHERE user_id = ? AND recipe_id = ?
+            )
+        """, (user_id, recipe_id, user_id, recipe_id))
+        
+        if cursor.rowcount == 0:
+            return False
+        
+        # Favori sayacını aynı işlem içinde artır
+        cursor.execute("""
+            UPDATE [dbo].[Recipe]
+            SET [favorite_count] = [favorite_count] + 1
+            WHERE [id] = ?
+        """, (recipe_id,))
+        return True
+
+    def _favorite_added(self, user_id, recipe_id):
+        """Commit edilen favori eklemesini bellekteki durumlara yansıtır"""
+        self.user_states.add_favorite(user_id, recipe_id)
+        self._forget('recipe', recipe_id)
+        self.read_cache.bump('Recipe', ('Recipe', int(recipe_id)))
+        self._update_leaderboards(lambda boards: boards.add_favorite(int(recipe_id)))
+
     def remove_from_favorites(self, user_id, recipe_id):
         """Tarifi kullanıcının favorilerinden kaldırır"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                cursor.execute("""
-                    DELETE FROM [dbo].[favorites]
-                    WHERE user_id = ? AND recipe_id = ?
-                """, (user_id, recipe_id))
-                
+                removed = self._delete_favorite(cursor, user_id, recipe_id)
                 conn.commit()
-                return True, "Tarif favorilerden kaldırıldı"
+            self._favorite_removed(user_id, recipe_id, removed)
+            return True, "Tarif favorilerden kaldırıldı"
                 
         except Exception as e:
             self.logger.error(f"Favorilerden kaldırma hatası: {str(e)}")
             return False, f"Tarif favorilerden kaldırılırken hata oluştu: {str(e)}"
 
-    def get_user_favorites(self, user_id):
-        """Kullanıcının favori tariflerini getirir"""
+    def _delete_favorite(self, cursor, user_id, recipe_id):
+        """Favoriyi siler, sayacı azaltır ve silme kaydını yazar; silinen satır sayısını döndürür"""
+        cursor.execute("""
+            DELETE FROM [dbo].[favorites]
+            WHERE user_id = ? AND recipe_id = ?
+        """, (user_id, recipe_id))
+        
+        # Sayaç yalnızca gerçekten silinen satır kadar azaltılır
+        removed = cursor.rowcount
+        if removed > 0:
+            cursor.execute("""
+                UPDATE [dbo].[Recipe]
+                SET [favorite_count] = CASE
+                    WHEN [favorite_count] > ? THEN [favorite_count] - ?
+                    ELSE 0
+                END
+                WHERE [id] = ?
+            """, (removed, removed, recipe_id))
+            cursor.execute("""
+                INSERT INTO [dbo].[SyncTombstone] ([entity], [entity_id], [user_id])
+                VALUES ('favorite', ?, ?)
+            """, (recipe_id, user_id))
+        return removed
+
+    def _favorite_removed(self, user_id, recipe_id, removed):
+        """Commit edilen favori silmesini bellekteki durumlara yansıtır"""
+        self.user_states.remove_favorite(user_id, recipe_id)
+        self._forget('recipe', recipe_id)
+        if removed > 0:
+            self.read_cache.bump('Recipe', ('Recipe', int(recipe_id)))
+            self._update_leaderboards(lambda boards: boards.remove_favorite(int(recipe_id)))
+
+    def reconcile_favorite_counts(self):
+        """Sapmış favori sayaçlarını favorites tablosundan toplu olarak yeniden hesaplar.
+
+        Düzeltilen tarif sayısını döndürür.
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT 
-                        r.id AS id, 
-                        r.title AS title, 
-                        r.views AS views, 
-                        r.created_at AS created_at, 
-                        r.cooking_time AS cooking_time,
-                        r.image_filename AS image_filename, 
-                        r.ingredients AS ingredients,
-                        r.instructions AS instructions,
-                        r.tips AS tips,
-                        COALESCE(r.serving_size, 'Bilinmiyor') AS serving_size,
-                        r.category_id AS category_id,
-                        r.user_id AS user_id,
-                        r.preparation_time AS preparation_time,
-                        COALESCE(r.average_rating, 0.0) AS average_rating,
-                        COALESCE(r.rating_count, 0) AS rating_count,
-                        (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
+                    UPDATE r
+                    SET r.[favorite_count] = COALESCE(fc.[cnt], 0)
+                    FROM [dbo].[Recipe] r
+                    LEFT JOIN (
+                        SELECT [recipe_id], COUNT(*) AS [cnt]
+                        FROM [dbo].[favorites]
+                        GROUP BY [recipe_id]
+                    ) fc ON fc.[recipe_id] = r.[id]
+                    WHERE r.[favorite_count] <> COALESCE(fc.[cnt], 0)
+                """)
+                fixed = cursor.rowcount
+                conn.commit()
+                self.logger.info(f"Favori sayacı düzeltilen tarif sayısı: {fixed}")
+                return fixed
+        except Exception as e:
+            self.logger.error(f"Favori sayaçları düzeltilirken hata: {str(e)}")
+            raise Exception(f"Favori sayaçları düzeltilirken hata: {str(e)}")
+
+    def backfill_recipe_attributes(self, batch_size=500):
+        """Tüm tariflerin süre ve porsiyon metinlerini yeniden ayrıştırıp sayısal sütunlara yazar.
+
+        Değeri değişen tarif sayısını döndürür.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT [id], [preparation_time], [cooking_time], [serving_size],
+                           [preparation_minutes], [cooking_minutes], [servings_min], [servings_max]
+                    FROM [dbo].[Recipe]
+                """)
+                changed = []
+                for row in cursor.fetchall():
+                    attributes = parse_recipe_attributes(row[1], row[2], row[3])
+                    values = (attributes['preparation_minutes'], attributes['cooking_minutes'],
+                              attributes['servings_min'], attributes['servings_max'])
+                    if values != tuple(row[4:8]):
+                        changed.append((row[0],) + values)
+
+                for i in range(0, len(changed), batch_size):
+                    chunk = changed[i:i + batch_size]
+                    placeholders = ", ".join(["(?, ?, ?, ?, ?)"] * len(chunk))
+                    cursor.execute(f"""
+                        UPDATE r
+                        SET r.[preparation_minutes] = v.[preparation_minutes],
+                            r.[cooking_minutes] = v.[cooking_minutes],
+                            r.[servings_min] = v.[servings_min],
+                            r.[servings_max] = v.[servings_max]
+                        FROM [dbo].[Recipe] r
+                        INNER JOIN (VALUES {placeholders}) AS v(
+                            [id], [preparation_minutes], [cooking_minutes], [servings_min], [servings_max]
+                        ) ON v.[id] = r.[id]
+                    """, [param for values in chunk for param in values])
+                conn.commit()
+                self.logger.info(f"Süre/porsiyon sütunları güncellenen tarif sayısı: {len(changed)}")
+                return len(changed)
+        except Exception as e:
+            self.logger.error(f"Tarif süre/porsiyon sütunları doldurulurken hata: {str(e)}")
+            raise Exception(f"Tarif süre/porsiyon sütunları doldurulurken hata: {str(e)}")
+
+    def build_recommendation_model(self, incremental=False, top_k=20, batch_size=500):
+        """Favori ve puanlardan tarif komşularını hesaplayıp RecipeNeighbour tablosuna yazar.
+
+        `incremental` ise yalnızca son kurulumun watermark'ından sonra
+        favorilenen ya da puanlanan tarifler ve onlarla ortak kullanıcısı olan
+        tarifler yeniden hesaplanır; önceki kurulum yoksa tam kurulum yapılır.
+        Silinen favoriler yalnızca tam kurulumda yansır. Yeniden yazılan tarif
+        sayısını döndürür.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT TOP 1 [watermark] FROM [dbo].[RecommendationBuild] ORDER BY [id] DESC")
+                row = cursor.fetchone()
+                since = row[0] if row and incremental else None
+                # Okumadan önce alınır; okuma sırasında gelen satırlar bir sonraki yenilemede tekrar işlenir
+                cursor.execute("""
+                    SELECT MAX([created_at]) FROM (
+                        SELECT MAX([created_at]) AS [created_at] FROM [dbo].[favorites]
+                        UNION ALL
+                        SELECT MAX([created_at]) FROM [dbo].[RecipeRating]
+                    ) AS t
+                """)
+                watermark = cursor.fetchone()[0] or datetime.now()
+                touched = None
+                if since is not None:
+                    cursor.execute("""
+                        SELECT [recipe_id] FROM [dbo].[favorites] WHERE [created_at] > ?
+                        UNION
+                        SELECT [recipe_id] FROM [dbo].[RecipeRating] WHERE [created_at] > ?
+                    """, (since, since))
+                    touched = {row[0] for row in cursor.fetchall()}
+                    if not touched:
+                        self.logger.info("Öneri modeli güncel, yeni favori ya da puan yok")
+                        return 0
+
+                cursor.execute("SELECT [user_id], [recipe_id] FROM [dbo].[favorites]")
+                favorites = cursor.fetchall()
+                cursor.execute("SELECT [user_id], [recipe_id], [rating] FROM [dbo].[RecipeRating]")
+                ratings = cursor.fetchall()
+                values = interaction_values(favorites, ratings)
+
+                if touched is None:
+                    neighbours = item_neighbours(values, top_k)
+                    cursor.execute("DELETE FROM [dbo].[RecipeNeighbour]")
+                else:
+                    neighbours = item_neighbours(values, top_k, co_occurring(values, touched))
+                    recipe_ids = list(neighbours)
+                    for i in range(0, len(recipe_ids), batch_size):
+                        chunk = recipe_ids[i:i + batch_size]
+                        cursor.execute(f"""
+                            DELETE FROM [dbo].[RecipeNeighbour]
+                            WHERE [recipe_id] IN ({", ".join("?" * len(chunk))})
+                        """, chunk)
+
+                rows = [
+                    (recipe_id, neighbour_id, score)
+                    for recipe_id, items in neighbours.items() for neighbour_id, score in items
+                ]
+                for i in range(0, len(rows), batch_size):
+                    chunk = rows[i:i + batch_size]
+                    placeholders = ", ".join(["(?, ?, ?)"] * len(chunk))
+                    cursor.execute(f"""
+                        INSERT INTO [dbo].[RecipeNeighbour] ([recipe_id], [neighbour_id], [score])
+                        VALUES {placeholders}
+                    """, [param for row in chunk for param in row])
+                cursor.execute("""
+                    INSERT INTO [dbo].[RecommendationBuild] ([kind], [watermark], [recipes])
+                    VALUES (?, ?, ?)
+                """, ('full' if touched is None else 'incremental', watermark, len(neighbours)))
+                conn.commit()
+                self.logger.info(f"Öneri modeli {'tam' if touched is None else 'artımlı'} kuruldu: "
+                                 f"{len(neighbours)} tarif, {len(rows)} komşuluk")
+                return len(neighbours)
+        except Exception as e:
+            self.logger.error(f"Öneri modeli kurulurken hata: {str(e)}")
+            raise Exception(f"Öneri modeli kurulurken hata: {str(e)}")
+
+    def get_user_favorites(self, user_id, limit=None, after=None, fields=CARD_FIELDS):
+        """Kullanıcının favori tariflerini getirir"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                top, where, order_by, params = self._build_page_query(
+                    TITLE_ORDER, limit, after, ["f.user_id = ?"], [user_id])
+                select_columns = select_list(fields, TITLE_ORDER.fields)
+                cursor.execute(f"""
+                    SELECT {top}
+                        {select_columns}
                     FROM [dbo].[Recipe] r
                     INNER JOIN [dbo].[favorites] f ON r.id = f.recipe_id
                     INNER JOIN [dbo].[User] u ON r.user_id = u.id
-                    WHERE f.user_id = ?
-                    ORDER BY r.title
-                """, (user_id,))
-                columns = [column[0] for column in cursor.description]
-                recipes = []
-                for row in cursor.fetchall():
-                    recipe = dict(zip(columns, row))
-                    # Tarih alanlarını string'e çevir
-                    if recipe.get('created_at'):
-                        recipe['created_at'] = recipe['created_at'].isoformat()
+                    {where}
+                    {order_by}
+                """, params)
+                page = TITLE_ORDER.paginate(RowPlan.for_cursor(cursor).dicts(cursor.fetchall()), limit)
+                recipes = Page(next_cursor=page.next_cursor)
+                for recipe in page:
                     # Eksik veya null değerleri doldur
-                    if not recipe.get('serving_size'):
+                    if 'serving_size' in recipe and not recipe['serving_size']:
                         recipe['serving_size'] = 'Bilinmiyor'
-                    if not recipe.get('favorite_count'):
+                    if 'favorite_count' in recipe and not recipe['favorite_count']:
                         recipe['favorite_count'] = 0
                     recipes.append(recipe)
                 return recipes, None
@@ -551,22 +1288,37 @@ class DatabaseService:
     def is_favorite(self, user_id, recipe_id):
         """Tarifin kullanıcının favorilerinde olup olmadığını kontrol eder"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT COUNT(*) as count
-                    FROM [dbo].[favorites]
-                    WHERE user_id = ? AND recipe_id = ?
-                """, (user_id, recipe_id))
-                
-                count = cursor.fetchone()[0]
-                return count > 0, None
-                
+            return self.user_states.is_favorite(user_id, recipe_id), None
         except Exception as e:
             self.logger.error(f"Favori kontrolü hatası: {str(e)}")
             return False, f"Favori kontrolü yapılırken hata oluştu: {str(e)}"
 
+    def get_user_recipe_states(self, user_id, recipe_ids):
+        """Birden çok tarif için kullanıcının favori durumunu ve puanını getirir"""
+        try:
+            states = self.user_states.get_states(user_id, recipe_ids)
+            return {
+                recipe_id: {'is_favorite': is_favorite, 'rating': rating}
+                for recipe_id, (is_favorite, rating) in states.items()
+            }, None
+        except Exception as e:
+            self.logger.error(f"Toplu favori/puan kontrolü hatası: {str(e)}")
+            return None, f"Favori ve puan bilgileri alınırken hata oluştu: {str(e)}"
+
+    def _load_user_state(self, user_id):
+        """Kullanıcı önbelleği için favori id'lerini ve puanları tek bağlantıda yükler"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT [recipe_id] FROM [dbo].[favorites] WHERE [user_id] = ?
+            """, (user_id,))
+            favorites = [row[0] for row in cursor.fetchall()]
+            cursor.execute("""
+                SELECT [recipe_id], [rating] FROM [dbo].[RecipeRating] WHERE [user_id] = ?
+            """, (user_id,))
+            ratings = {row[0]: row[1] for row in cursor.fetchall()}
+            return favorites, ratings
+
     def create_recipe(self, title, user_id, category_id, ingredients, instructions, servings=None, prep_time=None, cook_time=None, tips=None, image_url=None):
         try:
             # SQL sorgusu
@@ -582,11 +1334,16 @@ class DatabaseService:
                     cooking_time, 
                     tips, 
                     image_filename,
+                    preparation_minutes,
+                    cooking_minutes,
+                    servings_min,
+                    servings_max,
                     created_at
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, GETDATE());
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, GETDATE());
                 SELECT SCOPE_IDENTITY() as id;
             """
+            attributes = parse_recipe_attributes(prep_time, cook_time, servings)
             
             # Sorguyu çalıştır
             with self.get_connection() as conn:
@@ -602,10 +1359,19 @@ class DatabaseService:
                     cook_time,  # cooking_time alanına
                     tips,
                     image_url,  # image_filename alanına
+                    attributes['preparation_minutes'],
+                    attributes['cooking_minutes'],
+                    attributes['servings_min'],
+                    attributes['servings_max'],
                 ))
                 
-                # Yeni eklenen tarifin ID'sini al
-                recipe_id = cursor.fetchone()[0]
+                # Yeni eklenen tarifin ID'sini al (SCOPE_IDENTITY Decimal döner)
+                recipe_id = int(cursor.fetchone()[0])
+                
+                # /api/sync tam kartı içerik sürümünden seçer
+                cursor.execute("""
+                    INSERT INTO [dbo].[RecipeSyncVersion] ([recipe_id]) VALUES (?)
+                """, (recipe_id,))
                 
                 # Yeni eklenen tarifi getir
                 cursor.execute("""
@@ -628,6 +1394,22 @@ class DatabaseService:
                 
                 recipe = cursor.fetchone()
                 conn.commit()
+                self.read_cache.bump('Recipe', ('Recipe', recipe_id))
+                
+                if self.search_index.ready:
+                    self.search_index.add(recipe_id, title, ingredients, instructions, 0)
+                    self.spelling.add_text(title)
+                    self.spelling.add_text(ingredients)
+                if self.autocomplete.ready:
+                    self.autocomplete.add_recipe(recipe_id, title, ingredients)
+                if self.similarity.ready:
+                    self.similarity.add(recipe_id, ingredients)
+                self._update_leaderboards(lambda boards: boards.add_recipe(recipe_id, int(category_id)))
+                if self.ingredient_index.ready:
+                    self.ingredient_index.add(
+                        recipe_id, ingredients, [('category', category_id)], 0,
+                        self._suggestion_values(attributes['cooking_minutes'],
+                                                attributes['servings_min'], attributes['servings_max']))
                 
                 # Tarif bilgilerini sözlük olarak döndür
                 if recipe:
@@ -649,88 +1431,91 @@ class DatabaseService:
                 return None
                 
         except Exception as e:
+            # Rollback, bağlantı havuza dönmeden önce get_connection tarafından yapılır
             print(f"Error creating recipe: {str(e)}")
-            if 'conn' in locals():
-                conn.rollback()
             raise e
 
     def rate_recipe(self, recipe_id, user_id, rating):
+        """Kullanıcının puanını kaydeder ve tarifin puan istatistiklerini günceller.
+
+        Upsert ve istatistik güncellemesi tek işlemde, tek gidiş-dönüşte
+        yapılır: RecipeRating yeniden taranmaz, toplam/sayı/histogram eski ve
+        yeni puan arasındaki fark kadar değiştirilir. UPDLOCK/HOLDLOCK aynı
+        kullanıcının eşzamanlı isteklerini sıraya sokar; Recipe satırındaki
+        göreli artışlar farklı kullanıcıların puanlarını kaybetmez.
+        """
         try:
-            # Önce kullanıcının daha önce puan verip vermediğini kontrol et
-            check_query = """
-                SELECT id FROM RecipeRating 
-                WHERE recipe_id = ? AND user_id = ?
-            """
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(check_query, (recipe_id, user_id))
-                existing_rating = cursor.fetchone()
-
-            if existing_rating:
-                # Mevcut puanı güncelle
-                update_query = """
-                    UPDATE RecipeRating 
-                    SET rating = ?, created_at = GETDATE()
-                    WHERE recipe_id = ? AND user_id = ?
-                """
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(update_query, (rating, recipe_id, user_id))
-            else:
-                # Yeni puan ekle
-                insert_query = """
-                    INSERT INTO RecipeRating (recipe_id, user_id, rating, created_at)
-                    VALUES (?, ?, ?, GETDATE())
-                """
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(insert_query, (recipe_id, user_id, rating))
-
-            # Ortalama puanı ve toplam puan sayısını hesapla
-            stats_query = """
-                SELECT AVG(CAST(rating AS FLOAT)) as average_rating, COUNT(*) as rating_count
-                FROM RecipeRating
-                WHERE recipe_id = ?
-            """
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(stats_query, (recipe_id,))
-                stats = cursor.fetchone()
-
-            # Tariflerin ortalama puanını güncelle
-            update_recipe_query = """
-                UPDATE Recipe 
-                SET average_rating = ?, rating_count = ?
-                WHERE id = ?
-            """
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(update_recipe_query, (stats[0], stats[1], recipe_id))
+                stats = self._upsert_rating(cursor, recipe_id, user_id, rating)
+                if not stats:
+                    conn.rollback()
+                    return {'success': False, 'message': 'Tarif bulunamadı'}
                 conn.commit()
-
-            return {
-                'success': True,
-                'average_rating': float(stats[0]) if stats[0] else 0.0,
-                'rating_count': stats[1]
-            }
+            return self._rating_saved(recipe_id, user_id, rating, stats)
 
         except Exception as e:
             print(f"Error in rate_recipe: {str(e)}")
             return {'success': False, 'message': str(e)}
 
+    def _upsert_rating(self, cursor, recipe_id, user_id, rating):
+        """Puanı ve tarifin istatistiklerini verilen imleçte yazar; tarif yoksa None.
+
+        Dönen satır: (average_rating, rating_count, rating_1 ... rating_5)
+        """
+        query = """
+            SET NOCOUNT ON;
+            DECLARE @recipe_id INT = ?, @user_id INT = ?, @new INT = ?, @old INT;
+
+            SELECT @old = [rating]
+            FROM [dbo].[RecipeRating] WITH (UPDLOCK, HOLDLOCK)
+            WHERE [recipe_id] = @recipe_id AND [user_id] = @user_id;
+
+            IF @old IS NULL
+                INSERT INTO [dbo].[RecipeRating] ([recipe_id], [user_id], [rating], [created_at])
+                VALUES (@recipe_id, @user_id, @new, GETDATE());
+            ELSE
+                UPDATE [dbo].[RecipeRating]
+                SET [rating] = @new, [created_at] = GETDATE()
+                WHERE [recipe_id] = @recipe_id AND [user_id] = @user_id;
+
+            UPDATE [dbo].[Recipe]
+            SET [rating_sum] = [rating_sum] + @new - COALESCE(@old, 0),
+                [rating_count] = [rating_count] + CASE WHEN @old IS NULL THEN 1 ELSE 0 END,
+                [average_rating] = CAST([rating_sum] + @new - COALESCE(@old, 0) AS FLOAT)
+                    / NULLIF([rating_count] + CASE WHEN @old IS NULL THEN 1 ELSE 0 END, 0),
+                [rating_1] = [rating_1] + IIF(@new = 1, 1, 0) - IIF(@old = 1, 1, 0),
+                [rating_2] = [rating_2] + IIF(@new = 2, 1, 0) - IIF(@old = 2, 1, 0),
+                [rating_3] = [rating_3] + IIF(@new = 3, 1, 0) - IIF(@old = 3, 1, 0),
+                [rating_4] = [rating_4] + IIF(@new = 4, 1, 0) - IIF(@old = 4, 1, 0),
+                [rating_5] = [rating_5] + IIF(@new = 5, 1, 0) - IIF(@old = 5, 1, 0)
+            OUTPUT INSERTED.[average_rating], INSERTED.[rating_count],
+                   INSERTED.[rating_1], INSERTED.[rating_2], INSERTED.[rating_3],
+                   INSERTED.[rating_4], INSERTED.[rating_5]
+            WHERE [id] = @recipe_id;
+        """
+        cursor.execute(query, (recipe_id, user_id, rating))
+        return cursor.fetchone()
+
+    def _rating_saved(self, recipe_id, user_id, rating, stats):
+        """Commit edilen puanı bellekteki durumlara yansıtır ve yanıt sözlüğünü döndürür"""
+        self.user_states.set_rating(user_id, recipe_id, rating)
+        self._forget('recipe', recipe_id)
+        self.read_cache.bump('Recipe', ('Recipe', int(recipe_id)))
+        rating_sum = sum(star * stats[1 + star] for star in range(1, 6))
+        self._update_leaderboards(
+            lambda boards: boards.set_rating(int(recipe_id), rating_sum, stats[1], int(rating)))
+
+        return {
+            'success': True,
+            'average_rating': float(stats[0]) if stats[0] else 0.0,
+            'rating_count': stats[1],
+            'histogram': {str(star): stats[1 + star] for star in range(1, 6)}
+        }
+
     def get_user_rating(self, recipe_id, user_id):
         try:
-            query = """
-                SELECT rating 
-                FROM RecipeRating 
-                WHERE recipe_id = ? AND user_id = ?
-            """
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, (recipe_id, user_id))
-                result = cursor.fetchone()
-                return result[0] if result else None
-
+            return self.user_states.get_rating(user_id, recipe_id)
         except Exception as e:
             print(f"Error in get_user_rating: {str(e)}")
             return None
@@ -741,37 +1526,11 @@ class DatabaseService:
             self.logger.info(f"Yorum ekleme başladı - recipe_id: {recipe_id}, user_id: {user_id}")
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Yorumu ekle ve ID'sini al
-                cursor.execute("""
-                    INSERT INTO [dbo].[Comment] (recipe_id, user_id, content, created_at)
-                    OUTPUT INSERTED.id
-                    VALUES (?, ?, ?, GETDATE())
-                """, (recipe_id, user_id, content))
-                
-                comment_id = cursor.fetchone()[0]
-                self.logger.info(f"Yorum eklendi, comment_id: {comment_id}")
-                
-                # Eklenen yorumu getir
-                cursor.execute("""
-                    SELECT c.id, c.content, c.created_at, c.user_id, c.recipe_id, u.username
-                    FROM [dbo].[Comment] c
-                    INNER JOIN [dbo].[User] u ON c.user_id = u.id
-                    WHERE c.id = ?
-                """, comment_id)
-                
-                result = cursor.fetchone()
+                comment = self._insert_comment(cursor, recipe_id, user_id, content)
                 conn.commit()
+                self.read_cache.bump(('Comment', int(recipe_id)))
                 
-                if result:
-                    comment = {
-                        'id': result[0],
-                        'content': result[1],
-                        'created_at': result[2].isoformat() if result[2] else None,
-                        'user_id': result[3],
-                        'recipe_id': result[4],
-                        'username': result[5]
-                    }
+                if comment:
                     self.logger.info(f"Yorum başarıyla getirildi: {comment}")
                     return comment
                 
@@ -782,9 +1541,41 @@ class DatabaseService:
             self.logger.error(f"Yorum eklenirken hata: {str(e)}")
             raise Exception(f"Yorum eklenirken bir hata oluştu: {str(e)}")
 
+    def _insert_comment(self, cursor, recipe_id, user_id, content):
+        """Yorumu verilen imleçte ekler ve eklenen yorumu döndürür (commit çağıranındır)"""
+        # Yorumu ekle ve ID'sini al
+        cursor.execute("""
+            INSERT INTO [dbo].[Comment] (recipe_id, user_id, content, created_at)
+            OUTPUT INSERTED.id
+            VALUES (?, ?, ?, GETDATE())
+        """, (recipe_id, user_id, content))
+        
+        comment_id = cursor.fetchone()[0]
+        self.logger.info(f"Yorum eklendi, comment_id: {comment_id}")
+        
+        # Eklenen yorumu getir
+        cursor.execute("""
+            SELECT c.id, c.content, c.created_at, c.user_id, c.recipe_id, u.username
+            FROM [dbo].[Comment] c
+            INNER JOIN [dbo].[User] u ON c.user_id = u.id
+            WHERE c.id = ?
+        """, comment_id)
+        
+        result = cursor.fetchone()
+        if not result:
+            return None
+        return {
+            'id': result[0],
+            'content': result[1],
+            'created_at': result[2].isoformat() if result[2] else None,
+            'user_id': result[3],
+            'recipe_id': result[4],
+            'username': result[5]
+        }
+
     def get_recipe_comments(self, recipe_id):
         """Tarife ait yorumları getirir"""
-        try:
+        def load():
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
@@ -807,7 +1598,10 @@ class DatabaseService:
                     }
                     comments.append(comment)
                 return comments
-                
+
+        try:
+            return self.read_cache.get_or_load(
+                ('comments', int(recipe_id)), (('Comment', int(recipe_id)), 'User'), load, ttl=300)
         except Exception as e:
             self.logger.error(f"Yorumlar getirilirken hata: {str(e)}")
             return []
@@ -815,79 +1609,177 @@ class DatabaseService:
     def delete_comment(self, comment_id, user_id):
         """Kullanıcının yorumunu siler"""
         try:
+            # Önce yorumun bu kullanıcıya ait olup olmadığını kontrol et
+            comment = self.loaders()['comment'].load(comment_id)
+            if not comment or comment['user_id'] != int(user_id):
+                return False, "Bu yorumu silme yetkiniz yok"
+
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Önce yorumun bu kullanıcıya ait olup olmadığını kontrol et
-                cursor.execute("""
-                    SELECT COUNT(*) FROM [dbo].[Comment]
-                    WHERE id = ? AND user_id = ?
-                """, (comment_id, user_id))
-                
-                if cursor.fetchone()[0] == 0:
-                    return False, "Bu yorumu silme yetkiniz yok"
-                
                 # Yorumu sil
                 cursor.execute("""
                     DELETE FROM [dbo].[Comment]
                     WHERE id = ? AND user_id = ?
                 """, (comment_id, user_id))
                 
+                # Silme /api/sync istemcilerine aynı işlemde yazılan kayıtla bildirilir
+                if cursor.rowcount > 0:
+                    cursor.execute("""
+                        INSERT INTO [dbo].[SyncTombstone] ([entity], [entity_id], [user_id])
+                        VALUES ('comment', ?, ?)
+                    """, (comment_id, user_id))
+                
                 conn.commit()
+                self._forget('comment', comment_id)
+                self.read_cache.bump(('Comment', comment['recipe_id']))
                 return True, "Yorum başarıyla silindi"
                 
         except Exception as e:
             self.logger.error(f"Yorum silinirken hata: {str(e)}")
             return False, f"Yorum silinirken hata oluştu: {str(e)}"
 
-    def get_recipe_detail(self, recipe_id):
+    def get_recipe_detail(self, recipe_id, fields=FULL_FIELDS):
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        r.[id],
-                        r.[title],
-                        r.[description],
-                        r.[ingredients],
-                        r.[instructions],
-                        r.[created_at],
-                        r.[user_id],
-                        r.[category_id],
-                        r.[views],
-                        r.[serving_size],
-                        r.[preparation_time],
-                        r.[cooking_time],
-                        r.[tips],
-                        r.[image_filename],
-                        r.[ingredients_sections],
-                        r.[username],
-                        COALESCE(r.[average_rating], 0.0) as average_rating,
-                        COALESCE(r.[rating_count], 0) as rating_count,
-                        (SELECT COUNT(*) FROM favorites f WHERE f.recipe_id = r.id) AS favorite_count
-                    FROM [dbo].[Recipe] r
-                    WHERE r.id = ?
-                """, (recipe_id,))
-                columns = [column[0] for column in cursor.description]
-                row = cursor.fetchone()
-                if row:
-                    recipe = dict(zip(columns, row))
-                    if recipe.get('created_at'):
-                        recipe['created_at'] = recipe['created_at'].isoformat()
-                    return recipe
-                return None
+            recipe_id = int(recipe_id)
+            recipe = self.read_cache.get_or_load(
+                ('recipe', recipe_id), (('Recipe', recipe_id),),
+                lambda: self.loaders()['recipe'].load(recipe_id), ttl=300)
+            if recipe:
+                return {field: recipe.get(field) for field in fields}
+            return None
         except Exception as e:
             print(f"[DEBUG] get_recipe_detail hatası: {str(e)}")
             print(f"[DEBUG] Hata detayı: {traceback.format_exc()}")
             return None
 
-    def get_to_try_recipes(self, user_id):
+    def record_view(self, recipe_id, viewer=None):
+        """Tarif görüntülenmesini write-behind sayaca ekler (veritabanını beklemez)"""
+        return self.views.record(recipe_id, viewer)
+
+    def _flush_views(self, batch):
+        """Sayaçtaki {(tarif_id, dilim_başı): adet} artışlarını tek işlemde toplu yazar"""
+        per_recipe = defaultdict(int)
+        for (recipe_id, _), count in batch.items():
+            per_recipe[recipe_id] += count
+        per_recipe = list(per_recipe.items())
+        buckets = [
+            (recipe_id, datetime.fromtimestamp(bucket), count)
+            for (recipe_id, bucket), count in batch.items()
+        ]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # SQL Server tek istekte en fazla 2100 parametre kabul eder
+            for i in range(0, len(per_recipe), 500):
+                chunk = per_recipe[i:i + 500]
+                values = ", ".join(["(?, ?)"] * len(chunk))
+                cursor.execute(f"""
+                    UPDATE r
+                    SET r.[views] = r.[views] + v.[cnt]
+                    FROM [dbo].[Recipe] r
+                    INNER JOIN (VALUES {values}) AS v([recipe_id], [cnt]) ON v.[recipe_id] = r.[id]
+                """, [param for pair in chunk for param in pair])
+            for i in range(0, len(buckets), 500):
+                chunk = buckets[i:i + 500]
+                values = ", ".join(["(?, ?, ?)"] * len(chunk))
+                cursor.execute(f"""
+                    MERGE [dbo].[RecipeViewBucket] AS t
+                    USING (VALUES {values}) AS v([recipe_id], [bucket_start], [cnt])
+                        ON t.[recipe_id] = v.[recipe_id] AND t.[bucket_start] = v.[bucket_start]
+                    WHEN MATCHED THEN
+                        UPDATE SET t.[views] = t.[views] + v.[cnt]
+                    WHEN NOT MATCHED THEN
+                        INSERT ([recipe_id], [bucket_start], [views])
+                        VALUES (v.[recipe_id], v.[bucket_start], v.[cnt]);
+                """, [param for row in chunk for param in row])
+            conn.commit()
+        # Liste sorgularındaki görüntülenme sayıları TTL kadar gecikebilir;
+        # her akışta listeleri geçersiz kılmak önbelleği işe yaramaz hâle getirir
+        self.read_cache.bump(*(('Recipe', recipe_id) for recipe_id, _ in per_recipe))
+        for recipe_id, count in per_recipe:
+            self.search_index.add_views(recipe_id, count)
+            self.ingredient_index.add_views(recipe_id, count)
+            self.autocomplete.add_views(recipe_id, count)
+
+        def add_views(boards):
+            for recipe_id, count in per_recipe:
+                boards.add_views(recipe_id, count)
+
+        self._update_leaderboards(add_views)
+
+    def get_recipes_by_ids(self, recipe_ids, fields=CARD_FIELDS):
+        """Verilen id sırasıyla tarifleri getirir; hepsi tek `IN (...)` sorgusuyla yüklenir"""
+        recipes = self.loaders()['recipe'].load_many(recipe_ids)
+        return [{field: recipe.get(field) for field in fields} for recipe in recipes if recipe]
+
+    def get_user(self, user_id):
+        """Kullanıcının herkese açık profil bilgilerini getirir"""
+        user = self.loaders()['user'].load(user_id)
+        return dict(user) if user else None
+
+    def _fetch_recipes_by_ids(self, recipe_ids):
+        placeholders = ", ".join("?" * len(recipe_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT
+                    {select_list(FULL_FIELDS)}
+                FROM [dbo].[Recipe] r
+                WHERE r.[id] IN ({placeholders})
+            """, recipe_ids)
+            return {recipe['id']: recipe for recipe in RowPlan.for_cursor(cursor).dicts(cursor.fetchall())}
+
+    def _fetch_users_by_ids(self, user_ids):
+        placeholders = ", ".join("?" * len(user_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT [id], [username], [profile_image], [appearance]
+                FROM [dbo].[User]
+                WHERE [id] IN ({placeholders})
+            """, user_ids)
+            return {
+                row.id: {
+                    'id': row.id,
+                    'username': row.username,
+                    'profile_image': row.profile_image,
+                    'appearance': row.appearance
+                }
+                for row in cursor.fetchall()
+            }
+
+    def _fetch_comments_by_ids(self, comment_ids):
+        placeholders = ", ".join("?" * len(comment_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT c.id, c.content, c.created_at, c.user_id, c.recipe_id, u.username
+                FROM [dbo].[Comment] c
+                INNER JOIN [dbo].[User] u ON c.user_id = u.id
+                WHERE c.id IN ({placeholders})
+            """, comment_ids)
+            return {
+                row[0]: {
+                    'id': row[0],
+                    'content': row[1],
+                    'created_at': row[2].isoformat() if row[2] else None,
+                    'user_id': row[3],
+                    'recipe_id': row[4],
+                    'username': row[5]
+                }
+                for row in cursor.fetchall()
+            }
+
+    def get_to_try_recipes(self, user_id, limit=None, after=None):
         """Kullanıcının denenecek tariflerini getirir"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT
+                top, where, order_by, params = self._build_page_query(
+                    CREATED_ORDER, limit, after,
+                    ["[user_id] = ?", "[status] = 'pending'"], [int(user_id)])
+                cursor.execute(f"""
+                    SELECT {top}
                         id,
                         ai_title AS title,
                         ai_ingredients AS ingredients,
@@ -897,15 +1789,311 @@ class DatabaseService:
                         ai_preparation_time AS preparation_time,
                         created_at
                     FROM [dbo].[UserRecipeList]
-                    WHERE user_id = ? AND status = 'pending'
-                    ORDER BY created_at DESC
-                """, (int(user_id),))
+                    {where}
+                    {order_by}
+                """, params)
                 columns = [column[0] for column in cursor.description]
                 recipes = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                return recipes
+                return CREATED_ORDER.paginate(recipes, limit)
         except Exception as e:
             print(f"Error in get_to_try_recipes: {str(e)}")
-            return []
+            return Page()
+
+    def apply_batch(self, user_id, operations):
+        """Kuyruktaki sıralı işlemleri tek işlemde (transaction) uygular; işlem başına sonuç döndürür.
+
+        İşlemler: {'op_id', 'type', 'recipe_id', 'rating' (rate), 'content'
+        (comment_add)}. Sonuç her işlem için tekil uç noktanın döneceği
+        durum kodu ve gövdedir: {'op_id', 'status', 'body', 'replayed'}.
+
+        Her işlem kendi kayıt noktasında (SAVE TRANSACTION) çalışır; hata
+        veren ya da reddedilen işlem yalnızca kendi yazdıklarını geri alır,
+        diğerleri birlikte commit edilir. Biten işlemin sonucu aynı işlemde
+        (user_id, op_id) anahtarıyla BatchOperation'a yazılır. Aynı op_id
+        tekrar gönderilirse işlem yeniden yapılmaz, kayıtlı sonuç
+        `replayed` ile döner; bağlantısı kopup toplu isteği yeniden
+        gönderen istemcide favori ya da yorum çiftlenmez. Olmayan tarif
+        (404), geçersiz veri ve diğer kalıcı hatalar (400) da kaydedilir;
+        yalnızca geçici hatalar (zaman aşımı, bağlantı) 500 döner ve
+        kaydedilmez. Veritabanı işlemi bozulursa (ör. kilitlenme kurbanı)
+        tamamı geri alınır: önceden kaydedilmiş sonuçlar dışındaki tüm
+        işlemler 500 ile döner ve tekrar gönderilebilir.
+        """
+        user_id = int(user_id)
+        op_ids = list(dict.fromkeys(
+            op['op_id'] for op in operations if isinstance(op, dict) and self._operation_id(op) is not None))
+        results, committed = [], []
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                done, stored = {}, {}
+                if op_ids:
+                    # Aynı işlemleri aynı anda yeniden gönderen istek, ilki bitene kadar bekler.
+                    # Bu sorgu işlemi de başlatır; SAVE TRANSACTION açık işlem ister.
+                    placeholders = ', '.join('?' * len(op_ids))
+                    cursor.execute(f"""
+                        SELECT [op_id], [status], [result]
+                        FROM [dbo].[BatchOperation] WITH (UPDLOCK, HOLDLOCK)
+                        WHERE [user_id] = ? AND [op_id] IN ({placeholders})
+                    """, (user_id, *op_ids))
+                    done = {row[0]: (row[1], json.loads(row[2])) for row in cursor.fetchall()}
+                stored = dict(done)
+
+                for index, op in enumerate(operations):
+                    op_id = self._operation_id(op) if isinstance(op, dict) else None
+                    if op_id is None:
+                        results.append(_invalid_id_result())
+                        continue
+                    if op_id in done:
+                        status, body = done[op_id]
+                        results.append({'op_id': op_id, 'status': status, 'body': body, 'replayed': True})
+                        continue
+
+                    savepoint = f"batch_op_{index}"
+                    cursor.execute(f"SAVE TRANSACTION {savepoint}")
+                    try:
+                        status, body, after = self._apply_operation(cursor, user_id, op)
+                        if status >= 400:
+                            cursor.execute(f"ROLLBACK TRANSACTION {savepoint}")
+                    except pyodbc.Error as e:
+                        try:
+                            cursor.execute(f"ROLLBACK TRANSACTION {savepoint}")
+                        except pyodbc.Error:
+                            # Kayıt noktasına dönülemiyorsa işlem bozulmuştur (ör. kilitlenme kurbanı)
+                            raise _BatchAborted(op_id) from e
+                        if _is_transient(e):
+                            # Kaydedilmez; istemci işlemi aynı op_id ile tekrar gönderir
+                            self.logger.warning(f"Toplu işlem {op_id} geçici hatayla uygulanamadı: {str(e)}")
+                            results.append(_retry_result(op_id))
+                            continue
+                        self.logger.error(f"Toplu işlem {op_id} uygulanamadı: {str(e)}")
+                        status, body, after = 400, {'error': 'İşlem geçersiz veri nedeniyle uygulanamadı'}, None
+                    cursor.execute("""
+                        INSERT INTO [dbo].[BatchOperation] ([user_id], [op_id], [status], [result])
+                        VALUES (?, ?, ?, ?)
+                    """, (user_id, op_id, status, json.dumps(body, ensure_ascii=False)))
+                    done[op_id] = (status, body)
+                    if after is not None:
+                        committed.append(after)
+                    results.append({'op_id': op_id, 'status': status, 'body': body, 'replayed': False})
+                conn.commit()
+        except _BatchAborted as e:
+            # Hiçbir işlem uygulanmadı; önceki isteklerde kaydedilmiş sonuçlar geçerlidir
+            self.logger.warning(f"Toplu işlem {e} sırasında işlem geri alındı: {str(e.__cause__)}")
+            results = []
+            for op in operations:
+                op_id = self._operation_id(op) if isinstance(op, dict) else None
+                if op_id is None:
+                    results.append(_invalid_id_result())
+                elif op_id in stored:
+                    status, body = stored[op_id]
+                    results.append({'op_id': op_id, 'status': status, 'body': body, 'replayed': True})
+                else:
+                    results.append(_retry_result(op_id))
+            return results
+        except Exception as e:
+            self.logger.error(f"Toplu işlem hatası: {str(e)}")
+            raise
+
+        # Bellekteki durumlar yalnızca commit edilen işlemler için güncellenir
+        for after in committed:
+            after()
+        return results
+
+    @staticmethod
+    def _operation_id(op):
+        op_id = op.get('op_id')
+        if isinstance(op_id, str) and 0 < len(op_id) <= MAX_OPERATION_ID_LENGTH:
+            return op_id
+        return None
+
+    def _apply_operation(self, cursor, user_id, op):
+        """Tek bir toplu işlemi imleçte uygular: (durum kodu, gövde, commit sonrası çağrı)"""
+        kind = op.get('type')
+        if kind not in BATCH_OPERATION_TYPES:
+            return 400, {'error': f"type şunlardan biri olmalı: {', '.join(BATCH_OPERATION_TYPES)}"}, None
+        recipe_id = op.get('recipe_id')
+        if not isinstance(recipe_id, int) or isinstance(recipe_id, bool) or recipe_id < 1:
+            return 400, {'error': 'Geçerli bir tarif ID gerekli'}, None
+        # Olmayan tarif yabancı anahtar hatası yerine kalıcı bir 404 sonucu alır
+        cursor.execute("SELECT 1 FROM [dbo].[Recipe] WHERE [id] = ?", (recipe_id,))
+        if cursor.fetchone() is None:
+            return 404, {'error': 'Tarif bulunamadı'}, None
+
+        if kind == 'favorite_add':
+            if not self._insert_favorite(cursor, user_id, recipe_id):
+                return 400, {'message': 'Bu tarif zaten favorilerinizde'}, None
+            return 200, {'message': 'Tarif favorilere eklendi'}, lambda: self._favorite_added(user_id, recipe_id)
+
+        if kind == 'favorite_remove':
+            removed = self._delete_favorite(cursor, user_id, recipe_id)
+            return (200, {'message': 'Tarif favorilerden kaldırıldı'},
+                    lambda: self._favorite_removed(user_id, recipe_id, removed))
+
+        if kind == 'rate':
+            rating = op.get('rating')
+            if not isinstance(rating, int) or isinstance(rating, bool) or rating < 1 or rating > 5:
+                return 400, {'error': 'Puan 1 ile 5 arasında olmalıdır'}, None
+            stats = self._upsert_rating(cursor, recipe_id, user_id, rating)
+            if not stats:
+                return 404, {'error': 'Tarif bulunamadı'}, None
+            body = {
+                'message': 'Puan başarıyla verildi',
+                'average_rating': float(stats[0]) if stats[0] else 0.0,
+                'rating_count': stats[1],
+                'histogram': {str(star): stats[1 + star] for star in range(1, 6)}
+            }
+            return 200, body, lambda: self._rating_saved(recipe_id, user_id, rating, stats)
+
+        content = op.get('content')
+        if not isinstance(content, str) or not content.strip():
+            return 400, {'error': 'Yorum içeriği gerekli'}, None
+        comment = self._insert_comment(cursor, recipe_id, user_id, content)
+        if not comment:
+            return 400, {'error': 'Yorum eklenirken bir hata oluştu'}, None
+        return 201, comment, lambda: self.read_cache.bump(('Comment', recipe_id))
+
+    def get_changes(self, since=None, user_id=None, fields=CARD_FIELDS, limit=500, counters=True):
+        """`since` jetonundan bu yana eklenen, değişen ve silinen kayıtları getirir.
+
+        `since` `decode_sync_token`'ın (sürüm, verildiği zaman) çıktısıdır.
+        None ise ya da jeton silme kayıtlarının saklama süresinden eskiyse
+        her şey döner ve `reset` True olur; istemci yerel kopyasını yeniden
+        kurar. Tarifler ve yorumlar herkesin, favoriler ve puanlar
+        `user_id`'nin kayıtlarıdır.
+
+        `recipes` yalnızca içeriği (RecipeSyncVersion) değişen tariflerin
+        kartlarıdır. Yalnızca sayaçları (görüntülenme, favori, puan) değişen
+        tarifler `counters` ile SYNC_COUNTER_FIELDS alanlarıyla gelir;
+        `counters=False` ise gönderilmez.
+
+        Bir tür `limit`'ten fazla değişiklik içeriyorsa yanıt o türün son
+        satırının sürümünde kesilir ve `has_more` True olur; istemci yeni
+        jetonla hemen tekrar ister. İstemci önce silmeleri, sonra eklenen ve
+        değişen kayıtları uygulamalıdır: yeniden eklenen bir favori silme
+        kaydından sonra gelir.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                # Üst sınır en küçük aktif sürümün bir altıdır; süren bir
+                # işlemin satırları görünmeden atlanmaz, sonraki istekte gelir
+                cursor.execute("SELECT CAST(MIN_ACTIVE_ROWVERSION() AS BIGINT) - 1, GETDATE()")
+                high, now = cursor.fetchone()
+                reset = (since is None or since[0] > high
+                         or since[1] < now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS))
+                low = 0 if reset else since[0]
+
+                select_columns = select_list(fields, overrides={'username': 'u.[username]'})
+                queries = {
+                    'recipes': (f"""
+                        SELECT TOP ({limit + 1})
+                            {select_columns},
+                            CAST(v.[row_version] AS BIGINT) AS [_version]
+                        FROM [dbo].[RecipeSyncVersion] v
+                        INNER JOIN [dbo].[Recipe] r ON r.[id] = v.[recipe_id]
+                        LEFT JOIN [dbo].[User] u ON r.[user_id] = u.[id]
+                        WHERE v.[row_version] > {_ROW_VERSION} AND v.[row_version] <= {_ROW_VERSION}
+                        ORDER BY v.[row_version]
+                    """, ()),
+                    'comments': (f"""
+                        SELECT TOP ({limit + 1})
+                            c.id, c.content, c.created_at, c.user_id, c.recipe_id, u.username,
+                            CAST(c.[row_version] AS BIGINT) AS [_version]
+                        FROM [dbo].[Comment] c
+                        INNER JOIN [dbo].[User] u ON c.user_id = u.id
+                        WHERE c.[row_version] > {_ROW_VERSION} AND c.[row_version] <= {_ROW_VERSION}
+                        ORDER BY c.[row_version]
+                    """, ()),
+                }
+                if user_id is not None:
+                    queries['favorites'] = (f"""
+                        SELECT TOP ({limit + 1}) [recipe_id], CAST([row_version] AS BIGINT) AS [_version]
+                        FROM [dbo].[favorites]
+                        WHERE [user_id] = ? AND [row_version] > {_ROW_VERSION} AND [row_version] <= {_ROW_VERSION}
+                        ORDER BY [row_version]
+                    """, (user_id,))
+                    queries['ratings'] = (f"""
+                        SELECT TOP ({limit + 1}) [recipe_id], [rating], CAST([row_version] AS BIGINT) AS [_version]
+                        FROM [dbo].[RecipeRating]
+                        WHERE [user_id] = ? AND [row_version] > {_ROW_VERSION} AND [row_version] <= {_ROW_VERSION}
+                        ORDER BY [row_version]
+                    """, (user_id,))
+                # İlk (ya da sıfırlanan) senkronizasyonda tüm kartlar gelir
+                if counters and not reset:
+                    # İçeriği bu aralıkta değişen tarifler zaten tam kartla gelir
+                    queries['counters'] = (f"""
+                        SELECT TOP ({limit + 1})
+                            {select_list(SYNC_COUNTER_FIELDS)},
+                            CAST(r.[row_version] AS BIGINT) AS [_version]
+                        FROM [dbo].[Recipe] r
+                        INNER JOIN [dbo].[RecipeSyncVersion] v ON v.[recipe_id] = r.[id]
+                        WHERE v.[row_version] <= {_ROW_VERSION}
+                            AND r.[row_version] > {_ROW_VERSION} AND r.[row_version] <= {_ROW_VERSION}
+                        ORDER BY r.[row_version]
+                    """, (low,))
+                # İlk (ya da sıfırlanan) senkronizasyonda silinecek yerel kayıt yoktur
+                if not reset:
+                    tombstones = f"""
+                        SELECT TOP ({limit + 1}) [entity_id], CAST([row_version] AS BIGINT) AS [_version]
+                        FROM [dbo].[SyncTombstone]
+                        WHERE [entity] = ? {{}}
+                            AND [row_version] > {_ROW_VERSION} AND [row_version] <= {_ROW_VERSION}
+                        ORDER BY [row_version]
+                    """
+                    queries['deleted_comments'] = (tombstones.format(""), ('comment',))
+                    if user_id is not None:
+                        queries['deleted_favorites'] = (tombstones.format("AND [user_id] = ?"), ('favorite', user_id))
+
+                changes, cut = {}, high
+                for name, (query, params) in queries.items():
+                    cursor.execute(query, params + (low, high))
+                    rows = RowPlan.for_cursor(cursor).dicts(cursor.fetchall())
+                    if len(rows) > limit:
+                        rows = rows[:limit]
+                        cut = min(cut, rows[-1]['_version'])
+                    changes[name] = rows
+        except Exception as e:
+            self.logger.error(f"Senkronizasyon değişiklikleri alınırken hata: {str(e)}")
+            raise
+
+        # Kesilen türün sınırından sonraki değişiklikler bir sonraki yanıtta gelir
+        for name, rows in changes.items():
+            changes[name] = [row for row in rows if row.pop('_version') <= cut]
+        result = {
+            'token': encode_sync_token(cut, now),
+            'has_more': cut < high,
+            'reset': reset,
+            'recipes': changes['recipes'],
+            'counters': changes.get('counters', []),
+            'comments': changes['comments'],
+            'deleted_comments': [row['entity_id'] for row in changes.get('deleted_comments', [])],
+        }
+        if user_id is not None:
+            result['favorites'] = [row['recipe_id'] for row in changes['favorites']]
+            result['ratings'] = changes['ratings']
+            result['deleted_favorites'] = [row['entity_id'] for row in changes.get('deleted_favorites', [])]
+        return result
+
+    def prune_batch_operations(self, older_than_days=BATCH_OPERATION_RETENTION_DAYS):
+        """Tekrar gönderilme süresini geçmiş toplu işlem sonuçlarını siler; silinen kayıt sayısını döndürür"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM [dbo].[BatchOperation]
+                WHERE [created_at] < DATEADD(DAY, -?, GETDATE())
+            """, (older_than_days,))
+            return cursor.rowcount
+
+    def prune_sync_tombstones(self, older_than_days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        """Saklama süresini geçmiş silme kayıtlarını siler; silinen kayıt sayısını döndürür"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM [dbo].[SyncTombstone]
+                WHERE [deleted_at] < DATEADD(DAY, -?, GETDATE())
+            """, (older_than_days,))
+            return cursor.rowcount
 
 # Singleton instance
 db_service = DatabaseService() 
\ No newline at end of file
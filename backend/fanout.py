@@ -0,0 +1,94 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+
+class Part:
+    """Bir ekranın bağımsız parçası: `fn()` en fazla `timeout` saniye beklenir.
+
+    Zaman aşımında ya da hata durumunda yanıtta `default` kullanılır.
+    """
+    __slots__ = ('fn', 'timeout', 'default')
+
+    def __init__(self, fn, timeout=2.0, default=None):
+        self.fn = fn
+        self.timeout = timeout
+        self.default = default
+
+
+class FanOut:
+    """Ekran parçalarını sınırlı bir thread havuzunda paralel çalıştırır.
+
+    - Parçalar çağıranın contextvars bağlamının kopyasıyla çalışır; istek
+      kapsamındaki yükleyiciler (bkz. loaders) worker thread'lerde de
+      görülür ve nokta sorguları yine toplanır.
+    - Her parçanın süresi gönderildiği andan sayılır; havuz doluyken sırada
+      bekleyen parça da kendi süresini harcar, böylece yavaş bir sorgu
+      ekranın tamamını bekletmez. Süresi dolan parça başlamadıysa iptal
+      edilir, başladıysa arka planda biter ve sonucu atılır.
+    - `max_workers` bağlantı havuzunun boyutundan küçük tutulmalıdır; aksi
+      halde fan-out istekleri diğer istekleri bağlantısız bırakabilir.
+    """
+
+    def __init__(self, max_workers=8, name='fanout'):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.parts = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    def run(self, parts):
+        """{ad: Part} -> ({ad: sonuç}, {ad: 'timeout' | 'error'})
+
+        Başarısız parçaların sonucu `default`'tur; ikinci sözlükte yalnızca
+        başarısız parçalar bulunur.
+        """
+        start = time.monotonic()
+        futures = {
+            name: self._executor.submit(contextvars.copy_context().run, part.fn)
+            for name, part in parts.items()
+        }
+        results, failed = {}, {}
+        for name, future in futures.items():
+            part = parts[name]
+            try:
+                results[name] = future.result(timeout=max(0.0, start + part.timeout - time.monotonic()))
+            except FutureTimeout:
+                if future.cancel():
+                    with self._lock:
+                        self.cancelled += 1
+                logger.warning(f"Ekran parçası zaman aşımına uğradı: {name} ({part.timeout} sn)")
+                results[name], failed[name] = part.default, TIMEOUT
+            except Exception as e:
+                logger.error(f"Ekran parçası başarısız: {name}: {str(e)}")
+                results[name], failed[name] = part.default, ERROR
+        with self._lock:
+            self.runs += 1
+            self.parts += len(parts)
+            self.timeouts += sum(1 for reason in failed.values() if reason == TIMEOUT)
+            self.errors += sum(1 for reason in failed.values() if reason == ERROR)
+        return results, failed
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'runs': self.runs,
+                'parts': self.parts,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'cancelled': self.cancelled,
+            }
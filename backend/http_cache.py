@@ -0,0 +1,240 @@
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import request
+
+# Brotli isteğe bağlıdır; kurulu değilse yalnızca gzip sunulur
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/msgpack', 'application/cbor',
+                          'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+# Her yanıtta yeniden sıkıştırılan gövdeler için hızlı seviye; paylaşılan
+# gövdeler bir kez en yüksek seviyede sıkıştırılıp saklanır
+FAST_LEVEL = {'br': 5, 'gzip': 6}
+SHARED_LEVEL = {'br': 9, 'gzip': 9}
+
+
+def cache_policy(max_age=0, private=False, shared=True):
+    """Rotanın yanıtlarına ETag ve Cache-Control eklenmesini işaretler.
+
+    `@app.route` altına yazılır. max_age=0 istemcinin her seferinde ETag ile
+    doğrulaması demektir (`no-cache`); kullanıcıya özel yanıtlar `private`
+    olmalıdır. Aynı gövdesi birçok istemciye giden yanıtlar en yüksek
+    seviyede sıkıştırılıp saklanır; `private` ya da sorguya göre çok
+    değişen (`shared=False`, ör. arama) yanıtlar hızlı seviyede sıkıştırılır.
+    """
+    directives = ['private' if private else 'public']
+    directives.append(f'max-age={max_age}' if max_age else 'no-cache')
+    header = ', '.join(directives)
+
+    def decorate(view):
+        view.cache_control = header
+        view.cache_shared = shared and not private
+        return view
+    return decorate
+
+
+def negotiate_encoding(accept_encoding):
+    """Accept-Encoding başlığına göre 'br', 'gzip' ya da None"""
+    offered = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            offered[name.strip().lower()] = quality
+    for encoding in ('br', 'gzip'):
+        if encoding == 'br' and brotli is None:
+            continue
+        if offered.get(encoding, offered.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level):
+    """Akış gövdesini parça parça sıkıştırır; bellekte gövdenin tamamı tutulmaz"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        process, finish = compressor.process, compressor.finish
+    else:
+        # wbits=31: gzip başlığı ve sağlama toplamıyla deflate
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            data = process(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class CompressedBodyCache:
+    """Sıkıştırılmış gövdeleri (ETag, kodlama) anahtarıyla tutan, toplam bayta göre sınırlı LRU"""
+
+    def __init__(self, max_bytes=8 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class ResponseCache:
+    """Yanıtlara koşullu istek desteği ve sıkıştırma ekleyen `after_request` katmanı.
+
+    - `cache_policy` ile işaretlenmiş rotaların başarılı GET yanıtları,
+      serileştirilmiş gövdenin özetinden güçlü bir ETag ve rotanın
+      Cache-Control başlığını alır; `If-None-Match` eşleşirse gövdesiz 304
+      döner. Sıkıştırılmış temsiller ETag'e kodlama son ekiyle ayrılır
+      ("<özet>-gzip").
+    - `min_size` bayttan büyük metin/JSON gövdeleri istemcinin kabul ettiği
+      en iyi kodlamayla (brotli, gzip) sıkıştırılır.
+    - Paylaşılan (public, `shared`) rotaların gövdeleri sık istenip seyrek
+      değiştiği için daha yüksek seviyede sıkıştırılır ve ETag ile
+      önbelleğe alınır; aynı gövde her istekte yeniden sıkıştırılmaz.
+      Kullanıcıya özel ve arama gibi tek seferlik gövdeler hızlı seviyede
+      sıkıştırılır ve saklanmaz.
+    - Akış yanıtları (bkz. json_stream) tamponlanmaz: gövde özeti
+      bilinemediği için ETag almazlar, Cache-Control alır ve gönderilirken
+      parça parça sıkıştırılırlar.
+    """
+
+    def __init__(self, app=None, min_size=1024, cache_bytes=8 * 2 ** 20):
+        self.min_size = min_size
+        self.bodies = CompressedBodyCache(cache_bytes)
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.compressed = 0
+        self.bytes_saved = 0
+        self.streamed = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.after_request(self.finalize)
+
+    def finalize(self, response):
+        if (request.method not in ('GET', 'HEAD') or response.status_code != 200
+                or response.direct_passthrough):
+            return response
+        view = self.app.view_functions.get(request.endpoint)
+        cache_control = getattr(view, 'cache_control', None)
+        shared = getattr(view, 'cache_shared', False)
+        compressible = response.mimetype in COMPRESSIBLE_MIMETYPES and 'Content-Encoding' not in response.headers
+        if cache_control is None and not compressible:
+            return response
+        if response.is_streamed:
+            return self._finalize_stream(response, cache_control, compressible)
+
+        body = response.get_data()
+        encoding = None
+        if compressible and len(body) >= self.min_size:
+            response.vary.add('Accept-Encoding')
+            encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+
+        digest = None
+        if cache_control is not None:
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            response.set_etag(f'{digest}-{encoding}' if encoding else digest)
+            response.headers['Cache-Control'] = cache_control
+            response.make_conditional(request)
+            if response.status_code == 304:
+                with self._lock:
+                    self.not_modified += 1
+                return response
+
+        if encoding is not None:
+            if digest is not None and shared:
+                compressed = self.bodies.get((digest, encoding))
+                if compressed is None:
+                    compressed = compress(body, encoding, SHARED_LEVEL[encoding])
+                    self.bodies.put((digest, encoding), compressed)
+            else:
+                compressed = compress(body, encoding, FAST_LEVEL[encoding])
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+            with self._lock:
+                self.compressed += 1
+                self.bytes_saved += len(body) - len(compressed)
+        return response
+
+    def _finalize_stream(self, response, cache_control, compressible):
+        if cache_control is not None:
+            response.headers['Cache-Control'] = cache_control
+        if compressible:
+            response.vary.add('Accept-Encoding')
+            encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+            if encoding is not None:
+                response.response = compress_stream(response.response, encoding, FAST_LEVEL[encoding])
+                response.headers['Content-Encoding'] = encoding
+                response.headers.pop('Content-Length', None)
+        with self._lock:
+            self.streamed += 1
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'not_modified': self.not_modified,
+                'compressed': self.compressed,
+                'bytes_saved': self.bytes_saved,
+                'streamed': self.streamed,
+                'precompressed': self.bodies.stats(),
+            }
@@ -0,0 +1,337 @@
+import bisect
+import heapq
+import re
+import threading
+from functools import lru_cache
+
+from range_index import RangeIndex
+from turkish_text import fold, lower, terms
+
+_LINE_SPLIT_RE = re.compile(r'[\n\r,;•]+')
+_NOTE_RE = re.compile(r'\(.*?\)|^[^:]*:')
+_QUANTITY_RE = re.compile(r'^[\d.,/½¼¾⅓-]+$')
+
+# Satır başındaki miktar ve ölçü kelimeleri (katlanmış hâlleriyle)
+_MEASURE_WORDS = frozenset({
+    'adet', 'su', 'bardagi', 'bardak', 'yemek', 'tatli', 'cay', 'kahve', 'kasigi', 'kasik',
+    'fincani', 'fincan', 'kase', 'kasesi', 'gram', 'gr', 'g', 'kg', 'kilo', 'ml', 'lt', 'litre',
+    'paket', 'tutam', 'dis', 'demet', 'dilim', 'avuc', 'yarim', 'ceyrek', 'buyuk', 'kucuk',
+    'orta', 'boy', 'boyda', 'bir', 'iki', 'uc', 'dort', 'bes', 'alti', 'biraz', 'kadar',
+    'silme', 'tepeleme', 'kutu', 'tane', 'parca', 'kup', 'yaprak', 'kilogram', 'mililitre',
+})
+
+
+def split_ingredients(text):
+    """Malzeme metnini satırlara ayırır ("2 adet domates\\n1 su bardağı un")"""
+    lines = (line.strip(' \t-*') for line in _LINE_SPLIT_RE.split(text or ''))
+    return [line for line in lines if line]
+
+
+@lru_cache(maxsize=65536)
+def ingredient_name(line):
+    """Malzeme satırından miktar ve ölçüyü atıp malzemenin adını çıkarır.
+
+    "2 su bardağı Un" -> "un", "1 adet kuru soğan (doğranmış)" -> "kuru soğan".
+    Ad çıkarılamazsa boş dize döner.
+    """
+    words = lower(_NOTE_RE.sub('', line)).split()
+    start = 0
+    while start < len(words) - 1 and (
+            _QUANTITY_RE.match(words[start]) or fold(words[start]).strip('.') in _MEASURE_WORDS):
+        start += 1
+    words = [w.strip('.-*') for w in words[start:]]
+    name = ' '.join(w for w in words if w)
+    if not name or _QUANTITY_RE.match(name) or len(words) > 3:
+        return ''
+    if name != 'su' and fold(name) in _MEASURE_WORDS:
+        return ''
+    return name
+
+
+@lru_cache(maxsize=65536)
+def ingredient_terms(line):
+    """Malzeme satırının sayı olmayan kök terimleri ("1 su bardağı un" ve "un" aynı satırlarda tekrar eder)"""
+    return frozenset(t for t in terms(line) if not t.isdigit())
+
+
+def _bits(bitset):
+    """Bit kümesindeki 1 bitlerinin konumlarını küçükten büyüğe üretir"""
+    digits = bin(bitset)[:1:-1]
+    position = digits.find('1')
+    while position != -1:
+        yield position
+        position = digits.find('1', position + 1)
+
+
+def _popcount(bitset):
+    return bin(bitset).count('1')
+
+
+def _to_bitset(slots, size):
+    buf = bytearray((size >> 3) + 1)
+    for slot in slots:
+        buf[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buf, 'little')
+
+
+class IngredientIndex:
+    """Malzeme terimi -> tarif bit kümesi ters indeksi.
+
+    Her tarif sabit bir bit konumu (slot) alır; her malzeme terimi ve her
+    filtre etiketi (ör. kategori) bu konumlar üzerinde bir Python int bit
+    kümesidir. Sayısal alanlar (dakika, kişi sayısı) slotlar üzerinde
+    `RangeIndex` ile tutulur ve aralık filtreleri de bit kümesine çevrilir.
+    Güncellemeler slot kümelerine yazılır, bit kümeleri ilk sorguda yeniden
+    üretilip saklanır.
+
+    Öneride filtreler bit kümesi kesişimi olarak uygulanır; her tarifin
+    seçili malzemelerden kaçını içerdiği bit dilimli sayaçlarla (tarif başına
+    döngü olmadan) hesaplanır. Adaylar en çok eşleşen, sonra en az eksik
+    malzemesi olan gruplardan başlanarak taranır ve yalnızca son grup içinde
+    heap ile seçim yapılır; böylece süre katalog büyüklüğüyle değil, istenen
+    sonuç sayısıyla ölçeklenir.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._slots = {}
+        self._ids = []
+        self._lines = []
+        self._views = []
+        self._doc_keys = []
+        self._sets = {}
+        # Sıralı, en az bir tarifte görülen satır sayıları (('lines', n) anahtarları)
+        self._lengths = []
+        self._bitsets = {}
+        self._ranges = {}
+        self._range_bitsets = {}
+        self.ready = False
+
+    def __len__(self):
+        return len(self._slots)
+
+    def add(self, recipe_id, ingredients, tags=(), views=0, values=None):
+        """Tarifi indekse ekler; zaten varsa yeniden indeksler.
+
+        `tags` (ad, değer) çiftleridir, ör. ('category', 1). `values` aralık
+        filtrelerinde kullanılacak sayısal alanlardır, ör.
+        {'cooking_minutes': 75}; None değerler indekslenmez.
+        """
+        lines = []
+        for line in split_ingredients(ingredients):
+            line_terms = ingredient_terms(line)
+            if line_terms:
+                lines.append((line, line_terms))
+        keys = {('term', t) for _, line_terms in lines for t in line_terms}
+        keys.update(('tag', tag) for tag in tags)
+        keys.add(('lines', len(lines)))
+        keys.add(('live', None))
+
+        with self._lock:
+            slot = self._slots.get(recipe_id)
+            if slot is None:
+                slot = self._slots[recipe_id] = len(self._ids)
+                self._ids.append(recipe_id)
+                self._lines.append(())
+                self._views.append(0)
+                self._doc_keys.append(())
+            else:
+                self._clear(slot)
+            for key in keys:
+                slots = self._sets.get(key)
+                if slots is None:
+                    slots = self._sets[key] = set()
+                    if key[0] == 'lines':
+                        bisect.insort(self._lengths, key[1])
+                slots.add(slot)
+                self._bitsets.pop(key, None)
+            for field, value in (values or {}).items():
+                self._ranges.setdefault(field, RangeIndex()).add(slot, value)
+            self._range_bitsets.clear()
+            self._lines[slot] = tuple(lines)
+            self._views[slot] = views or 0
+            self._doc_keys[slot] = tuple(keys)
+
+    def remove(self, recipe_id):
+        with self._lock:
+            slot = self._slots.pop(recipe_id, None)
+            if slot is not None:
+                self._clear(slot)
+                self._ids[slot] = None
+                self._lines[slot] = ()
+
+    def add_views(self, recipe_id, delta):
+        """Eşit skorlu öneriler arasında popüler olanı öne almak için görüntülenmeyi artırır"""
+        with self._lock:
+            slot = self._slots.get(recipe_id)
+            if slot is not None:
+                self._views[slot] += delta
+
+    def suggest(self, ingredients, filters=(), ranges=(), limit=15):
+        """Seçili malzemelere göre en iyi `limit` tarifi döndürür.
+
+        `filters` (ad, değer) etiketleri, `ranges` (alan, en_az, en_çok)
+        aralıklarıdır ve hepsi sağlanmalıdır. Sonuç
+        `[(tarif_id, eşleşen_malzemeler, eşleşmeyen_malzemeler, eksik_satırlar)]`
+        listesidir; eşleşen/eşleşmeyen kullanıcının seçtikleri, eksik satırlar
+        ise tarifin kullanıcıda olmayan malzemeleridir.
+        """
+        selected = self._selected_names(ingredients)
+        if not selected or limit <= 0:
+            return []
+
+        with self._lock:
+            mask = self._filter_mask(filters, ranges)
+            if not mask:
+                return []
+            selected_bits = self._selected_bits(selected, mask)
+
+            # counts[c]: seçili malzemelerden tam c tanesini içeren tarifler
+            counts = [mask]
+            for bits in selected_bits:
+                counts = [
+                    (counts[c] & ~bits if c < len(counts) else 0)
+                    | (counts[c - 1] & bits if c > 0 else 0)
+                    for c in range(len(counts) + 1)
+                ]
+
+            top = []
+            for matched in range(len(counts) - 1, 0, -1):
+                tier = counts[matched]
+                if not tier:
+                    continue
+                # Eksik malzeme sayısı ~ satır sayısı - eşleşen
+                groups = {}
+                for length in self._lengths:
+                    part = tier & self._bitset(('lines', length))
+                    if part:
+                        missing = max(length - matched, 0)
+                        groups[missing] = groups.get(missing, 0) | part
+                for missing in sorted(groups):
+                    wanted = limit - len(top)
+                    top.extend(heapq.nsmallest(
+                        wanted, _bits(groups[missing]),
+                        key=lambda slot: (-self._views[slot], self._ids[slot])))
+                    if len(top) >= limit:
+                        break
+                if len(top) >= limit:
+                    break
+
+            results = []
+            for slot in top:
+                matched = [s for s, bits in zip(selected, selected_bits) if bits >> slot & 1]
+                unmatched = [name for (name, _), bits in zip(selected, selected_bits) if not bits >> slot & 1]
+                missing = [
+                    line for line, line_terms in self._lines[slot]
+                    if not any(name_terms <= line_terms for _, name_terms in matched)
+                ]
+                results.append((self._ids[slot], [name for name, _ in matched], unmatched, missing))
+            return results
+
+    def facet_counts(self, ingredients, facets, selected):
+        """Her filtre seçeneğinin kaç tarif döndüreceğini sayar.
+
+        `facets` {boyut: {seçenek: (etiketler, aralıklar)}}, `selected` ise
+        {boyut: seçenek} şeklindeki mevcut seçimdir. Bir boyutun sayıları
+        diğer boyutlardaki seçimler ve seçili malzemelerden en az birini
+        içeren tarifler üzerinden hesaplanır; böylece kullanıcı o boyutta
+        seçimini değiştirince kaç sonuç alacağını görür. `(toplam, sayılar)`
+        döndürür; toplam mevcut seçimin sonuç sayısıdır.
+        """
+        selected_names = self._selected_names(ingredients)
+        with self._lock:
+            base = self._bitset(('live', None))
+            if selected_names:
+                matching = 0
+                for bits in self._selected_bits(selected_names, base):
+                    matching |= bits
+                base = matching
+            option_masks = {
+                dimension: {option: self._filter_mask(tags, ranges) for option, (tags, ranges) in options.items()}
+                for dimension, options in facets.items()
+            }
+        chosen = {
+            dimension: option_masks[dimension][option]
+            for dimension, option in selected.items() if option in option_masks.get(dimension, {})
+        }
+        counts = {}
+        for dimension, options in option_masks.items():
+            others = base
+            for other, mask in chosen.items():
+                if other != dimension:
+                    others &= mask
+            counts[dimension] = {option: _popcount(others & mask) for option, mask in options.items()}
+        total = base
+        for mask in chosen.values():
+            total &= mask
+        return _popcount(total), counts
+
+    def _selected_names(self, ingredients):
+        selected = []
+        for name in dict.fromkeys(i.strip() for i in ingredients if i and i.strip()):
+            name_terms = ingredient_terms(name)
+            if name_terms:
+                selected.append((name, name_terms))
+        return selected
+
+    def _selected_bits(self, selected, mask):
+        """Her seçili malzeme için onu içeren tariflerin bit kümesi.
+
+        Çok kelimeli malzemeler ("pul biber") tüm terimlerini içeren tariflere uyar.
+        """
+        selected_bits = []
+        for _, name_terms in selected:
+            bits = mask
+            for term in name_terms:
+                bits &= self._bitset(('term', term))
+                if not bits:
+                    break
+            selected_bits.append(bits)
+        return selected_bits
+
+    def _filter_mask(self, filters=(), ranges=()):
+        mask = self._bitset(('live', None))
+        for tag in filters:
+            mask &= self._bitset(('tag', tag))
+        for field, low, high in ranges:
+            mask &= self._range_bitset(field, low, high)
+        return mask
+
+    def _bitset(self, key):
+        bitset = self._bitsets.get(key)
+        if bitset is None:
+            bitset = self._bitsets[key] = _to_bitset(self._sets.get(key, ()), len(self._ids))
+        return bitset
+
+    def _range_bitset(self, field, low, high):
+        key = (field, low, high)
+        bitset = self._range_bitsets.get(key)
+        if bitset is None:
+            index = self._ranges.get(field)
+            slots = index.between(low, high) if index is not None else ()
+            bitset = self._range_bitsets[key] = _to_bitset(slots, len(self._ids))
+        return bitset
+
+    def _clear(self, slot):
+        for index in self._ranges.values():
+            index.remove(slot)
+        self._range_bitsets.clear()
+        for key in self._doc_keys[slot]:
+            slots = self._sets.get(key)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._sets[key]
+                    if key[0] == 'lines':
+                        self._lengths.remove(key[1])
+            self._bitsets.pop(key, None)
+        self._doc_keys[slot] = ()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'recipes': len(self._slots),
+                'terms': sum(1 for key in self._sets if key[0] == 'term'),
+                'cached_bitsets': len(self._bitsets),
+            }
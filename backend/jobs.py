@@ -0,0 +1,77 @@
+"""Bakım işleri.
+
+Kullanım:
+    python jobs.py reconcile-favorites
+    python jobs.py backfill-recipe-attributes
+    python jobs.py build-recommendations
+    python jobs.py refresh-recommendations
+    python jobs.py prune-sync-tombstones
+    python jobs.py prune-batch-operations
+"""
+import argparse
+import logging
+
+from database_service import db_service
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_favorites():
+    """Recipe.favorite_count değerlerini favorites tablosuyla eşitler"""
+    fixed = db_service.reconcile_favorite_counts()
+    print(f"{fixed} tarifin favori sayısı düzeltildi")
+
+
+def backfill_recipe_attributes():
+    """Süre ve porsiyon metinlerini ayrıştırıp Recipe'nin sayısal sütunlarını doldurur"""
+    changed = db_service.backfill_recipe_attributes()
+    print(f"{changed} tarifin süre/porsiyon sütunları güncellendi")
+
+
+def build_recommendations():
+    """Favori ve puanlardan tarif-tarif öneri modelini baştan kurar"""
+    count = db_service.build_recommendation_model()
+    print(f"{count} tarifin öneri komşuları yazıldı")
+
+
+def refresh_recommendations():
+    """Son kurulumdan sonra gelen favori ve puanlardan etkilenen tarifleri yeniden hesaplar"""
+    count = db_service.build_recommendation_model(incremental=True)
+    print(f"{count} tarifin öneri komşuları güncellendi")
+
+
+def prune_sync_tombstones():
+    """/api/sync için saklama süresini geçmiş silme kayıtlarını temizler"""
+    deleted = db_service.prune_sync_tombstones()
+    print(f"{deleted} eski silme kaydı temizlendi")
+
+
+def prune_batch_operations():
+    """/api/batch için tekrar gönderilme süresini geçmiş işlem sonuçlarını temizler"""
+    deleted = db_service.prune_batch_operations()
+    print(f"{deleted} eski toplu işlem sonucu temizlendi")
+
+
+JOBS = {
+    'reconcile-favorites': reconcile_favorites,
+    'backfill-recipe-attributes': backfill_recipe_attributes,
+    'build-recommendations': build_recommendations,
+    'refresh-recommendations': refresh_recommendations,
+    'prune-sync-tombstones': prune_sync_tombstones,
+    'prune-batch-operations': prune_batch_operations,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yemek tarifleri bakım işleri")
+    parser.add_argument('job', choices=sorted(JOBS), help="Çalıştırılacak iş")
+    args = parser.parse_args()
+    try:
+        JOBS[args.job]()
+    finally:
+        db_service.disconnect()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
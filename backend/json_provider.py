@@ -0,0 +1,72 @@
+import json
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider, _default as flask_default
+
+import wire_format
+from row_plan import ORJSON_OPTIONS, json_default, orjson
+
+
+def _default(obj):
+    try:
+        return json_default(obj)
+    except TypeError:
+        # UUID, dataclass ve __html__ için Flask'ın varsayılanları
+        return flask_default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson (kuruluysa) ya da standart `json` ile UTF-8 JSON üreten sağlayıcı.
+
+    Flask 3 `app.json_encoder` özniteliğini ve `JSON_AS_ASCII` ayarını yok
+    sayar; bu sağlayıcı ikisinin amacını karşılar: Türkçe karakterler `\\u`
+    kaçışına çevrilmez, DECIMAL sayı, tarih/saat ISO 8601 metni olarak
+    yazılır. Anahtarlar sıralıdır. İki arka uç da (sayı anahtarlı
+    sözlüklerin sırası dışında) aynı çıktıyı üretir; `RowPlan.encode` de bu
+    biçimde yazar.
+
+    `jsonify` yanıtları (hata gövdeleri dahil) Accept başlığına göre
+    MessagePack ya da CBOR olarak da gönderilir; varsayılan JSON'dur
+    (bkz. wire_format).
+    """
+
+    ensure_ascii = False
+    default = staticmethod(_default)
+    backend = 'orjson' if orjson is not None else 'json'
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def dumps_bytes(self, obj, indent=None, **kwargs):
+        kwargs.pop('separators', None)
+        if self.backend == 'orjson' and not kwargs:
+            option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(obj, default=self.default, option=option)
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        separators = (',', ': ') if indent else (',', ':')
+        return json.dumps(obj, indent=indent, separators=separators, **kwargs).encode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        fmt = self.negotiate()
+        if fmt != wire_format.JSON:
+            response = self._app.response_class(wire_format.encode(obj, fmt), mimetype=wire_format.MIMETYPES[fmt])
+        else:
+            indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+            response = self._app.response_class(self.dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype)
+        if has_request_context():
+            response.vary.add('Accept')
+        return response
+
+    def negotiate(self, formats=None):
+        """Yanıt biçimi: istek dışında ya da Accept yoksa 'json'"""
+        if not has_request_context():
+            return wire_format.JSON
+        return wire_format.negotiate_format(request.accept_mimetypes, formats)
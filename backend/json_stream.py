@@ -0,0 +1,128 @@
+import itertools
+
+from flask import current_app
+
+import wire_format
+
+_END = object()
+
+
+def _stream_format(app):
+    """Akış biçimi: CBOR ya da JSON; MessagePack akıtılamadığı için JSON'a düşülür"""
+    negotiate = getattr(app.json, 'negotiate', None)
+    if negotiate is None:
+        return wire_format.JSON
+    return negotiate((wire_format.JSON, wire_format.CBOR))
+
+
+def _dump_args(app):
+    """`app.json.response()` ile aynı biçimlendirme: debug'da girintili, değilse sıkışık"""
+    compact = getattr(app.json, 'compact', None)
+    if (compact is None and app.debug) or compact is False:
+        return {'indent': 2}
+    return {'separators': (',', ':')}
+
+
+def iter_json_array(items, dumps, dump_args, batch_size=200):
+    """`dumps(list(items), **dump_args) + "\n"` metnini parça parça üretir.
+
+    Öğeler `batch_size`'lık gruplar hâlinde kodlanır; her grubun dizi
+    parantezleri atılıp gruplar ayraçla birleştirilir. Bellekte aynı anda
+    tek grup bulunur.
+    """
+    if dump_args.get('indent'):
+        opening, separator, closing = '[\n', ',\n', '\n]\n'
+    else:
+        opening, separator, closing = '[', ',', ']\n'
+    # Grubun çıktısı "[öğeler]", girintiliyse "[\n  öğeler\n]"
+    trim = 2 if dump_args.get('indent') else 1
+    first = True
+    while True:
+        batch = list(itertools.islice(items, batch_size))
+        if not batch:
+            break
+        encoded = dumps(batch, **dump_args)
+        yield (opening if first else separator) + encoded[trim:-trim]
+        first = False
+    yield '[]\n' if first else closing
+
+
+def stream_json_array(items, batch_size=200):
+    """`jsonify(list(items))` ile aynı gövdeyi, listeyi bellekte kurmadan akıtan Response.
+
+    İlk öğe burada (görünüm fonksiyonu içinde) çekilir; sorgu hataları akış
+    başlamadan fırlatılır ve rota normal hata yanıtını döndürebilir. Akış
+    ortasındaki bir hata yanıtı yarıda keser. Bağlantı kopar ya da akış biterse
+    `items` kapatılır (ör. veritabanı imleci ve havuz bağlantısı bırakılır).
+    Accept CBOR istiyorsa gövde belirsiz uzunluklu CBOR dizisidir.
+    """
+    app = current_app._get_current_object()
+    fmt = _stream_format(app)
+    dumps = app.json.dumps
+    dump_args = _dump_args(app)
+    items = iter(items)
+    first = next(items, _END)
+
+    def generate():
+        try:
+            head = () if first is _END else (first,)
+            if fmt == wire_format.CBOR:
+                yield from wire_format.iter_cbor_array(itertools.chain(head, items), batch_size)
+            else:
+                yield from iter_json_array(itertools.chain(head, items), dumps, dump_args, batch_size)
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+
+    return _stream_response(app, generate(), fmt)
+
+
+def _stream_response(app, body, fmt):
+    mimetype = wire_format.MIMETYPES[fmt] if fmt != wire_format.JSON else app.json.mimetype
+    response = app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def stream_json_rows(batches):
+    """(RowPlan, satır demetleri) gruplarını sözlük kurmadan JSON olarak akıtır.
+
+    Her grup `plan.encode` ile doğrudan UTF-8 baytlara yazılır; gövde
+    `jsonify(plan.dicts(tüm_satırlar))` ile aynıdır. Girintili çıktı (debug)
+    için ve CBOR istendiğinde satırlar sözlüğe çevrilip `stream_json_array`'e
+    verilir.
+    """
+    app = current_app._get_current_object()
+    if _dump_args(app).get('indent') or _stream_format(app) != wire_format.JSON:
+        return stream_json_array(_row_dicts(batches))
+    backend = getattr(app.json, 'backend', None)
+    batches = iter(batches)
+    first = next(batches, _END)
+
+    def generate():
+        try:
+            if first is _END:
+                yield b'[]\n'
+                return
+            separator = b'['
+            for plan, rows in itertools.chain((first,), batches):
+                yield separator + plan.encode(rows, backend)[1:-1]
+                separator = b','
+            yield b']\n'
+        finally:
+            close = getattr(batches, 'close', None)
+            if close is not None:
+                close()
+
+    return _stream_response(app, generate(), wire_format.JSON)
+
+
+def _row_dicts(batches):
+    try:
+        for plan, rows in batches:
+            yield from plan.dicts(rows)
+    finally:
+        close = getattr(batches, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,215 @@
+import bisect
+import heapq
+import math
+import threading
+import time
+
+METRICS = ('views', 'rating', 'favorites', 'trending')
+
+
+class _RecipeStats:
+    __slots__ = ('category_id', 'views', 'rating_sum', 'rating_count', 'favorites', 'trend')
+
+    def __init__(self, category_id, views=0, rating_sum=0, rating_count=0, favorites=0, trend=0.0):
+        self.category_id = category_id
+        self.views = views
+        self.rating_sum = rating_sum
+        self.rating_count = rating_count
+        self.favorites = favorites
+        self.trend = trend
+
+
+class Leaderboards:
+    """Genel ve kategori bazında bellekte tutulan "en iyi tarifler" listeleri.
+
+    Her ölçüt (`METRICS`) ve kapsam (genel, her kategori) için en yüksek
+    skorlu `size` tarif sıralı tutulur; yazma yolları (görüntülenme, favori,
+    puan) yalnızca değişen tarifin listelerdeki yerini günceller. Skoru düşen
+    bir tarif dolu bir listedeyse o liste tüm tariflerden yeniden sıralanır.
+
+    - rating: Bayes ortalaması (C * m + puan_toplamı) / (C + puan_sayısı);
+      m kurulumdaki genel ortalama, C `prior_count`. Az oy almış 5 yıldızlı
+      tarifler çok oy almış 4.7'lerin önüne geçmez.
+    - trending: favori (1) ve puan (puan / 5) olaylarının yarı ömrü
+      `half_life_hours` olan üstel sönümlü toplamı. Skorlar sabit bir
+      `epoch`'a göre w * e^(λ(t - epoch)) olarak saklanır; sönüm tüm
+      tariflere aynı oranda uygulandığı için sıralama zamanla değişmez ve
+      yeni bir olay yalnızca toplama eklenir. Gösterilen skor şimdiye
+      indirgenmiş değerdir.
+
+    Kartlar (CARD_FIELDS) yalnızca listelerdeki tarifler için tutulur; listeye
+    kartı olmayan bir tarif girerse id'si `missing_cards()` ile alınıp
+    `set_cards()` ile doldurulur. Periyodik uzlaştırma nesnenin veritabanından
+    yeniden kurulmasıdır.
+    """
+
+    def __init__(self, size=50, half_life_hours=48, prior_count=5, epoch=None):
+        self.size = size
+        self.half_life_hours = half_life_hours
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.prior_count = prior_count
+        self.epoch = time.time() if epoch is None else epoch
+        self.built_at = time.monotonic()
+        self._lock = threading.RLock()
+        self._stats = {}
+        self._cards = {}
+        self._missing = set()
+        self._boards = {}
+        self._rating_mean = 0.0
+        self.ready = False
+
+    def __len__(self):
+        return len(self._stats)
+
+    def load(self, recipes, trends=None):
+        """[(tarif_id, kategori, görüntülenme, puan_toplamı, puan_sayısı, favori)] ve
+        {tarif_id: epoch'taki trend skoru} ile tüm listeleri baştan kurar"""
+        trends = trends or {}
+        with self._lock:
+            self._stats = {
+                recipe_id: _RecipeStats(category_id, views or 0, rating_sum or 0, rating_count or 0,
+                                        favorites or 0, trends.get(recipe_id, 0.0))
+                for recipe_id, category_id, views, rating_sum, rating_count, favorites in recipes
+            }
+            votes = sum(stats.rating_count for stats in self._stats.values())
+            total = sum(stats.rating_sum for stats in self._stats.values())
+            self._rating_mean = total / votes if votes else 0.0
+            self._boards = {}
+            for metric in METRICS:
+                ranked = sorted((-self._score(metric, stats), recipe_id) for recipe_id, stats in self._stats.items())
+                for entry in ranked:
+                    for scope in (None, self._stats[entry[1]].category_id):
+                        board = self._boards.setdefault((metric, scope), [])
+                        if len(board) < self.size:
+                            board.append(entry)
+            self._missing = self._board_ids() - set(self._cards)
+
+    def add_recipe(self, recipe_id, category_id, card=None):
+        with self._lock:
+            if recipe_id not in self._stats:
+                self._stats[recipe_id] = _RecipeStats(category_id)
+            if card is not None:
+                self._cards[recipe_id] = card
+            self._update(recipe_id)
+
+    def add_views(self, recipe_id, delta):
+        with self._lock:
+            stats = self._stats.get(recipe_id)
+            if stats is not None:
+                stats.views += delta
+                self._update(recipe_id, ('views',))
+
+    def add_favorite(self, recipe_id, now=None):
+        with self._lock:
+            stats = self._stats.get(recipe_id)
+            if stats is not None:
+                stats.favorites += 1
+                stats.trend += self._event_weight(1.0, now)
+                self._update(recipe_id, ('favorites', 'trending'))
+
+    def remove_favorite(self, recipe_id):
+        with self._lock:
+            stats = self._stats.get(recipe_id)
+            if stats is not None and stats.favorites > 0:
+                stats.favorites -= 1
+                self._update(recipe_id, ('favorites',))
+
+    def set_rating(self, recipe_id, rating_sum, rating_count, rating, now=None):
+        """Puan verildiğinde tarifin güncel toplamlarını ve yeni puanı işler"""
+        with self._lock:
+            stats = self._stats.get(recipe_id)
+            if stats is not None:
+                stats.rating_sum, stats.rating_count = rating_sum, rating_count
+                stats.trend += self._event_weight(rating / 5, now)
+                self._update(recipe_id, ('rating', 'trending'))
+
+    def top(self, metric, category_id=None, limit=10, now=None):
+        """[(tarif_id, skor, kart)] döndürür; kart güncel sayaçlarla doldurulur, yoksa None"""
+        now = time.time() if now is None else now
+        with self._lock:
+            results = []
+            for negative_score, recipe_id in self._boards.get((metric, category_id), ())[:limit]:
+                score = -negative_score
+                if metric == 'trending':
+                    score *= math.exp(-self.decay * (now - self.epoch))
+                card = self._cards.get(recipe_id)
+                if card is not None:
+                    stats = self._stats[recipe_id]
+                    card = dict(card, views=stats.views, favorite_count=stats.favorites,
+                                rating_count=stats.rating_count,
+                                average_rating=stats.rating_sum / stats.rating_count if stats.rating_count else 0.0)
+                results.append((recipe_id, round(score, 4), card))
+            return results
+
+    def missing_cards(self):
+        """Listelerde olup kartı bellekte olmayan tarif id'leri (alındıktan sonra temizlenir)"""
+        with self._lock:
+            missing, self._missing = self._missing, set()
+            return missing
+
+    def set_cards(self, cards):
+        with self._lock:
+            for card in cards:
+                self._cards[card['id']] = card
+
+    def _score(self, metric, stats):
+        if metric == 'views':
+            return stats.views
+        if metric == 'favorites':
+            return stats.favorites
+        if metric == 'rating':
+            return ((self.prior_count * self._rating_mean + stats.rating_sum)
+                    / (self.prior_count + stats.rating_count))
+        return stats.trend
+
+    def _event_weight(self, weight, now):
+        now = time.time() if now is None else now
+        return weight * math.exp(self.decay * (now - self.epoch))
+
+    def _update(self, recipe_id, metrics=METRICS):
+        stats = self._stats[recipe_id]
+        listed = False
+        for metric in metrics:
+            score = self._score(metric, stats)
+            for scope in (None, stats.category_id):
+                listed = self._place(metric, scope, recipe_id, score) or listed
+        if listed and recipe_id not in self._cards:
+            self._missing.add(recipe_id)
+
+    def _place(self, metric, scope, recipe_id, score):
+        """Tarifi listedeki yerine koyar; tarif listede kaldıysa True döner"""
+        board = self._boards.setdefault((metric, scope), [])
+        entry = (-score, recipe_id)
+        index = next((i for i, (_, rid) in enumerate(board) if rid == recipe_id), None)
+        if index is not None:
+            old_score = -board.pop(index)[0]
+            if score < old_score and len(board) + 1 >= self.size:
+                # Listenin dışındaki bir tarif artık daha yüksek olabilir
+                board = self._boards[(metric, scope)] = self._rank(metric, scope)
+                return entry in board
+            bisect.insort(board, entry)
+            return True
+        if len(board) < self.size or entry < board[-1]:
+            bisect.insort(board, entry)
+            del board[self.size:]
+            return True
+        return False
+
+    def _rank(self, metric, scope):
+        return sorted(heapq.nsmallest(self.size, (
+            (-self._score(metric, stats), recipe_id)
+            for recipe_id, stats in self._stats.items() if scope is None or stats.category_id == scope
+        )))
+
+    def _board_ids(self):
+        return {recipe_id for board in self._boards.values() for _, recipe_id in board}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'recipes': len(self._stats),
+                'boards': len(self._boards),
+                'cards': len(self._cards),
+                'age_seconds': round(time.monotonic() - self.built_at, 1),
+            }
@@ -0,0 +1,163 @@
+import contextvars
+import threading
+
+_current_scope = contextvars.ContextVar('request_loaders', default=None)
+
+
+class LoaderStats:
+    """Tüm yükleyiciler için ortak sayaçlar (metrik toplama için)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.memo_hits = 0
+        self.batches = 0
+
+    def record(self, loads=0, memo_hits=0, batches=0):
+        with self._lock:
+            self.loads += loads
+            self.memo_hits += memo_hits
+            self.batches += batches
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'memo_hits': self.memo_hits,
+                'batch_queries': self.batches,
+                # Her nokta sorgusu ayrı çalışsaydı `loads` kadar sorgu olurdu
+                'queries_saved': self.loads - self.batches,
+            }
+
+
+stats = LoaderStats()
+
+
+class Deferred:
+    """Henüz çalıştırılmamış bir nokta sorgusu; `get()` bekleyen tüm anahtarları tek sorguda getirir"""
+    __slots__ = ('_loader', 'key')
+
+    def __init__(self, loader, key):
+        self._loader = loader
+        self.key = key
+
+    def get(self):
+        return self._loader._resolve(self.key)
+
+
+class BatchLoader:
+    """DataLoader deseni: nokta sorgularını toplayıp tek `IN (...)` sorgusunda çalıştırır.
+
+    `batch_fn(anahtarlar) -> {anahtar: değer}` her varlık tipi için bir kez
+    tanımlanır. `defer()` ile istenen anahtarlar ilk `get()` çağrısına kadar
+    biriktirilir; sonuçlar istek boyunca hatırlanır. Birden çok anahtar
+    gereken yerler `load_many` (ya da önce `defer`) kullanmalıdır; `load`
+    tek anahtar içindir.
+
+    Aynı kapsamı paylaşan thread'ler (bkz. fanout) de toplanır: başka bir
+    thread'in o anda çalışan sorgusunda bulunan anahtar yeniden sorgulanmaz,
+    o sorgunun bitmesi beklenir ve bekleyen diğer anahtarlar da ilk
+    erişimde tek sorguda getirilir.
+    """
+
+    def __init__(self, batch_fn, max_batch=500):
+        self._batch_fn = batch_fn
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._memo = {}
+        self._pending = {}
+        self._inflight = {}
+
+    def defer(self, key):
+        key = int(key)
+        with self._lock:
+            if key in self._memo:
+                stats.record(loads=1, memo_hits=1)
+            else:
+                self._pending[key] = None
+                stats.record(loads=1)
+        return Deferred(self, key)
+
+    def load(self, key):
+        return self.defer(key).get()
+
+    def load_many(self, keys):
+        deferred = [self.defer(key) for key in keys]
+        return [d.get() for d in deferred]
+
+    def prime(self, key, value):
+        with self._lock:
+            self._memo[int(key)] = value
+
+    def clear(self, key):
+        with self._lock:
+            self._memo.pop(int(key), None)
+
+    def _resolve(self, key):
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+            running = self._inflight.get(key)
+            if running is None:
+                self._pending[key] = None
+                keys = [k for k in self._pending if k not in self._inflight]
+                self._pending = {}
+                running = threading.Event()
+                for k in keys:
+                    self._inflight[k] = running
+            else:
+                keys = None
+        if keys is None:
+            running.wait()
+            # Sorgu hata verdiyse anahtar bu thread'de yeniden denenir
+            return self._resolve(key)
+        try:
+            results = {}
+            for i in range(0, len(keys), self.max_batch):
+                chunk = keys[i:i + self.max_batch]
+                results.update(self._batch_fn(chunk))
+                stats.record(batches=1)
+            with self._lock:
+                for k in keys:
+                    self._memo[k] = results.get(k)
+                return self._memo[key]
+        finally:
+            with self._lock:
+                for k in keys:
+                    self._inflight.pop(k, None)
+            running.set()
+
+
+class RequestLoaders:
+    """Bir isteğe ait yükleyiciler; varlık tipi başına bir `BatchLoader`"""
+
+    def __init__(self, batch_fns):
+        self._batch_fns = batch_fns
+        self._lock = threading.Lock()
+        self._loaders = {}
+
+    def __getitem__(self, name):
+        with self._lock:
+            loader = self._loaders.get(name)
+            if loader is None:
+                loader = self._loaders[name] = BatchLoader(self._batch_fns[name])
+            return loader
+
+    def forget(self, name, key):
+        with self._lock:
+            loader = self._loaders.get(name)
+        if loader is not None:
+            loader.clear(key)
+
+
+def begin_scope(batch_fns):
+    """Yeni bir istek kapsamı açar; `end_scope` için token döndürür"""
+    return _current_scope.set(RequestLoaders(batch_fns))
+
+
+def end_scope(token):
+    _current_scope.reset(token)
+
+
+def current_scope():
+    return _current_scope.get()
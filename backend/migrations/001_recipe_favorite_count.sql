@@ -0,0 +1,26 @@
+-- Recipe tablosuna denormalize favori sayacı ekler.
+-- Liste sorguları her satır için favorites üzerinde COUNT(*) çalıştırmak
+-- yerine bu sütunu okur; sayaç add/remove_from_favorites ile aynı işlemde
+-- güncellenir, sapmalar `python jobs.py reconcile-favorites` ile düzeltilir.
+
+IF COL_LENGTH('dbo.Recipe', 'favorite_count') IS NULL
+BEGIN
+    ALTER TABLE [dbo].[Recipe]
+        ADD [favorite_count] INT NOT NULL
+        CONSTRAINT [DF_Recipe_favorite_count] DEFAULT 0;
+END
+GO
+
+UPDATE r
+SET r.[favorite_count] = COALESCE(fc.[cnt], 0)
+FROM [dbo].[Recipe] r
+LEFT JOIN (
+    SELECT [recipe_id], COUNT(*) AS [cnt]
+    FROM [dbo].[favorites]
+    GROUP BY [recipe_id]
+) fc ON fc.[recipe_id] = r.[id];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_favorites_user_recipe')
+    CREATE INDEX [IX_favorites_user_recipe] ON [dbo].[favorites] ([user_id], [recipe_id]);
+GO
@@ -0,0 +1,44 @@
+-- Puan istatistiklerini artımlı tutmak için Recipe tablosuna toplam ve
+-- yıldız bazında histogram sütunları ekler. rate_recipe artık RecipeRating
+-- tablosunu yeniden taramaz, yalnızca eski/yeni puan farkını uygular.
+
+IF COL_LENGTH('dbo.Recipe', 'rating_sum') IS NULL
+BEGIN
+    ALTER TABLE [dbo].[Recipe] ADD
+        [rating_sum] INT NOT NULL CONSTRAINT [DF_Recipe_rating_sum] DEFAULT 0,
+        [rating_1] INT NOT NULL CONSTRAINT [DF_Recipe_rating_1] DEFAULT 0,
+        [rating_2] INT NOT NULL CONSTRAINT [DF_Recipe_rating_2] DEFAULT 0,
+        [rating_3] INT NOT NULL CONSTRAINT [DF_Recipe_rating_3] DEFAULT 0,
+        [rating_4] INT NOT NULL CONSTRAINT [DF_Recipe_rating_4] DEFAULT 0,
+        [rating_5] INT NOT NULL CONSTRAINT [DF_Recipe_rating_5] DEFAULT 0;
+END
+GO
+
+UPDATE r
+SET r.[rating_sum] = COALESCE(s.[total], 0),
+    r.[rating_count] = COALESCE(s.[cnt], 0),
+    r.[average_rating] = CASE WHEN s.[cnt] > 0 THEN CAST(s.[total] AS FLOAT) / s.[cnt] ELSE 0 END,
+    r.[rating_1] = COALESCE(s.[r1], 0),
+    r.[rating_2] = COALESCE(s.[r2], 0),
+    r.[rating_3] = COALESCE(s.[r3], 0),
+    r.[rating_4] = COALESCE(s.[r4], 0),
+    r.[rating_5] = COALESCE(s.[r5], 0)
+FROM [dbo].[Recipe] r
+LEFT JOIN (
+    SELECT [recipe_id],
+           SUM([rating]) AS [total],
+           COUNT(*) AS [cnt],
+           SUM(CASE WHEN [rating] = 1 THEN 1 ELSE 0 END) AS [r1],
+           SUM(CASE WHEN [rating] = 2 THEN 1 ELSE 0 END) AS [r2],
+           SUM(CASE WHEN [rating] = 3 THEN 1 ELSE 0 END) AS [r3],
+           SUM(CASE WHEN [rating] = 4 THEN 1 ELSE 0 END) AS [r4],
+           SUM(CASE WHEN [rating] = 5 THEN 1 ELSE 0 END) AS [r5]
+    FROM [dbo].[RecipeRating]
+    GROUP BY [recipe_id]
+) s ON s.[recipe_id] = r.[id];
+GO
+
+-- Kullanıcı başına tarif başına tek puan (upsert'in dayandığı kısıt)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_RecipeRating_recipe_user')
+    CREATE UNIQUE INDEX [UX_RecipeRating_recipe_user] ON [dbo].[RecipeRating] ([recipe_id], [user_id]);
+GO
@@ -0,0 +1,14 @@
+-- Write-behind görüntülenme sayacının zaman dilimi bazında topladığı
+-- görüntülenmeler. Recipe.views toplamı tutmaya devam eder; bu tablo
+-- trend hesapları için saatlik dağılımı saklar.
+
+IF OBJECT_ID('dbo.RecipeViewBucket', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[RecipeViewBucket] (
+        [recipe_id] INT NOT NULL,
+        [bucket_start] DATETIME NOT NULL,
+        [views] INT NOT NULL,
+        CONSTRAINT [PK_RecipeViewBucket] PRIMARY KEY ([recipe_id], [bucket_start])
+    );
+END
+GO
@@ -0,0 +1,24 @@
+-- Serbest metin süre ve porsiyon alanlarının ayrıştırılmış sayısal
+-- karşılıklarını ekler. Değerler create_recipe tarafından yazılır; mevcut
+-- satırlar için migration'dan sonra şu iş çalıştırılmalıdır:
+--     python jobs.py backfill-recipe-attributes
+-- (Ayrıştırma Türkçe metin kuralları içerdiği için SQL'de değil Python'da
+-- recipe_attributes.py ile yapılır.)
+
+IF COL_LENGTH('dbo.Recipe', 'cooking_minutes') IS NULL
+BEGIN
+    ALTER TABLE [dbo].[Recipe] ADD
+        [preparation_minutes] INT NULL,
+        [cooking_minutes] INT NULL,
+        [servings_min] INT NULL,
+        [servings_max] INT NULL;
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Recipe_cooking_minutes')
+    CREATE INDEX [IX_Recipe_cooking_minutes] ON [dbo].[Recipe] ([cooking_minutes]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Recipe_servings')
+    CREATE INDEX [IX_Recipe_servings] ON [dbo].[Recipe] ([servings_min], [servings_max]);
+GO
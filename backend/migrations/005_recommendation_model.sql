@@ -0,0 +1,48 @@
+-- Favori ve puanlardan kurulan tarif-tarif öneri modeli.
+--
+-- RecipeNeighbour her tarifin birlikte beğenildiği en benzer tarifleri,
+-- RecommendationBuild da model kurulumlarını tutar. Kurulum çevrimdışı işle
+-- yapılır ve uygulama modeli bu tablolardan belleğe yükler:
+--     python jobs.py build-recommendations      # tam kurulum
+--     python jobs.py refresh-recommendations    # son kurulumdan yeni satırlar
+-- Artımlı yenileme `watermark`tan sonra oluşturulan favori ve puanları
+-- okuduğu için favorites tablosuna created_at eklenir (mevcut satırlar
+-- migration zamanını alır).
+
+IF COL_LENGTH('dbo.favorites', 'created_at') IS NULL
+BEGIN
+    ALTER TABLE [dbo].[favorites] ADD
+        [created_at] DATETIME NOT NULL CONSTRAINT [DF_favorites_created_at] DEFAULT GETDATE();
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_favorites_created_at')
+    CREATE INDEX [IX_favorites_created_at] ON [dbo].[favorites] ([created_at]) INCLUDE ([recipe_id]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_RecipeRating_created_at')
+    CREATE INDEX [IX_RecipeRating_created_at] ON [dbo].[RecipeRating] ([created_at]) INCLUDE ([recipe_id]);
+GO
+
+IF OBJECT_ID('dbo.RecipeNeighbour', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[RecipeNeighbour] (
+        [recipe_id] INT NOT NULL,
+        [neighbour_id] INT NOT NULL,
+        [score] FLOAT NOT NULL,
+        CONSTRAINT [PK_RecipeNeighbour] PRIMARY KEY ([recipe_id], [neighbour_id])
+    );
+END
+GO
+
+IF OBJECT_ID('dbo.RecommendationBuild', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[RecommendationBuild] (
+        [id] INT IDENTITY(1, 1) NOT NULL CONSTRAINT [PK_RecommendationBuild] PRIMARY KEY,
+        [kind] VARCHAR(16) NOT NULL,
+        [watermark] DATETIME NOT NULL,
+        [recipes] INT NOT NULL,
+        [built_at] DATETIME NOT NULL CONSTRAINT [DF_RecommendationBuild_built_at] DEFAULT GETDATE()
+    );
+END
+GO
@@ -0,0 +1,94 @@
+-- Mobil istemcinin yalnızca değişenleri indirmesi için (/api/sync) satır
+-- sürümleri ve silme kayıtları.
+--
+-- ROWVERSION sütunu satır her eklendiğinde ya da güncellendiğinde
+-- veritabanı genelinde artan bir sayı alır; istemciye verilen jeton bu
+-- sayıdır.
+--
+-- Recipe satırı sayaçlar (görüntülenme, favori, puan) yazıldıkça da
+-- güncellenir; görüntülenme sayacı birkaç saniyede bir yazıldığından
+-- Recipe.row_version yalnızca sayaç değişikliklerini (/api/sync
+-- `counters`) bulmak için kullanılır. Tam kart, içerik değiştiğinde
+-- sürümü artan RecipeSyncVersion'dan seçilir. Bu tabloya tarifi ekleyen
+-- ve kartta görünen içeriği değiştiren yazma yolları (create_recipe,
+-- kullanıcı adı değişikliği) aynı işlem içinde dokunur. Tetikleyici
+-- kullanılmaz: Recipe'deki OUTPUT'lu UPDATE'ler (rate_recipe) tetikleyicili
+-- tabloda çalışmaz.
+--
+-- Silinen satırların sürümü kalmadığı için favori kaldırma ve yorum silme
+-- SyncTombstone'a aynı işlem içinde kayıt ekler. Eski kayıtlar
+--     python jobs.py prune-sync-tombstones
+-- ile silinir; saklama süresinden eski jetonla gelen istemci baştan
+-- senkronize edilir.
+
+IF COL_LENGTH('dbo.Recipe', 'row_version') IS NULL
+    ALTER TABLE [dbo].[Recipe] ADD [row_version] ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.favorites', 'row_version') IS NULL
+    ALTER TABLE [dbo].[favorites] ADD [row_version] ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.RecipeRating', 'row_version') IS NULL
+    ALTER TABLE [dbo].[RecipeRating] ADD [row_version] ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.Comment', 'row_version') IS NULL
+    ALTER TABLE [dbo].[Comment] ADD [row_version] ROWVERSION;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Recipe_row_version')
+    CREATE INDEX [IX_Recipe_row_version] ON [dbo].[Recipe] ([row_version]);
+GO
+
+IF OBJECT_ID('dbo.RecipeSyncVersion', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[RecipeSyncVersion] (
+        [recipe_id] INT NOT NULL CONSTRAINT [PK_RecipeSyncVersion] PRIMARY KEY,
+        [changed_at] DATETIME NOT NULL CONSTRAINT [DF_RecipeSyncVersion_changed_at] DEFAULT GETDATE(),
+        [row_version] ROWVERSION
+    );
+END
+GO
+
+INSERT INTO [dbo].[RecipeSyncVersion] ([recipe_id])
+SELECT r.[id] FROM [dbo].[Recipe] r
+WHERE NOT EXISTS (SELECT 1 FROM [dbo].[RecipeSyncVersion] v WHERE v.[recipe_id] = r.[id]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_RecipeSyncVersion_row_version')
+    CREATE INDEX [IX_RecipeSyncVersion_row_version] ON [dbo].[RecipeSyncVersion] ([row_version]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_favorites_user_row_version')
+    CREATE INDEX [IX_favorites_user_row_version] ON [dbo].[favorites] ([user_id], [row_version]) INCLUDE ([recipe_id]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_RecipeRating_user_row_version')
+    CREATE INDEX [IX_RecipeRating_user_row_version] ON [dbo].[RecipeRating] ([user_id], [row_version]) INCLUDE ([recipe_id], [rating]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Comment_row_version')
+    CREATE INDEX [IX_Comment_row_version] ON [dbo].[Comment] ([row_version]);
+GO
+
+IF OBJECT_ID('dbo.SyncTombstone', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[SyncTombstone] (
+        [id] BIGINT IDENTITY(1, 1) NOT NULL CONSTRAINT [PK_SyncTombstone] PRIMARY KEY,
+        [entity] VARCHAR(16) NOT NULL,      -- 'favorite' (entity_id = tarif) ya da 'comment'
+        [entity_id] INT NOT NULL,
+        [user_id] INT NULL,
+        [deleted_at] DATETIME NOT NULL CONSTRAINT [DF_SyncTombstone_deleted_at] DEFAULT GETDATE(),
+        [row_version] ROWVERSION
+    );
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SyncTombstone_row_version')
+    CREATE INDEX [IX_SyncTombstone_row_version] ON [dbo].[SyncTombstone] ([entity], [row_version]) INCLUDE ([entity_id], [user_id]);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SyncTombstone_deleted_at')
+    CREATE INDEX [IX_SyncTombstone_deleted_at] ON [dbo].[SyncTombstone] ([deleted_at]);
+GO
@@ -0,0 +1,24 @@
+-- /api/batch ile gönderilen çevrimdışı işlemlerin sonuçları.
+--
+-- İstemci her işleme kendi kimliğini (op_id) verir. İşlem uygulandığında
+-- sonucu aynı veritabanı işleminde buraya yazılır; aynı op_id yeniden
+-- gönderilirse işlem tekrar yapılmaz, kayıtlı sonuç döner. Eski kayıtlar
+--     python jobs.py prune-batch-operations
+-- ile silinir.
+
+IF OBJECT_ID('dbo.BatchOperation', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[BatchOperation] (
+        [user_id] INT NOT NULL,
+        [op_id] NVARCHAR(64) NOT NULL,
+        [status] SMALLINT NOT NULL,
+        [result] NVARCHAR(MAX) NOT NULL,
+        [created_at] DATETIME NOT NULL CONSTRAINT [DF_BatchOperation_created_at] DEFAULT GETDATE(),
+        CONSTRAINT [PK_BatchOperation] PRIMARY KEY ([user_id], [op_id])
+    );
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_BatchOperation_created_at')
+    CREATE INDEX [IX_BatchOperation_created_at] ON [dbo].[BatchOperation] ([created_at]);
+GO
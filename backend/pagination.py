@@ -0,0 +1,122 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class Page(list):
+    """Bir sayfalık sonuç listesi.
+
+    Normal bir liste gibi davranır; ek olarak bir sonraki sayfanın imlecini
+    `next_cursor` alanında taşır (son sayfada veya sayfalama yoksa None).
+    """
+
+    def __init__(self, items=(), next_cursor=None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(values):
+    """Sıralama anahtarı değerlerini opak, URL-güvenli bir imlece çevirir"""
+    payload = [{'t': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """`encode_cursor` ile üretilen imleci çözer; bozuksa ValueError fırlatır"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+        if not isinstance(payload, list):
+            raise ValueError
+        return [datetime.fromisoformat(v['t']) if isinstance(v, dict) else v for v in payload]
+    except Exception:
+        raise ValueError("Geçersiz sayfalama imleci")
+
+
+def encode_sync_token(version, issued_at):
+    """Senkronizasyon filigranını (rowversion) ve verildiği zamanı opak bir jetona çevirir"""
+    return encode_cursor(['sync', version, issued_at])
+
+
+def decode_sync_token(token):
+    """`encode_sync_token` jetonunu (sürüm, verildiği zaman) olarak çözer; bozuksa ValueError"""
+    try:
+        tag, version, issued_at = decode_cursor(token)
+        if tag != 'sync' or not isinstance(version, int) or not isinstance(issued_at, datetime):
+            raise ValueError
+        return version, issued_at
+    except ValueError:
+        raise ValueError("Geçersiz senkronizasyon jetonu")
+
+
+def parse_page_args(args):
+    """İstek parametrelerinden (limit, imleç değerleri) çiftini okur.
+
+    Ne `limit` ne `cursor` verilmişse (None, None) döner ve sonuçlar eskisi
+    gibi tek parça gönderilir.
+    """
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if limit is None and not cursor:
+        return None, None
+    if limit is None:
+        limit = DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("limit bir tam sayı olmalıdır")
+        if limit < 1:
+            raise ValueError("limit en az 1 olmalıdır")
+        limit = min(limit, MAX_LIMIT)
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+class KeysetOrder:
+    """Keyset (seek) sayfalama için sıralama tanımı.
+
+    Her anahtar `(sql_ifadesi, 'ASC' | 'DESC', sonuç_alanı)` üçlüsüdür. Son
+    anahtar benzersiz olmalıdır (genelde id). Sorgu OFFSET yerine son satırın
+    anahtarlarından sonrasını istediği için derin sayfalar da ilk sayfa kadar
+    ucuzdur.
+    """
+
+    def __init__(self, *keys):
+        self.keys = keys
+
+    @property
+    def fields(self):
+        """Sonuç satırında bulunması gereken sıralama alanları"""
+        return tuple(field for _, _, field in self.keys)
+
+    def order_by(self):
+        return "ORDER BY " + ", ".join(f"{expr} {direction}" for expr, direction, _ in self.keys)
+
+    def where(self, cursor_values):
+        """İmleçten sonraki satırları seçen koşulu ve parametrelerini döndürür"""
+        if len(cursor_values) != len(self.keys):
+            raise ValueError("Geçersiz sayfalama imleci")
+        clauses = []
+        params = []
+        for i, (expr, direction, _) in enumerate(self.keys):
+            parts = []
+            for prev_expr, _, _ in self.keys[:i]:
+                parts.append(f"{prev_expr} = ?")
+            parts.append(f"{expr} {'<' if direction == 'DESC' else '>'} ?")
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(cursor_values[:i + 1])
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def cursor_for(self, item):
+        return encode_cursor([item[field] for _, _, field in self.keys])
+
+    def paginate(self, items, limit):
+        """`limit + 1` satır çekilmiş sonuçtan sayfayı ve sonraki imleci üretir"""
+        if limit is None or len(items) <= limit:
+            return Page(items)
+        items = items[:limit]
+        return Page(items, self.cursor_for(items[-1]))
@@ -0,0 +1,84 @@
+from functools import lru_cache
+
+# `fields=` parametresinde izin verilen alanlar ve SQL karşılıkları.
+# Recipe tablosu her sorguda `r` takma adıyla kullanılır.
+RECIPE_FIELDS = {
+    'id': "r.[id]",
+    'title': "r.[title]",
+    'description': "r.[description]",
+    'ingredients': "r.[ingredients]",
+    'instructions': "r.[instructions]",
+    'created_at': "r.[created_at]",
+    'user_id': "r.[user_id]",
+    'category_id': "r.[category_id]",
+    'views': "r.[views]",
+    'serving_size': "r.[serving_size]",
+    'preparation_time': "r.[preparation_time]",
+    'cooking_time': "r.[cooking_time]",
+    'tips': "r.[tips]",
+    'image_filename': "r.[image_filename]",
+    'ingredients_sections': "r.[ingredients_sections]",
+    'username': "r.[username]",
+    'average_rating': "COALESCE(r.[average_rating], 0.0)",
+    'rating_count': "COALESCE(r.[rating_count], 0)",
+    'favorite_count': "COALESCE(r.[favorite_count], 0)",
+}
+
+# Adlandırılmış projeksiyonlar: liste kartları için hafif, detay için tam
+PROJECTIONS = {
+    'card': (
+        'id', 'title', 'image_filename', 'cooking_time', 'preparation_time',
+        'serving_size', 'category_id', 'user_id', 'username', 'views',
+        'average_rating', 'rating_count', 'favorite_count', 'created_at',
+    ),
+    'full': (
+        'id', 'title', 'description', 'ingredients', 'instructions', 'created_at',
+        'user_id', 'category_id', 'views', 'serving_size', 'preparation_time',
+        'cooking_time', 'tips', 'image_filename', 'ingredients_sections', 'username',
+        'average_rating', 'rating_count', 'favorite_count',
+    ),
+}
+
+CARD_FIELDS = PROJECTIONS['card']
+FULL_FIELDS = PROJECTIONS['full']
+
+
+def resolve_fields(spec, default='card'):
+    """`fields=` parametresini doğrulayıp alan listesine çevirir.
+
+    Bir projeksiyon adı ('card', 'full') ya da virgülle ayrılmış alan adları
+    kabul edilir. Beyaz listede olmayan alan varsa ValueError fırlatılır.
+    """
+    if not spec:
+        return PROJECTIONS[default]
+    spec = spec.strip()
+    if spec in PROJECTIONS:
+        return PROJECTIONS[spec]
+    names = []
+    for name in spec.split(','):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in RECIPE_FIELDS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen alan(lar): {', '.join(unknown)}")
+    if 'id' not in names:
+        names.insert(0, 'id')
+    return tuple(names)
+
+
+@lru_cache(maxsize=128)
+def _compile(fields, overrides):
+    expressions = dict(RECIPE_FIELDS)
+    expressions.update(overrides)
+    return ",\n".join(f"{expressions[name]} AS [{name}]" for name in fields)
+
+
+def select_list(fields, required=(), overrides=None):
+    """Alan listesini SQL SELECT sütun listesine derler (sonuç önbelleğe alınır).
+
+    `required` sorgunun kendi ihtiyacı olan alanlardır (ör. sayfalama
+    anahtarları); istenmemiş olsalar da listeye eklenirler.
+    """
+    fields = tuple(fields) + tuple(name for name in required if name not in fields)
+    return _compile(fields, tuple(sorted((overrides or {}).items())))
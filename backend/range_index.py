@@ -0,0 +1,49 @@
+import bisect
+import threading
+
+
+class RangeIndex:
+    """Sayısal bir alan üzerinde sıralı (değer, anahtar) indeksi.
+
+    `between(en_az, en_çok)` iki ikili arama ile aralıktaki anahtarları
+    döndürür. Toplu yüklemede sıralama ilk sorguya ertelenir; sıralama
+    kurulduktan sonraki eklemeler yerinde (`insort`) yapılır. Değeri None
+    olan anahtarlar indekslenmez.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, key, value):
+        with self._lock:
+            self._discard(key)
+            if value is None:
+                return
+            self._values[key] = value
+            if self._sorted is not None:
+                bisect.insort(self._sorted, (value, key))
+
+    def remove(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def between(self, low=None, high=None):
+        """low <= değer <= high olan anahtarlar; None sınırsız demektir"""
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted((value, key) for key, value in self._values.items())
+            items = self._sorted
+            start = 0 if low is None else bisect.bisect_left(items, (low,))
+            end = len(items) if high is None else bisect.bisect_left(items, (high + 1,))
+            return [key for _, key in items[start:end]]
+
+    def _discard(self, key):
+        value = self._values.pop(key, None)
+        if value is not None and self._sorted is not None:
+            position = bisect.bisect_left(self._sorted, (value, key))
+            del self._sorted[position]
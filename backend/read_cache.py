@@ -0,0 +1,127 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+def _copy(value):
+    """Değerler düz sözlükler ya da onların listeleridir (Page dahil); bir seviye kopya yeterlidir"""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        copied = copy.copy(value)  # Page'in next_cursor gibi nitelikleri korunur
+        copied[:] = [dict(item) if isinstance(item, dict) else item for item in value]
+        return copied
+    return value
+
+
+class _Flight:
+    """Bir anahtar için süren tek yükleme; bekleyenler sonucunu paylaşır"""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ReadCache:
+    """Okuma sorguları için TTL'li, LRU ile sınırlı ve sürüm anahtarlı önbellek.
+
+    - Her kayıt, bağlı olduğu kapsamların (tablo adı ya da (tablo, id))
+      sürüm sayaçlarıyla birlikte anahtarlanır. Yazma yolları `bump()` ile
+      sayaçları artırır; eski kayıtlar silinmez, erişilemez hâle gelir ve
+      TTL ya da LRU ile düşer.
+    - Aynı anahtar için eşzamanlı kaçırmalar tek yüklemede birleştirilir
+      (single-flight); süresi dolan popüler bir anahtar veritabanına
+      yığılma yapmaz. Yükleme hata verirse hata bekleyenlere de iletilir ve
+      sonuç önbelleğe alınmaz.
+    - Yükleme sürerken kapsamlardan biri değişirse sonuç saklanmaz.
+    - Değerler kopyalanarak döndürülür; çağıranın değiştirmesi önbelleği
+      bozmaz.
+
+    Önbellek süreç içidir; başka süreçlerden (işler, diğer worker'lar)
+    yapılan yazmalar en geç TTL sonunda görünür.
+    """
+
+    def __init__(self, max_entries=2048, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._flights = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def bump(self, *scopes):
+        """Kapsamların sürümünü artırır; onlara bağlı kayıtlar geçersiz olur"""
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def get_or_load(self, key, scopes, loader, ttl=None):
+        """Önbellekteki değeri ya da `loader()` sonucunu döndürür"""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            versions = tuple(self._versions.get(scope, 0) for scope in scopes)
+            full_key = (key, versions)
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(full_key)
+                    self.hits += 1
+                    return _copy(entry[1])
+                del self._entries[full_key]
+                self.expirations += 1
+            flight = self._flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[full_key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.value)
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[full_key]
+                current = tuple(self._versions.get(scope, 0) for scope in scopes)
+                if flight.error is None and current == versions:
+                    self._entries[full_key] = (time.monotonic() + ttl, flight.value)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+            flight.done.set()
+        return _copy(flight.value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+            }
@@ -0,0 +1,136 @@
+"""Serbest metin tarif alanlarını sayısal değerlere çevirir.
+
+`cooking_time` / `preparation_time` dakikaya, `serving_size` (en az, en çok)
+kişi aralığına indirgenir. Sonuçlar yazma anında ve geri doldurma işinde
+Recipe tablosuna yazılır; filtreler her satırda regex çalıştırmak yerine bu
+sütunları ve bellek içi aralık indekslerini kullanır.
+"""
+import re
+
+from turkish_text import fold
+
+_NUMBER = r'(\d+(?:[.,]\d+)?)'
+_RANGE_RE = re.compile(_NUMBER + r'\s*(?:-|–|ile|ila|/)\s*' + _NUMBER)
+_AMOUNT_RE = re.compile(_NUMBER + r'\s*([a-z]*)')
+# "1/2 saat", "1 1/2 saat" gibi tek haneli basit kesirler; "20/30 dk" aralıktır
+_FRACTION_RE = re.compile(r'(?<![\d.,])(?:(\d+)\s+)?(\d)\s*/\s*(\d)(?![\d.,])')
+
+# Katlanmış birim kelimesinin başı -> dakika çarpanı; ekli hâller de
+# eşleşir ("dakikalık", "saatte", "saati"). 'san' 'sa'dan önce denenir.
+_UNIT_PREFIXES = (
+    ('san', 1 / 60), ('sn', 1 / 60),
+    ('sa', 60),
+    ('dak', 1), ('dk', 1), ('min', 1),
+)
+# "6+", "6 kişilik ve üzeri", "6 kişiden fazla"; açık uç birimden sonra da gelebilir
+_SERVINGS_RE = re.compile(r'(\d+)\s*(?:kisi[a-z]*\s*)?(\+|ve uzeri|uzeri|den fazla|dan fazla|fazla)?')
+_HALF_HOUR_RE = re.compile(r'\byarim\s+saat\b')
+_QUARTER_HOUR_RE = re.compile(r'\bceyrek\s+saat\b')
+
+# Mobil "Yemek Türü" filtresinin kategori id karşılıkları
+CATEGORY_FILTERS = {
+    'Ana Yemek': 1,
+    'Aperatif': 5,
+    'Çorba': 2,
+    'İçecek': 6,
+    'Kahvaltılık': 7,
+    'Salata': 3,
+    'Tatlı': 4,
+}
+
+# Mobil filtre etiketleri -> (en az, en çok); None sınırsız demektir
+TIME_FILTERS = {
+    '30 dakikadan az': (None, 29),
+    '30-60 dakika': (30, 60),
+    '60 dakikadan fazla': (61, None),
+}
+PORTION_FILTERS = {
+    '1-2 Kişilik': (1, 2),
+    '3-4 Kişilik': (3, 4),
+    '5-6 Kişilik': (5, 6),
+    '6+ Kişilik': (6, None),
+}
+
+
+def _number(text):
+    return float(text.replace(',', '.'))
+
+
+def _fraction(match):
+    whole, numerator, denominator = match.groups()
+    numerator, denominator = int(numerator), int(denominator)
+    if not 0 < numerator < denominator:
+        return match.group(0)
+    return str(int(whole or 0) + numerator / denominator)
+
+
+def _unit_factor(unit):
+    """Birimsiz sayı dakikadır; süre birimi olmayan kelimeler için None"""
+    if not unit:
+        return 1
+    for prefix, factor in _UNIT_PREFIXES:
+        if unit.startswith(prefix):
+            return factor
+    return None
+
+
+def parse_minutes(text):
+    """Süre metnini dakikaya çevirir; anlaşılamazsa None döner.
+
+    "1 saat 15 dakika" -> 75, "1,5 saat" -> 90, "yarım saat" -> 30,
+    "1/2 saat" -> 30, "20-30 dk" -> 30 (aralıklarda üst sınır), "45" -> 45,
+    "20 dakikalık" -> 20.
+    """
+    folded = fold(text).strip()
+    if not folded:
+        return None
+    folded = _HALF_HOUR_RE.sub('30 dakika', folded)
+    folded = _QUARTER_HOUR_RE.sub('15 dakika', folded)
+    # Kesirler aralıktan önce çözülür; yoksa "1/2 saat" 2 saat olurdu
+    folded = _FRACTION_RE.sub(_fraction, folded)
+    # Aralıkta birim yalnızca sonda yazılır ("20-30 dk"), üst sınırı kullan
+    folded = _RANGE_RE.sub(lambda m: m.group(2), folded)
+
+    total = 0.0
+    found = False
+    for amount, unit in _AMOUNT_RE.findall(folded):
+        factor = _unit_factor(unit)
+        if factor is None:
+            # "3 kişilik 20 dakika" gibi birimi süre olmayan sayılar atlanır
+            continue
+        total += _number(amount) * factor
+        found = True
+    if not found:
+        return None
+    return int(round(total))
+
+
+def parse_servings(text):
+    """Porsiyon metnini (en az, en çok) kişi sayısına çevirir.
+
+    "3-4 kişilik" -> (3, 4), "4 kişilik" -> (4, 4), "6+" ve
+    "6 kişilik ve üzeri" -> (6, None), anlaşılamazsa (None, None).
+    """
+    folded = fold(text).strip()
+    if not folded:
+        return None, None
+    match = _RANGE_RE.search(folded)
+    if match:
+        low, high = sorted((int(_number(match.group(1))), int(_number(match.group(2)))))
+        return low, high
+    match = _SERVINGS_RE.search(folded)
+    if not match:
+        return None, None
+    count = int(match.group(1))
+    return (count, None) if match.group(2) else (count, count)
+
+
+def parse_recipe_attributes(preparation_time, cooking_time, serving_size):
+    """Recipe tablosunun ayrıştırılmış sütunları"""
+    servings_min, servings_max = parse_servings(serving_size)
+    return {
+        'preparation_minutes': parse_minutes(preparation_time),
+        'cooking_minutes': parse_minutes(cooking_time),
+        'servings_min': servings_min,
+        'servings_max': servings_max,
+    }
@@ -0,0 +1,185 @@
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+
+# İsteğe bağlı NumPy/SciPy (yoksa None) similarity ile ortaktır
+from similarity import np, sparse
+
+FAVORITE_WEIGHT = 1.0
+
+
+def rating_weight(rating):
+    """Puanın tercih ağırlığı: 5 -> 1, 4 -> 0.5, 3 -> 0, 1-2 olumsuz"""
+    return (rating - 3) / 2
+
+
+def interaction_values(favorites, ratings):
+    """Favori [(kullanıcı, tarif)] ve puanlardan [(kullanıcı, tarif, puan)] olumlu etkileşimler.
+
+    {(kullanıcı, tarif): değer} döner; favori 1, puan `rating_weight` değerini
+    alır, ikisi birden varsa büyüğü geçerlidir. Olumsuz puanlar birlikte
+    beğenilme sayılmaz.
+    """
+    values = {}
+    for user_id, recipe_id in favorites:
+        values[(user_id, recipe_id)] = FAVORITE_WEIGHT
+    for user_id, recipe_id, rating in ratings:
+        weight = rating_weight(rating)
+        if weight > values.get((user_id, recipe_id), 0):
+            values[(user_id, recipe_id)] = weight
+    return values
+
+
+def co_occurring(values, recipe_ids):
+    """Verilen tariflerle en az bir ortak kullanıcısı olan tarifler (kendileri dahil)"""
+    recipe_ids = set(recipe_ids)
+    users = {user_id for user_id, recipe_id in values if recipe_id in recipe_ids}
+    return recipe_ids | {recipe_id for user_id, recipe_id in values if user_id in users}
+
+
+def item_neighbours(values, top_k=20, recipe_ids=None, min_common=2, block_rows=2048, backend=None):
+    """Tarif-tarif kosinüs benzerliğiyle her tarifin en yakın `top_k` komşusu.
+
+    `values` `interaction_values` çıktısıdır. Benzerlik kullanıcı x tarif
+    matrisi X için XᵀX'in sütun normlarına bölünmesidir; en az `min_common`
+    ortak kullanıcısı olmayan çiftler elenir. `recipe_ids` verilirse yalnızca
+    o tariflerin satırları hesaplanır (artımlı yenileme); sonuç
+    {tarif_id: [(komşu_id, skor)]} olarak, komşusu olmayanlar için boş liste
+    ile döner.
+    """
+    if backend is None:
+        backend = 'numpy' if np is not None else 'python'
+    if recipe_ids is None:
+        recipe_ids = {recipe_id for _, recipe_id in values}
+    if backend == 'numpy':
+        return _matrix_neighbours(values, top_k, recipe_ids, min_common, block_rows)
+    return _posting_neighbours(values, top_k, recipe_ids, min_common)
+
+
+def _posting_neighbours(values, top_k, recipe_ids, min_common):
+    by_user = defaultdict(dict)
+    by_recipe = defaultdict(dict)
+    for (user_id, recipe_id), value in values.items():
+        by_user[user_id][recipe_id] = value
+        by_recipe[recipe_id][user_id] = value
+    norms = {recipe_id: math.sqrt(sum(v * v for v in users.values())) for recipe_id, users in by_recipe.items()}
+
+    neighbours = {}
+    for recipe_id in recipe_ids:
+        dots = defaultdict(float)
+        common = Counter()
+        for user_id, value in by_recipe.get(recipe_id, {}).items():
+            for other_id, other_value in by_user[user_id].items():
+                dots[other_id] += value * other_value
+                common[other_id] += 1
+        dots.pop(recipe_id, None)
+        scored = (
+            (dot / (norms[recipe_id] * norms[other_id]), other_id)
+            for other_id, dot in dots.items() if common[other_id] >= min_common and dot > 0
+        )
+        neighbours[recipe_id] = [(other_id, score) for score, other_id in heapq.nlargest(top_k, scored)]
+    return neighbours
+
+
+def _matrix_neighbours(values, top_k, recipe_ids, min_common, block_rows):
+    users = {}
+    recipes = {}
+    rows, cols, data = [], [], []
+    for (user_id, recipe_id), value in values.items():
+        rows.append(users.setdefault(user_id, len(users)))
+        cols.append(recipes.setdefault(recipe_id, len(recipes)))
+        data.append(value)
+    ids = list(recipes)
+    matrix = sparse.csr_matrix(
+        (np.array(data, dtype=np.float32), (np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32))),
+        shape=(len(users), len(recipes)))
+    binary = matrix.copy()
+    binary.data[:] = 1
+    transposed = matrix.T.tocsr()
+    binary_transposed = binary.T.tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+
+    neighbours = {recipe_id: [] for recipe_id in recipe_ids if recipe_id not in recipes}
+    targets = np.array([recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes], dtype=np.int32)
+    for start in range(0, len(targets), block_rows):
+        block = targets[start:start + block_rows]
+        # Blok satırları x tüm tarifler: nokta çarpımları ve ortak kullanıcı sayıları aynı seyreklikte
+        dots = (transposed[block] @ matrix).tocsr()
+        common = (binary_transposed[block] @ binary).tocsr()
+        dots.sort_indices()
+        common.sort_indices()
+        for offset, column in enumerate(block.tolist()):
+            lo, hi = dots.indptr[offset], dots.indptr[offset + 1]
+            others = dots.indices[lo:hi]
+            scores = dots.data[lo:hi] / (norms[column] * norms[others])
+            keep = (common.data[common.indptr[offset]:common.indptr[offset + 1]] >= min_common) & (others != column)
+            others, scores = others[keep], scores[keep]
+            if len(others) > top_k:
+                best = np.argpartition(scores, len(scores) - top_k)[len(scores) - top_k:]
+                others, scores = others[best], scores[best]
+            order = np.argsort(-scores, kind='stable')
+            neighbours[ids[column]] = [
+                (ids[other], score) for other, score in zip(others[order].tolist(), scores[order].tolist())
+            ]
+    return neighbours
+
+
+class Recommender:
+    """Önceden hesaplanmış tarif komşularıyla kullanıcıya öneri üretir.
+
+    Kullanıcının favorileri ve puanları tohum tariflerdir; bir adayın skoru,
+    tohumların tercih ağırlığıyla çarpılmış komşu benzerliklerinin
+    toplamıdır. Kullanıcının zaten etkileşimde bulunduğu tarifler önerilmez.
+    Kişisel aday yetmezse (geçmişi olmayan kullanıcılar) liste popüler
+    tariflerle tamamlanır.
+    """
+
+    def __init__(self, neighbours=None, popular=(), build_id=None):
+        self._lock = threading.Lock()
+        self._neighbours = neighbours or {}
+        self._popular = list(popular)
+        self.build_id = build_id
+        self.ready = False
+
+    def __len__(self):
+        return len(self._neighbours)
+
+    def recommend(self, favorites=(), ratings=None, limit=20):
+        """[(tarif_id, skor, kaynak)] döndürür; kaynak 'personal' ya da 'popular'"""
+        seeds = defaultdict(float)
+        for recipe_id in favorites:
+            seeds[recipe_id] += FAVORITE_WEIGHT
+        for recipe_id, rating in (ratings or {}).items():
+            seeds[recipe_id] += rating_weight(rating)
+
+        scores = defaultdict(float)
+        with self._lock:
+            for seed, weight in seeds.items():
+                if weight:
+                    for other_id, similarity in self._neighbours.get(seed, ()):
+                        scores[other_id] += weight * similarity
+            popular = self._popular
+        seen = set(seeds)
+        best = heapq.nlargest(limit, (
+            (score, recipe_id) for recipe_id, score in scores.items() if score > 0 and recipe_id not in seen
+        ))
+        results = [(recipe_id, round(score, 4), 'personal') for score, recipe_id in best]
+        if len(results) < limit:
+            seen.update(recipe_id for recipe_id, _, _ in results)
+            for recipe_id in popular:
+                if recipe_id not in seen:
+                    results.append((recipe_id, None, 'popular'))
+                    if len(results) == limit:
+                        break
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'build_id': self.build_id,
+                'recipes': len(self._neighbours),
+                'edges': sum(len(items) for items in self._neighbours.values()),
+                'popular': len(self._popular),
+            }
@@ -0,0 +1,111 @@
+import datetime
+import decimal
+import json
+from functools import lru_cache
+from json.encoder import encode_basestring
+
+# orjson isteğe bağlıdır; kurulu değilse satırlar derlenmiş Python kodlayıcıyla yazılır
+try:
+    import orjson
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+    ORJSON_OPTIONS = 0
+
+# Sürücünün döndürdüğü JSON dışı tipler ve JSON karşılıkları
+_CONVERTERS = {
+    decimal.Decimal: float,
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+}
+
+# Derlenen satır kodlayıcısında tip başına değer ifadesi ({} sütunun r[i] ifadesidir)
+_JSON_EXPRESSIONS = {
+    int: "str({})",
+    float: "repr({})",
+    bool: "('true' if {} else 'false')",
+    str: "_string({})",
+    decimal.Decimal: "repr(float({}))",
+    datetime.datetime: "'\"' + {}.isoformat() + '\"'",
+    datetime.date: "'\"' + {}.isoformat() + '\"'",
+    datetime.time: "'\"' + {}.isoformat() + '\"'",
+}
+
+
+def json_default(obj):
+    """DECIMAL -> float, tarih/saat -> ISO 8601; diğer tipler için TypeError"""
+    convert = _CONVERTERS.get(type(obj))
+    if convert is None:
+        raise TypeError(f"{type(obj).__name__} JSON'a çevrilemez")
+    return convert(obj)
+
+
+def _encode_value(value):
+    return json.dumps(value, ensure_ascii=False, default=json_default)
+
+
+class RowPlan:
+    """`cursor.description`'dan bir kez derlenen sütun planı.
+
+    Hangi sütunların DECIMAL, tarih/saat ya da metin olduğu açıklamadan
+    bilinir; satır başına tip denetimi yapılmaz. Plan aynı sütun listesi ve
+    tipleri için önbellekten döner (`for_cursor`).
+
+    - `dicts(rows)`: satır sözlükleri; DECIMAL float'a, tarih/saat ISO 8601
+      metnine çevrilmiş olarak (JSON sağlayıcısının yazacağı değerler).
+    - `encode(rows)`: satırları sıralı anahtarlı, sıkışık JSON dizisi olarak
+      UTF-8 baytlara yazar; çıktı `FastJSONProvider`'ınkiyle aynıdır. orjson
+      varsa ona, yoksa ('json') satır demetlerinden doğrudan metin üreten
+      derlenmiş kodlayıcıya yazdırılır.
+    """
+
+    def __init__(self, columns):
+        # columns: ((ad, tip), ...); aynı ad tekrar ederse dict(zip) gibi sonuncusu geçerlidir
+        self.columns = tuple(name for name, _ in columns)
+        last = {name: index for index, (name, _) in enumerate(columns)}
+        types = [type_code for _, type_code in columns]
+        self._to_dict = self._compile_dict(last, types)
+        self._encode_row = self._compile_encoder(last, types)
+
+    @classmethod
+    def for_cursor(cls, cursor):
+        return _plan(tuple((column[0], column[1]) for column in cursor.description))
+
+    @staticmethod
+    def _compile_dict(last, types):
+        items = []
+        for name, index in last.items():
+            value = f"r[{index}]"
+            if types[index] in _CONVERTERS:
+                value = f"None if r[{index}] is None else _c{index}(r[{index}])"
+            items.append(f"{name!r}: {value}")
+        namespace = {f"_c{index}": _CONVERTERS[types[index]] for index in last.values() if types[index] in _CONVERTERS}
+        return eval("lambda r: {" + ", ".join(items) + "}", namespace)
+
+    @staticmethod
+    def _compile_encoder(last, types):
+        # Anahtarlar sağlayıcıdaki gibi sıralı yazılır
+        keys, values = [], []
+        for name in sorted(last):
+            index = last[name]
+            expression = _JSON_EXPRESSIONS.get(types[index], "_value({})").format(f"r[{index}]")
+            keys.append(encode_basestring(name).replace('%', '%%') + ":%s")
+            values.append(f"'null' if r[{index}] is None else {expression}")
+        source = "lambda r: " + repr("{" + ",".join(keys) + "}") + " % (" + "".join(v + ", " for v in values) + ")"
+        return eval(source, {'_string': encode_basestring, '_value': _encode_value})
+
+    def dicts(self, rows):
+        return list(map(self._to_dict, rows))
+
+    def encode(self, rows, backend=None):
+        if backend is None:
+            backend = 'orjson' if orjson is not None else 'json'
+        if backend == 'orjson':
+            return orjson.dumps(list(map(self._to_dict, rows)), option=ORJSON_OPTIONS)
+        return ("[" + ",".join(map(self._encode_row, rows)) + "]").encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _plan(columns):
+    return RowPlan(columns)
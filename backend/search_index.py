@@ -0,0 +1,171 @@
+import heapq
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+from turkish_text import terms
+
+# Alan ağırlıkları: başlıkta geçen terim malzemede, malzemede geçen de
+# tarifte geçenden daha önemlidir
+FIELD_WEIGHTS = {'title': 3.0, 'ingredients': 2.0, 'instructions': 1.0}
+
+
+class SearchIndex:
+    """Tarif başlığı, malzemeleri ve yapılışı üzerinde bellek içi ters indeks.
+
+    Terimler `turkish_text.terms` ile katlanır ve köklenir; skorlama alan
+    ağırlıklı BM25'tir ve görüntülenme sayısıyla harmanlanır. `search()` çok
+    terimli sorgularda 'and' (tüm terimler) ya da 'or' (herhangi biri) kipinde
+    çalışır.
+
+    Skorlar sayfalar arasında değişmesin diye harmanda canlı görüntülenme
+    sayıları değil, en çok `popularity_refresh` saniyede bir alınan kopyası
+    kullanılır. Kopya yenilendiğinde ya da tarif eklenip silindiğinde
+    `version` artar; `search_page` eski sürümle üretilmiş imleci reddeder.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, popularity_weight=0.3, popularity_refresh=300):
+        self.k1 = k1
+        self.b = b
+        self.popularity_weight = popularity_weight
+        self.popularity_refresh = popularity_refresh
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._doc_length = {}
+        self._views = {}
+        self._ranked_views = {}
+        self._total_length = 0.0
+        self._max_views = 0
+        self._ranked_at = time.monotonic()
+        self.version = 0
+        self.ready = False
+
+    def __len__(self):
+        return len(self._doc_length)
+
+    def add(self, recipe_id, title, ingredients, instructions, views=0):
+        """Tarifi indekse ekler; zaten varsa yeniden indeksler"""
+        weighted = Counter()
+        for field, text in (('title', title), ('ingredients', ingredients), ('instructions', instructions)):
+            weight = FIELD_WEIGHTS[field]
+            for term in terms(text):
+                weighted[term] += weight
+        with self._lock:
+            self._remove(recipe_id)
+            for term, tf in weighted.items():
+                self._postings[term][recipe_id] = tf
+            length = sum(weighted.values())
+            self._doc_terms[recipe_id] = tuple(weighted)
+            self._doc_length[recipe_id] = length
+            self._total_length += length
+            self._views[recipe_id] = views or 0
+            self._ranked_views[recipe_id] = views or 0
+            self._max_views = max(self._max_views, views or 0)
+            self.version += 1
+
+    def remove(self, recipe_id):
+        with self._lock:
+            self._remove(recipe_id)
+
+    def add_views(self, recipe_id, delta):
+        """Görüntülenme sayısını artırır; harmana bir sonraki kopyada yansır"""
+        with self._lock:
+            if recipe_id in self._views:
+                self._views[recipe_id] += delta
+
+    def search_page(self, query, mode='and', limit=None, after=None, version=None):
+        """`search` ile aynı sıralamada bir sayfa; ([(tarif_id, skor)], sürüm) döndürür.
+
+        `after` verildiğinde `version` imlecin üretildiği sürüm olmalıdır;
+        o zamandan beri skorlar değiştiyse sayfalar sonuç atlayıp tekrar
+        edebileceği için ValueError fırlatılır.
+        """
+        with self._lock:
+            if after is None:
+                self._refresh_popularity()
+            elif version != self.version:
+                raise ValueError("Arama sonuçları değişti, aramaya ilk sayfadan yeniden başlayın")
+            return self.search(query, mode, limit, after), self.version
+
+    def _refresh_popularity(self):
+        if time.monotonic() - self._ranked_at < self.popularity_refresh:
+            return
+        self._ranked_at = time.monotonic()
+        if self._ranked_views != self._views:
+            self._ranked_views = dict(self._views)
+            self._max_views = max(self._ranked_views.values(), default=0)
+            self.version += 1
+
+    def search(self, query, mode='and', limit=None, after=None):
+        """Sorguya uyan tarifleri skora göre sıralı [(tarif_id, skor)] olarak döndürür.
+
+        `after=(skor, tarif_id)` verilirse yalnızca o sonuçtan sonrakiler
+        döndürülür (keyset sayfalama).
+        """
+        query_terms = list(dict.fromkeys(terms(query)))
+        if not query_terms:
+            return []
+        with self._lock:
+            doc_count = len(self._doc_length)
+            if doc_count == 0:
+                return []
+            postings = [self._postings.get(term, {}) for term in query_terms]
+            if mode == 'and':
+                if any(not p for p in postings):
+                    return []
+                smallest = min(postings, key=len)
+                candidates = [doc for doc in smallest if all(doc in p for p in postings)]
+            else:
+                candidates = set()
+                for p in postings:
+                    candidates.update(p)
+
+            avg_length = self._total_length / doc_count
+            popularity_scale = math.log1p(self._max_views) or 1.0
+            idf = [math.log(1 + (doc_count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+            results = []
+            for doc in candidates:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_length[doc] / avg_length)
+                score = 0.0
+                for term_idf, p in zip(idf, postings):
+                    tf = p.get(doc)
+                    if tf:
+                        score += term_idf * tf * (self.k1 + 1) / (tf + norm)
+                popularity = math.log1p(self._ranked_views.get(doc, 0)) / popularity_scale
+                results.append((round(score * (1 + self.popularity_weight * popularity), 6), doc))
+
+        if after is not None:
+            after_score, after_id = after
+            results = [r for r in results if r[0] < after_score or (r[0] == after_score and r[1] > after_id)]
+        rank = lambda item: (-item[0], item[1])
+        if limit is not None and limit < len(results):
+            results = heapq.nsmallest(limit, results, key=rank)
+        else:
+            results.sort(key=rank)
+        return [(doc, score) for score, doc in results]
+
+    def _remove(self, recipe_id):
+        old_terms = self._doc_terms.pop(recipe_id, None)
+        if old_terms is None:
+            return
+        for term in old_terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(recipe_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_length -= self._doc_length.pop(recipe_id)
+        self._views.pop(recipe_id, None)
+        self._ranked_views.pop(recipe_id, None)
+        self.version += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'documents': len(self._doc_length),
+                'terms': len(self._postings),
+                'version': self.version,
+            }
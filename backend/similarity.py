@@ -0,0 +1,219 @@
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+
+# NumPy/SciPy isteğe bağlıdır; kurulu değilse benzerlikler saf Python ile hesaplanır
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+from ingredient_index import ingredient_name, split_ingredients
+from turkish_text import fold
+
+
+def ingredient_features(ingredients):
+    """Tarifin katlanmış malzeme adları ("2 su bardağı Un" -> "un")"""
+    return {fold(name) for name in map(ingredient_name, split_ingredients(ingredients)) if name}
+
+
+class SimilarityIndex:
+    """Malzemelerine göre her tarifin en benzer `top_n` tarifi.
+
+    Her tarif, malzeme adları üzerinde TF-IDF ağırlıklı ve L2 normalize
+    edilmiş seyrek bir vektördür; benzerlik vektörlerin kosinüsüdür. Tariflerin
+    `max_df` oranından fazlasında geçen malzemeler (tuz, su) katalog en az
+    `min_docs_for_max_df` tarifse benzerliğe katılmaz.
+
+    NumPy/SciPy kuruluysa komşular X[blok] @ X.T seyrek çarpımıyla bulunur;
+    blok satır sayısı, üretilen yoğun skor matrisi `chunk_bytes`'ı aşmayacak
+    şekilde katalog boyutuna göre seçilir. Kurulu değilse aynı skorlar
+    malzeme -> tarif ters listeleri üzerinden hesaplanır.
+
+    `add()` yeni tarifin komşularını tam yeniden kurulum yapmadan hesaplar ve
+    yeni tarifi, listesine girecek kadar benzer olduğu tariflerin komşularına
+    ekler. IDF ağırlıkları bir sonraki tam kurulumda güncellenir.
+
+    `backend` verilmezse NumPy/SciPy varsa 'numpy', yoksa 'python' kullanılır.
+    """
+
+    def __init__(self, top_n=10, max_df=0.5, min_docs_for_max_df=100, chunk_bytes=64 * 2 ** 20, backend=None):
+        self.top_n = top_n
+        self.max_df = max_df
+        self.min_docs_for_max_df = min_docs_for_max_df
+        self.chunk_bytes = chunk_bytes
+        if backend is None:
+            backend = 'numpy' if np is not None else 'python'
+        if backend == 'numpy' and np is None:
+            raise ValueError("numpy yolu için numpy ve scipy kurulu olmalı")
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._neighbours = {}
+        self._idf = {}
+        self._common = set()
+        self._doc_count = 0
+        self._ids = []
+        self._columns = {}
+        self._matrix = None
+        self._postings = defaultdict(list)
+        self.ready = False
+
+    def __len__(self):
+        return len(self._neighbours)
+
+    def __contains__(self, recipe_id):
+        return recipe_id in self._neighbours
+
+    def build(self, recipes):
+        """[(tarif_id, malzemeler)] listesinden tüm komşulukları baştan hesaplar"""
+        docs = [(recipe_id, ingredient_features(ingredients)) for recipe_id, ingredients in recipes]
+        doc_count = len(docs)
+        df = Counter(feature for _, features in docs for feature in features)
+        max_df = self.max_df * doc_count if doc_count >= self.min_docs_for_max_df else doc_count
+        idf = {
+            feature: math.log((1 + doc_count) / (1 + count)) + 1
+            for feature, count in df.items() if count <= max_df
+        }
+        common = set(df) - set(idf)
+        ids = [recipe_id for recipe_id, _ in docs]
+        vectors = [self._vector(features, idf, common, doc_count) for _, features in docs]
+
+        postings = defaultdict(list)
+        if self.backend == 'numpy':
+            columns, matrix = self._build_matrix(vectors, idf)
+            neighbours = self._matrix_neighbours(ids, matrix)
+        else:
+            columns, matrix = {}, None
+            for recipe_id, vector in zip(ids, vectors):
+                for feature, weight in vector.items():
+                    postings[feature].append((recipe_id, weight))
+            neighbours = {
+                recipe_id: self._top(self._posting_scores(vector, postings), recipe_id)
+                for recipe_id, vector in zip(ids, vectors)
+            }
+
+        with self._lock:
+            self._ids, self._idf, self._common, self._doc_count = ids, idf, common, doc_count
+            self._columns, self._matrix, self._postings = columns, matrix, postings
+            self._neighbours = neighbours
+
+    def add(self, recipe_id, ingredients):
+        """Yeni bir tarifin komşularını hesaplar ve diğer tariflerin listelerini günceller"""
+        features = ingredient_features(ingredients)
+        with self._lock:
+            if recipe_id in self._neighbours:
+                return
+            vector = self._vector(features, self._idf, self._common, self._doc_count)
+            # Kurulumdan sonra eklenen tarifler ters listelerde, kurulumdakiler matriste
+            scores = self._posting_scores(vector, self._postings)
+            if self._matrix is not None:
+                for row, score in self._matrix_scores(vector):
+                    scores[self._ids[row]] += score
+            for feature, weight in vector.items():
+                self._postings[feature].append((recipe_id, weight))
+            self._neighbours[recipe_id] = self._top(scores, recipe_id)
+            for other_id, score in scores.items():
+                self._offer(other_id, recipe_id, score)
+
+    def similar(self, recipe_id, limit=None):
+        """Tarifin komşuları [(tarif_id, benzerlik)]; tarif indekste yoksa None"""
+        with self._lock:
+            neighbours = self._neighbours.get(recipe_id)
+            if neighbours is None:
+                return None
+            return [(other_id, round(score, 4)) for score, other_id in neighbours[:limit or self.top_n]]
+
+    @staticmethod
+    def _vector(features, idf, common, doc_count):
+        # Kurulumda görülmemiş malzemeler tek tarifte geçiyormuş gibi ağırlıklandırılır
+        unseen = math.log((1 + doc_count) / 2) + 1
+        weights = {feature: idf.get(feature, unseen) for feature in features if feature not in common}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {feature: weight / norm for feature, weight in weights.items()}
+
+    def _top(self, scores, recipe_id):
+        return heapq.nlargest(
+            self.top_n, ((score, other_id) for other_id, score in scores.items()
+                         if score > 0 and other_id != recipe_id))
+
+    def _offer(self, recipe_id, other_id, score):
+        neighbours = self._neighbours.get(recipe_id)
+        if neighbours is None or score <= 0:
+            return
+        if len(neighbours) < self.top_n or score > neighbours[-1][0]:
+            neighbours = sorted(neighbours + [(score, other_id)], reverse=True)
+            self._neighbours[recipe_id] = neighbours[:self.top_n]
+
+    @staticmethod
+    def _posting_scores(vector, postings):
+        scores = defaultdict(float)
+        for feature, weight in vector.items():
+            for other_id, other_weight in postings.get(feature, ()):
+                scores[other_id] += weight * other_weight
+        return scores
+
+    def _matrix_scores(self, vector):
+        """Vektörün kurulum matrisindeki satırlarla pozitif kosinüsleri: [(satır, skor)]"""
+        known = [(self._columns[f], w) for f, w in vector.items() if f in self._columns]
+        if not known:
+            return []
+        query = np.zeros(len(self._columns), dtype=np.float32)
+        for column, weight in known:
+            query[column] = weight
+        product = self._matrix @ query
+        rows = np.flatnonzero(product > 0)
+        return zip(rows.tolist(), product[rows].tolist())
+
+    @staticmethod
+    def _build_matrix(vectors, idf):
+        columns = {feature: index for index, feature in enumerate(idf)}
+        rows, cols, data = [], [], []
+        for row, vector in enumerate(vectors):
+            for feature, weight in vector.items():
+                rows.append(row)
+                cols.append(columns[feature])
+                data.append(weight)
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), (np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32))),
+            shape=(len(vectors), len(columns)))
+        return columns, matrix
+
+    def _matrix_neighbours(self, ids, matrix):
+        """Satır blokları hâlinde her satırın en benzer `top_n` satırını bulur"""
+        count = len(ids)
+        k = min(self.top_n, count - 1)
+        if k <= 0:
+            return {recipe_id: [] for recipe_id in ids}
+        neighbours = {}
+        transposed = matrix.T.tocsr()
+        # Hücre başına float32 skor ve argpartition'ın int64 indeksi
+        chunk = max(1, self.chunk_bytes // (12 * count))
+        for start in range(0, count, chunk):
+            end = min(start + chunk, count)
+            scores = matrix[start:end].toarray() @ transposed
+            scores[np.arange(end - start), np.arange(start, end)] = 0
+            best = np.argpartition(scores, count - k, axis=1)[:, count - k:]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            del scores
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            best = np.take_along_axis(best, order, axis=1).tolist()
+            best_scores = np.take_along_axis(best_scores, order, axis=1).tolist()
+            for offset in range(end - start):
+                neighbours[ids[start + offset]] = [
+                    (score, ids[column])
+                    for column, score in zip(best[offset], best_scores[offset]) if score > 0
+                ]
+        return neighbours
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'backend': self.backend,
+                'recipes': len(self._neighbours),
+                'features': len(self._idf),
+                'top_n': self.top_n,
+            }
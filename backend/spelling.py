@@ -0,0 +1,158 @@
+import re
+import threading
+from collections import Counter, defaultdict
+
+from turkish_text import STOP_WORDS, fold, lower
+
+_WORD_RE = re.compile(r'[^\W\d_]+', re.UNICODE)
+
+
+def max_distance_for(word):
+    """Kelime uzunluğuna göre izin verilen en fazla düzeltme (kısa kelimelerde daha az)"""
+    if len(word) <= 2:
+        return 0
+    if len(word) <= 4:
+        return 1
+    return 2
+
+
+def edit_distance(a, b, limit):
+    """Sınırlı Damerau-Levenshtein (OSA) uzaklığı; `limit`'i aşarsa limit + 1 döner"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+def _deletes(word, distance):
+    """Kelimeden en fazla `distance` harf silinerek elde edilen tüm varyantlar (kendisi dahil)"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - variants
+        variants |= frontier
+    return variants
+
+
+class SpellIndex:
+    """Simetrik silme (SymSpell) yöntemiyle yazım düzeltme sözlüğü.
+
+    Sözlükteki her kelimenin ilk `prefix_length` harfinden en fazla
+    `max_distance` harf silinerek üretilen varyantlar kelimeye bağlanır.
+    Sorguda yalnızca yanlış yazılmış kelimenin varyantlarına sözlükte
+    bakılır ve bulunan adaylar gerçek uzaklıkla doğrulanır; katalog ya da
+    sözlük taranmaz.
+
+    Kelimeler `fold` ile katlanmış hâlde saklanır; öneriler kullanıcıya en
+    sık görülen aksanlı yazımla gösterilir ("corbsi" -> "çorbası").
+    """
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._surfaces = defaultdict(Counter)
+        self._deletes = defaultdict(set)
+        self.ready = False
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, word):
+        return fold(word) in self._counts
+
+    def items(self):
+        """Sözlükteki (katlanmış kelime, sıklık) çiftleri"""
+        with self._lock:
+            return list(self._counts.items())
+
+    def add_text(self, text):
+        """Metindeki kelimeleri sözlüğe ekler"""
+        for surface, count in Counter(_WORD_RE.findall(lower(text))).items():
+            self.add_word(surface, count)
+
+    def add_word(self, surface, count=1):
+        word = fold(surface)
+        if len(word) < 2:
+            return
+        with self._lock:
+            if word not in self._counts:
+                for variant in _deletes(word[:self.prefix_length], self.max_distance):
+                    self._deletes[variant].add(word)
+            self._counts[word] += count
+            surfaces = self._surfaces[word]
+            if surface in surfaces or len(surfaces) < 4:
+                surfaces[surface] += count
+
+    def lookup(self, word, max_distance=None, limit=5):
+        """Kelimeye en yakın sözlük kelimeleri: [(kelime, uzaklık, sıklık)].
+
+        Sonuçlar önce uzaklığa, sonra sıklığa göre sıralanır.
+        """
+        word = fold(word)
+        if max_distance is None:
+            max_distance = min(self.max_distance, max_distance_for(word))
+        with self._lock:
+            if word in self._counts and max_distance == 0:
+                return [(word, 0, self._counts[word])]
+            candidates = set()
+            for variant in _deletes(word[:self.prefix_length], max_distance):
+                candidates.update(self._deletes.get(variant, ()))
+            counts = {candidate: self._counts[candidate] for candidate in candidates}
+        results = []
+        for candidate, count in counts.items():
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                results.append((candidate, distance, count))
+        results.sort(key=lambda item: (item[1], -item[2], item[0]))
+        return results[:limit]
+
+    def display(self, word):
+        """Katlanmış kelimenin en sık görülen yazımı"""
+        with self._lock:
+            surfaces = self._surfaces.get(word)
+            return surfaces.most_common(1)[0][0] if surfaces else word
+
+    def correct(self, text):
+        """Sözlükte olmayan kelimeleri en yakın sözlük kelimesiyle değiştirir.
+
+        Düzeltilmiş metni döndürür; düzeltilecek kelime yoksa None döner.
+        """
+        corrected = []
+        changed = False
+        for token in lower(text).split():
+            word = fold(token)
+            if not _WORD_RE.fullmatch(token) or word in STOP_WORDS or word in self._counts:
+                corrected.append(token)
+                continue
+            matches = self.lookup(word, limit=1)
+            if matches:
+                corrected.append(self.display(matches[0][0]))
+                changed = True
+            else:
+                corrected.append(token)
+        return ' '.join(corrected) if changed else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'words': len(self._counts),
+                'delete_variants': len(self._deletes),
+            }
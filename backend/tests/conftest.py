@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller backend dizininden düz import edilir (bkz. app.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+
+pyodbc = pytest.importorskip('pyodbc')
+
+from connection_pool import ConnectionPool, PoolTimeoutError  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *params):
+        if self.conn.dead:
+            raise pyodbc.Error('bağlantı koptu')
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.dead = False
+        self.closed = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        created.append(FakeConnection())
+        return created[-1]
+
+    kwargs.setdefault('min_size', 1)
+    kwargs.setdefault('max_size', 2)
+    return ConnectionPool('', connect=connect, **kwargs), created
+
+
+def test_commit_and_reuse():
+    pool, created = make_pool()
+    with pool.connection() as conn:
+        pass
+    with pool.connection() as again:
+        assert again is conn
+    assert conn.commits == 2 and len(created) == 1
+
+
+def test_rollback_on_error_and_nested_blocks():
+    pool, created = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                assert inner is outer
+            raise RuntimeError
+    assert outer.rollbacks == 1 and outer.commits == 0
+    assert pool.stats()['in_use'] == 0
+
+
+def test_operational_error_discards_connection():
+    pool, created = make_pool()
+    with pytest.raises(pyodbc.OperationalError):
+        with pool.connection():
+            raise pyodbc.OperationalError('ağ hatası')
+    assert created[0].closed and pool.stats()['size'] == 0
+
+
+def test_timeout_when_exhausted():
+    pool, _ = make_pool(max_size=1, timeout=0.05)
+    entry = pool.acquire()
+    errors = []
+
+    def other_thread():
+        try:
+            pool.acquire()
+        except PoolTimeoutError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join(5)
+    pool.release(entry)
+    assert errors and pool.stats()['timeouts'] == 1
+
+
+def test_idle_connection_is_validated():
+    pool, created = make_pool(validate_idle_after=0)
+    pool.warm()
+    created[0].dead = True
+    with pool.connection() as conn:
+        assert conn is created[1]
+    assert pool.stats()['validation_failures'] == 1
+
+
+def test_max_lifetime_recycles():
+    pool, created = make_pool(max_lifetime=0)
+    with pool.connection():
+        pass
+    assert created[0].closed and pool.stats()['recycled'] == 1
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        ConnectionPool('', min_size=3, max_size=2)
@@ -0,0 +1,57 @@
+from ingredient_index import IngredientIndex, ingredient_name, split_ingredients
+
+
+def test_split_ingredients():
+    assert split_ingredients("2 adet domates\n- 1 su bardağı un, tuz;\n\n") == [
+        '2 adet domates', '1 su bardağı un', 'tuz']
+    assert split_ingredients(None) == []
+
+
+def test_ingredient_name():
+    assert ingredient_name('2 su bardağı Un') == 'un'
+    assert ingredient_name('1 adet kuru soğan (doğranmış)') == 'kuru soğan'
+    assert ingredient_name('1 su bardağı su') == 'su'
+    assert ingredient_name('2 adet') == ''
+
+
+def build():
+    index = IngredientIndex()
+    index.add(1, "2 domates\n1 soğan\nzeytinyağı", tags=[('category', 1)], views=10,
+              values={'cooking_minutes': 20})
+    index.add(2, "2 domates\n1 soğan", tags=[('category', 1)], views=5, values={'cooking_minutes': 45})
+    index.add(3, "un\nşeker\nyumurta\nsüt", tags=[('category', 4)], views=50, values={'cooking_minutes': 40})
+    return index
+
+
+def test_suggest_orders_by_matches_then_missing_then_views():
+    index = build()
+    results = index.suggest(['domates', 'soğan'])
+    assert [recipe_id for recipe_id, *_ in results] == [2, 1]
+    recipe_id, matched, unmatched, missing = results[1]
+    assert matched == ['domates', 'soğan'] and unmatched == [] and missing == ['zeytinyağı']
+
+
+def test_suggest_filters_and_ranges():
+    index = build()
+    assert index.suggest(['domates'], filters=[('category', 4)]) == []
+    results = index.suggest(['domates'], ranges=[('cooking_minutes', None, 30)])
+    assert [recipe_id for recipe_id, *_ in results] == [1]
+    assert index.suggest([]) == []
+
+
+def test_line_lengths_follow_updates():
+    index = build()
+    assert index._lengths == [2, 3, 4]
+    index.remove(3)
+    assert index._lengths == [2, 3]
+    index.add(1, "domates")
+    assert index._lengths == [1, 2]
+    assert [recipe_id for recipe_id, *_ in index.suggest(['domates'])] == [1, 2]
+
+
+def test_facet_counts():
+    index = build()
+    facets = {'tur': {'ana': ([('category', 1)], ()), 'tatli': ([('category', 4)], ())}}
+    total, counts = index.facet_counts(['domates'], facets, {'tur': 'ana'})
+    assert total == 2
+    assert counts == {'tur': {'ana': 2, 'tatli': 0}}
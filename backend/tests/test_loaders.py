@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from loaders import BatchLoader
+
+
+class Source:
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def __call__(self, keys):
+        self.calls.append(sorted(keys))
+        if self.gate is not None:
+            self.gate.wait(5)
+        return {key: {'id': key} for key in keys if key != 404}
+
+
+def test_deferred_keys_share_one_query():
+    source = Source()
+    loader = BatchLoader(source)
+    first, second = loader.defer(1), loader.defer('2')
+    assert first.get() == {'id': 1}
+    assert second.get() == {'id': 2}
+    assert loader.load(1) == {'id': 1}
+    assert source.calls == [[1, 2]]
+
+
+def test_load_many_keeps_order_and_missing_keys():
+    source = Source()
+    loader = BatchLoader(source, max_batch=2)
+    assert loader.load_many([3, 404, 1]) == [{'id': 3}, None, {'id': 1}]
+    assert source.calls == [[3, 404], [1]]
+
+
+def test_prime_and_clear():
+    source = Source()
+    loader = BatchLoader(source)
+    loader.prime(5, {'id': 5, 'cached': True})
+    assert loader.load(5)['cached']
+    loader.clear(5)
+    assert loader.load(5) == {'id': 5}
+    assert source.calls == [[5]]
+
+
+def test_concurrent_loads_wait_for_running_query():
+    gate = threading.Event()
+    source = Source(gate)
+    loader = BatchLoader(source)
+    results = {}
+
+    def load(name, key):
+        results[name] = loader.load(key)
+
+    first = threading.Thread(target=load, args=('first', 7))
+    first.start()
+    while not source.calls:
+        pass
+    second = threading.Thread(target=load, args=('second', 7))
+    second.start()
+    gate.set()
+    first.join(5)
+    second.join(5)
+    assert results == {'first': {'id': 7}, 'second': {'id': 7}}
+    assert source.calls == [[7]]
+
+
+def test_failed_query_is_retried_by_next_caller():
+    attempts = []
+
+    def flaky(keys):
+        attempts.append(list(keys))
+        if len(attempts) == 1:
+            raise RuntimeError('bağlantı koptu')
+        return {key: key for key in keys}
+
+    loader = BatchLoader(flaky)
+    with pytest.raises(RuntimeError):
+        loader.load(1)
+    assert loader.load(1) == 1
+    assert attempts == [[1], [1]]
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from pagination import (KeysetOrder, Page, decode_cursor, decode_sync_token, encode_cursor,
+                        encode_sync_token, parse_page_args)
+
+
+def test_cursor_round_trip():
+    values = [12, 'çorba', 1.5, datetime(2024, 5, 1, 12, 30)]
+    token = encode_cursor(values)
+    assert '=' not in token
+    assert decode_cursor(token) == values
+
+
+@pytest.mark.parametrize('token', ['', '!!!', encode_cursor([1])[:-2] + '{', 'eyJhIjoxfQ'])
+def test_bad_cursor(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_sync_token():
+    issued = datetime(2024, 5, 1)
+    assert decode_sync_token(encode_sync_token(123, issued)) == (123, issued)
+    with pytest.raises(ValueError):
+        decode_sync_token(encode_cursor([1, 2]))
+
+
+def test_parse_page_args():
+    assert parse_page_args({}) == (None, None)
+    assert parse_page_args({'limit': '5'}) == (5, None)
+    assert parse_page_args({'limit': '1000'}) == (100, None)
+    assert parse_page_args({'cursor': encode_cursor([3, 7])}) == (20, [3, 7])
+    for limit in ('0', 'x'):
+        with pytest.raises(ValueError):
+            parse_page_args({'limit': limit})
+
+
+def test_keyset_where_and_paginate():
+    order = KeysetOrder(('r.[views]', 'DESC', 'views'), ('r.[id]', 'ASC', 'id'))
+    assert order.order_by() == 'ORDER BY r.[views] DESC, r.[id] ASC'
+    where, params = order.where([50, 9])
+    assert where == '((r.[views] < ?) OR (r.[views] = ? AND r.[id] > ?))'
+    assert params == [50, 50, 9]
+    with pytest.raises(ValueError):
+        order.where([1])
+
+    rows = [{'id': i, 'views': 100 - i} for i in range(4)]
+    page = order.paginate(rows, 3)
+    assert isinstance(page, Page) and len(page) == 3
+    assert decode_cursor(page.next_cursor) == [98, 2]
+    assert order.paginate(rows, 4).next_cursor is None
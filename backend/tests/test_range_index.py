@@ -0,0 +1,25 @@
+from range_index import RangeIndex
+
+
+def test_between_is_inclusive_and_open_ended():
+    index = RangeIndex()
+    for key, value in {1: 10, 2: 30, 3: 45, 4: 60, 5: None}.items():
+        index.add(key, value)
+    assert len(index) == 4
+    assert index.between(30, 60) == [2, 3, 4]
+    assert index.between(None, 29) == [1]
+    assert index.between(61, None) == []
+    assert index.between() == [1, 2, 3, 4]
+
+
+def test_updates_after_first_query():
+    index = RangeIndex()
+    index.add(1, 10)
+    index.add(2, 20)
+    assert index.between(15, None) == [2]
+    index.add(1, 25)
+    index.add(3, 5)
+    index.remove(2)
+    index.add(4, None)
+    assert index.between() == [3, 1]
+    assert index.between(15, None) == [1]
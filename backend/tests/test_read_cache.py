@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from pagination import Page
+from read_cache import ReadCache
+
+
+def test_hit_returns_copy():
+    cache = ReadCache()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return Page([{'id': 1}], 'imlec')
+
+    first = cache.get_or_load('k', ('Recipe',), load)
+    first[0]['id'] = 99
+    second = cache.get_or_load('k', ('Recipe',), load)
+    assert second == [{'id': 1}] and second.next_cursor == 'imlec'
+    assert len(calls) == 1
+
+
+def test_bump_invalidates_scope():
+    cache = ReadCache()
+    value = [1]
+    load = lambda: value[0]
+    assert cache.get_or_load('k', (('Recipe', 1),), load) == 1
+    value[0] = 2
+    cache.bump(('Recipe', 2))
+    assert cache.get_or_load('k', (('Recipe', 1),), load) == 1
+    cache.bump(('Recipe', 1))
+    assert cache.get_or_load('k', (('Recipe', 1),), load) == 2
+
+
+def test_ttl_and_lru():
+    cache = ReadCache(max_entries=2)
+    cache.get_or_load('a', (), lambda: 'a', ttl=0)
+    assert cache.get_or_load('a', (), lambda: 'yeni') == 'yeni'
+    cache.get_or_load('b', (), lambda: 'b')
+    cache.get_or_load('c', (), lambda: 'c')
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1 and stats['expirations'] == 1
+
+
+def test_errors_are_not_cached():
+    cache = ReadCache()
+
+    def fail():
+        raise RuntimeError('veritabanı yok')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load('k', (), fail)
+    assert cache.get_or_load('k', (), lambda: 'tamam') == 'tamam'
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ReadCache()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'id': 1}
+
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load('k', (), slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(cache.get_or_load('k', (), slow)))
+    follower.start()
+    while cache.stats()['coalesced'] == 0:
+        pass
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == [{'id': 1}, {'id': 1}] and len(calls) == 1
+
+
+def test_write_during_load_is_not_stored():
+    cache = ReadCache()
+
+    def load():
+        cache.bump('Recipe')
+        return 'eski'
+
+    assert cache.get_or_load('k', ('Recipe',), load) == 'eski'
+    assert cache.get_or_load('k', ('Recipe',), lambda: 'yeni') == 'yeni'
@@ -0,0 +1,62 @@
+import pytest
+
+from recipe_attributes import parse_minutes, parse_recipe_attributes, parse_servings
+
+
+@pytest.mark.parametrize('text, minutes', [
+    ('45', 45),
+    ('45 dk', 45),
+    ('1 saat 15 dakika', 75),
+    ('1,5 saat', 90),
+    ('yarım saat', 30),
+    ('YARIM SAAT', 30),
+    ('çeyrek saat', 15),
+    ('1/2 saat', 30),
+    ('1 1/2 saat', 90),
+    ('3/4 saat', 45),
+    ('20-30 dk', 30),
+    ('20 ile 30 dakika', 30),
+    ('20/30 dk', 30),
+    ('3 kişilik 20 dakika', 20),
+    ('20 dakikalık', 20),
+    ('30 dakikada', 30),
+    ('30 dk.', 30),
+    ('1 saatlik', 60),
+    ('yaklaşık 1 saati', 60),
+    ('1 sa 10 dk', 70),
+    ('90 saniye', 2),
+])
+def test_parse_minutes(text, minutes):
+    assert parse_minutes(text) == minutes
+
+
+@pytest.mark.parametrize('text', ['', '   ', 'biraz', 'kişilik', '4-6 kişiliktir'])
+def test_parse_minutes_unknown(text):
+    assert parse_minutes(text) is None
+
+
+@pytest.mark.parametrize('text, servings', [
+    ('4 kişilik', (4, 4)),
+    ('3-4 kişilik', (3, 4)),
+    ('4-3 kişilik', (3, 4)),
+    ('6+', (6, None)),
+    ('6 ve üzeri', (6, None)),
+    ('6 kişilik ve üzeri', (6, None)),
+    ('6 kişi ve üzeri', (6, None)),
+    ('6+ kişilik', (6, None)),
+    ('6 kişiden fazla', (6, None)),
+    ('4-6 kişiliktir', (4, 6)),
+    ('', (None, None)),
+    ('bol', (None, None)),
+])
+def test_parse_servings(text, servings):
+    assert parse_servings(text) == servings
+
+
+def test_parse_recipe_attributes():
+    assert parse_recipe_attributes('1/2 saat', '1 saat', '2-3 kişilik') == {
+        'preparation_minutes': 30,
+        'cooking_minutes': 60,
+        'servings_min': 2,
+        'servings_max': 3,
+    }
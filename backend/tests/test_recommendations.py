@@ -0,0 +1,39 @@
+import pytest
+
+from recommendations import Recommender, interaction_values, item_neighbours, np, rating_weight
+
+BACKENDS = ['python'] + (['numpy'] if np is not None else [])
+
+FAVORITES = [(1, 10), (1, 11), (2, 10), (2, 11), (3, 10), (3, 12), (4, 12), (4, 13)]
+RATINGS = [(5, 10, 5), (5, 11, 4), (6, 13, 1)]
+
+
+def test_interaction_values():
+    values = interaction_values([(1, 10)], [(1, 10, 4), (1, 11, 5), (2, 12, 2)])
+    assert values == {(1, 10): 1.0, (1, 11): 1.0}
+    assert [rating_weight(r) for r in (5, 4, 3, 1)] == [1.0, 0.5, 0.0, -1.0]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_item_neighbours(backend):
+    neighbours = item_neighbours(interaction_values(FAVORITES, RATINGS), min_common=2, backend=backend)
+    assert [other for other, _ in neighbours[10]] == [11]
+    assert neighbours[13] == []
+
+
+@pytest.mark.skipif(np is None, reason="numpy/scipy kurulu değil")
+def test_backends_agree():
+    values = interaction_values(FAVORITES, RATINGS)
+    python = item_neighbours(values, min_common=1, backend='python')
+    matrix = item_neighbours(values, min_common=1, backend='numpy')
+    assert python.keys() == matrix.keys()
+    for recipe_id, expected in python.items():
+        assert [other for other, _ in matrix[recipe_id]] == [other for other, _ in expected]
+        assert [s for _, s in matrix[recipe_id]] == pytest.approx([s for _, s in expected], abs=1e-4)
+
+
+def test_recommend_personal_then_popular():
+    recommender = Recommender({10: [(11, 0.9), (12, 0.4)], 12: [(13, 0.8)]}, popular=[10, 14, 15])
+    results = recommender.recommend(favorites=[10], ratings={12: 1}, limit=3)
+    assert results == [(11, 0.9, 'personal'), (14, None, 'popular'), (15, None, 'popular')]
+    assert [r[2] for r in recommender.recommend(limit=2)] == ['popular', 'popular']
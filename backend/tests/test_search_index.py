@@ -0,0 +1,71 @@
+import pytest
+
+from search_index import SearchIndex
+
+
+def build(**kwargs):
+    index = SearchIndex(**kwargs)
+    index.add(1, 'Mercimek Çorbası', 'kırmızı mercimek, soğan', 'Kaynatın', views=10)
+    index.add(2, 'Domates Çorbası', 'domates, un', 'Kaynatın', views=500)
+    index.add(3, 'Mercimek Köftesi', 'mercimek, bulgur', 'Yoğurun', views=0)
+    return index
+
+
+def test_and_or_modes():
+    index = build()
+    assert {doc for doc, _ in index.search('mercimek çorbası')} == {1}
+    assert {doc for doc, _ in index.search('mercimek çorbası', mode='or')} == {1, 2, 3}
+    assert index.search('') == []
+    assert index.search('pizza') == []
+
+
+def test_title_outweighs_instructions():
+    index = SearchIndex(popularity_weight=0)
+    index.add(1, 'Kek', 'un', 'Fırında pişirin')
+    index.add(2, 'Fırın Makarna', 'makarna', 'Haşlayın')
+    assert [doc for doc, _ in index.search('fırın')] == [2, 1]
+
+
+def test_keyset_pages_cover_all_results():
+    index = build()
+    everything = index.search('mercimek çorbası', mode='or')
+    pages, after = [], None
+    while True:
+        page = index.search('mercimek çorbası', mode='or', limit=1, after=after)
+        if not page:
+            break
+        pages.extend(page)
+        after = (page[-1][1], page[-1][0])
+    assert pages == everything
+
+
+def test_live_views_do_not_reorder_pages():
+    index = build()
+    first, version = index.search_page('mercimek', limit=1)
+    assert first[0][0] == 1
+    index.add_views(3, 10 ** 6)
+    rest, same = index.search_page('mercimek', limit=5, after=(first[0][1], first[0][0]), version=version)
+    assert same == version
+    assert [doc for doc, _ in rest] == [3]
+
+
+def test_stale_cursor_is_rejected():
+    index = build(popularity_refresh=0)
+    hits, version = index.search_page('mercimek', limit=1)
+    index.add_views(3, 10 ** 6)
+    # Yeni ilk sayfa kopyayı yeniler ve sürümü artırır
+    hits, newer = index.search_page('mercimek', limit=1)
+    assert newer != version and hits[0][0] == 3
+    with pytest.raises(ValueError):
+        index.search_page('mercimek', limit=1, after=(hits[0][1], hits[0][0]), version=version)
+
+
+def test_remove_and_reindex():
+    index = build()
+    version = index.version
+    index.remove(1)
+    assert index.version > version
+    assert {doc for doc, _ in index.search('mercimek')} == {3}
+    index.add(3, 'Bulgur Köftesi', 'bulgur', 'Yoğurun')
+    assert index.search('mercimek') == []
+    assert len(index) == 2
@@ -0,0 +1,47 @@
+import pytest
+
+from similarity import SimilarityIndex, ingredient_features, np
+
+BACKENDS = ['python'] + (['numpy'] if np is not None else [])
+
+RECIPES = [
+    (1, "2 domates\n1 soğan\n1 biber\nzeytinyağı"),
+    (2, "3 domates\n1 soğan\n2 biber"),
+    (3, "1 su bardağı un\n2 yumurta\nşeker"),
+    (4, "un\nyumurta\nsüt\nşeker"),
+    (5, "kıyma\nsoğan\ndomates"),
+]
+
+
+def test_ingredient_features():
+    assert ingredient_features("2 su bardağı Un\n1 adet kuru soğan (doğranmış)") == {'un', 'kuru sogan'}
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_nearest_neighbours(backend):
+    index = SimilarityIndex(top_n=2, backend=backend)
+    index.build(RECIPES)
+    assert index.similar(1)[0][0] == 2
+    assert index.similar(3)[0][0] == 4
+    assert all(0 < score <= 1 for _, score in index.similar(1))
+    assert index.similar(99) is None
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_add_updates_existing_lists(backend):
+    index = SimilarityIndex(top_n=2, backend=backend)
+    index.build(RECIPES)
+    index.add(6, "un\nyumurta\nsüt\nşeker\nvanilya")
+    assert 6 in index
+    assert index.similar(6)[0][0] == 4
+    assert 6 in [other for other, _ in index.similar(4)]
+
+
+@pytest.mark.skipif(np is None, reason="numpy/scipy kurulu değil")
+def test_backends_agree():
+    results = []
+    for backend in ('python', 'numpy'):
+        index = SimilarityIndex(top_n=3, backend=backend)
+        index.build(RECIPES)
+        results.append({recipe_id: index.similar(recipe_id) for recipe_id, _ in RECIPES})
+    assert results[0] == results[1]
@@ -0,0 +1,34 @@
+from spelling import SpellIndex, edit_distance, max_distance_for
+
+
+def test_edit_distance():
+    assert edit_distance('corba', 'corba', 2) == 0
+    assert edit_distance('corba', 'crba', 2) == 1
+    # Yer değiştirme tek işlemdir
+    assert edit_distance('corba', 'cobra', 2) == 1
+    assert edit_distance('corba', 'pilav', 2) == 3
+
+
+def test_max_distance_for():
+    assert [max_distance_for(w) for w in ('un', 'tuz', 'biber', 'mercimek')] == [0, 1, 2, 2]
+
+
+def build():
+    index = SpellIndex()
+    index.add_text('Mercimek Çorbası')
+    index.add_text('Domates çorbası ve mercimek köftesi')
+    return index
+
+
+def test_lookup_prefers_distance_then_frequency():
+    index = build()
+    assert index.lookup('corbsi')[0][:2] == ('corbasi', 1)
+    assert index.lookup('mercmek')[0][:2] == ('mercimek', 1)
+    assert index.lookup('xyzxyz') == []
+
+
+def test_correct_uses_accented_spelling():
+    index = build()
+    assert index.correct('mercimek corbsi') == 'mercimek çorbası'
+    assert index.correct('mercimek çorbası') is None
+    assert 'CORBASI' in index and len(index) == 5
@@ -0,0 +1,37 @@
+import pytest
+
+from turkish_text import fold, lower, stem, terms, tokenize
+
+
+def test_lower_handles_dotted_and_dotless_i():
+    assert lower('IŞIK') == 'ışık'
+    assert lower('İÇLİ KÖFTE') == 'içli köfte'
+    assert lower(None) == ''
+
+
+def test_fold_removes_accents():
+    assert fold('İÇLİ KÖFTE') == 'icli kofte'
+    assert fold('Şekerpare Ğ Ü') == 'sekerpare g u'
+
+
+def test_tokenize():
+    assert tokenize('Fırında Tavuk, 2 kişilik!') == ['firinda', 'tavuk', '2', 'kisilik']
+
+
+@pytest.mark.parametrize('words', [
+    ('çorba', 'çorbası', 'çorbaları'),
+    ('köfte', 'köfteler', 'köftesi'),
+    ('mercimek', 'mercimekli', 'mercimekten'),
+])
+def test_inflections_share_a_stem(words):
+    assert len({stem(fold(word)) for word in words}) == 1
+
+
+def test_stem_keeps_short_words():
+    assert stem('un') == 'un'
+    assert stem('sut') == 'sut'
+
+
+def test_terms_drop_stop_words():
+    assert terms('Domates ve biber ile') == [stem('domates'), stem('biber')]
+    assert terms('İçli Köfte') == terms('icli kofte')
@@ -0,0 +1,79 @@
+"""Türkçe metin normalizasyonu: büyük/küçük harf katlama, aksan katlama, basit ek atma.
+
+Arama, otomatik tamamlama ve malzeme indeksleri aynı katlamayı kullanır; böylece
+"İÇLİ KÖFTE", "içli köfte" ve "icli kofte" aynı terimlere dönüşür.
+"""
+import re
+from functools import lru_cache
+
+# Türkçe'ye özgü büyük harfler: Python'un str.lower() 'İ' için "i̇" üretir
+_UPPER_MAP = str.maketrans({'İ': 'i', 'I': 'ı'})
+
+# Aksanları ASCII karşılığına indirger (ş/s, ç/c, ğ/g, ö/o, ü/u, ı/i)
+_ACCENT_MAP = str.maketrans({
+    'ı': 'i', 'ş': 's', 'ç': 'c', 'ğ': 'g', 'ö': 'o', 'ü': 'u',
+    'â': 'a', 'î': 'i', 'û': 'u', 'é': 'e', 'è': 'e', 'ê': 'e',
+})
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Katlanmış (ASCII) hâlleriyle yaygın ekler; uzundan kısaya denenir
+_SUFFIXES = sorted({
+    'lerinden', 'larindan', 'lerinde', 'larinda', 'lerini', 'larini',
+    'leri', 'lari', 'ler', 'lar',
+    'sinin', 'sunun', 'nin', 'nun', 'in', 'un',
+    'siz', 'suz', 'li', 'lu', 'lik', 'luk',
+    'den', 'dan', 'ten', 'tan', 'de', 'da', 'te', 'ta',
+    'si', 'su', 'yi', 'yu', 'ye', 'ya', 'yle', 'yla', 'le', 'la',
+}, key=len, reverse=True)
+_SINGLE_SUFFIXES = ('i', 'u', 'e', 'a')
+_MIN_STEM = 3
+
+STOP_WORDS = frozenset({
+    've', 'ile', 'veya', 'icin', 'bir', 'bu', 'da', 'de', 'gibi', 'ya', 'cok', 'az',
+})
+
+
+def lower(text):
+    """Türkçe kurallarıyla küçük harfe çevirir; aksanlar korunur ("IŞIK" -> "ışık")"""
+    if not text:
+        return ''
+    return str(text).translate(_UPPER_MAP).lower()
+
+
+def fold(text):
+    """Metni küçük harfe çevirir ve Türkçe aksanları katlar"""
+    return lower(text).translate(_ACCENT_MAP)
+
+
+def tokenize(text):
+    """Katlanmış metni kelimelere ayırır"""
+    return _TOKEN_RE.findall(fold(text))
+
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Basit Türkçe ek atma.
+
+    Ekler sondan başa doğru en fazla üç tur soyulur ve kök en az üç harf kalır.
+    Sonuç dilbilgisel kök olmak zorunda değildir; önemli olan aynı kelimenin
+    çekimli hâllerinin ("çorba", "çorbası", "çorbaları") aynı terime inmesidir.
+    """
+    for _ in range(3):
+        stripped = token
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+                stripped = token[:-len(suffix)]
+                break
+        else:
+            if token[-1:] in _SINGLE_SUFFIXES and len(token) - 1 > _MIN_STEM:
+                stripped = token[:-1]
+        if stripped == token:
+            break
+        token = stripped
+    return token
+
+
+def terms(text):
+    """Metni indekslenecek kök terimlere çevirir (durak kelimeler atılır)"""
+    return [stem(token) for token in tokenize(text) if token not in STOP_WORDS]
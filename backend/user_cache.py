@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+
+
+class _UserState:
+    """Bir kullanıcının favori tarif id'leri ve verdiği puanlar"""
+    __slots__ = ('favorites', 'ratings')
+
+    def __init__(self, favorites, ratings):
+        self.favorites = set(favorites)
+        self.ratings = dict(ratings)
+
+
+class UserStateCache:
+    """Kullanıcı başına favori kümesi ve puan haritası tutan LRU önbellek.
+
+    Kayıtlar ilk erişimde `loader(user_id) -> (favori_idleri, {tarif_id: puan})`
+    ile yüklenir ve en fazla `max_users` kullanıcı bellekte tutulur. Yazma
+    yolları (favori ekleme/kaldırma, puan verme) yüklü kayıtları yerinde
+    günceller. Yükleme sürerken gelen bir yazma, o yüklemenin önbelleğe
+    girmesini engeller; böylece eski veri önbelleğe yerleşmez.
+    """
+
+    def __init__(self, loader, max_users=5000):
+        self._loader = loader
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, user_id):
+        user_id = int(user_id)
+        with self._lock:
+            state = self._entries.get(user_id)
+            if state is not None:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return state
+            self.misses += 1
+            # [süren yükleme sayısı, yükleme sırasında gelen yazma sayısı]
+            loading = self._loading.setdefault(user_id, [0, 0])
+            loading[0] += 1
+            writes_before = loading[1]
+
+        state = None
+        try:
+            favorites, ratings = self._loader(user_id)
+            state = _UserState(favorites, ratings)
+        finally:
+            with self._lock:
+                loading = self._loading[user_id]
+                clean = loading[1] == writes_before
+                loading[0] -= 1
+                if loading[0] == 0:
+                    del self._loading[user_id]
+                if state is not None and clean:
+                    self._entries[user_id] = state
+                    self._entries.move_to_end(user_id)
+                    while len(self._entries) > self.max_users:
+                        self._entries.popitem(last=False)
+        return state
+
+    def is_favorite(self, user_id, recipe_id):
+        return int(recipe_id) in self._get(user_id).favorites
+
+    def get_rating(self, user_id, recipe_id):
+        return self._get(user_id).ratings.get(int(recipe_id))
+
+    def get_states(self, user_id, recipe_ids):
+        """Verilen tarifler için {tarif_id: (favori_mi, puan)} döndürür"""
+        state = self._get(user_id)
+        with self._lock:
+            return {
+                recipe_id: (recipe_id in state.favorites, state.ratings.get(recipe_id))
+                for recipe_id in (int(r) for r in recipe_ids)
+            }
+
+    def snapshot(self, user_id):
+        """Kullanıcının favori kümesinin ve puan haritasının kopyaları"""
+        state = self._get(user_id)
+        with self._lock:
+            return set(state.favorites), dict(state.ratings)
+
+    def _mutate(self, user_id, apply):
+        user_id = int(user_id)
+        with self._lock:
+            if user_id in self._loading:
+                self._loading[user_id][1] += 1
+            state = self._entries.get(user_id)
+            if state is not None:
+                apply(state)
+
+    def add_favorite(self, user_id, recipe_id):
+        self._mutate(user_id, lambda state: state.favorites.add(int(recipe_id)))
+
+    def remove_favorite(self, user_id, recipe_id):
+        self._mutate(user_id, lambda state: state.favorites.discard(int(recipe_id)))
+
+    def set_rating(self, user_id, recipe_id, rating):
+        self._mutate(user_id, lambda state: state.ratings.__setitem__(int(recipe_id), rating))
+
+    def invalidate(self, user_id):
+        self._mutate(user_id, lambda state: None)
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'users': len(self._entries),
+                'max_users': self.max_users,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+
+class ViewCounter:
+    """Görüntülenme sayılarını bellekte toplayıp toplu UPDATE ile yazan write-behind sayaç.
+
+    - `record()` yalnızca kısa bir kilit alır; detay okumaları hiçbir zaman
+      veritabanı yazmasını beklemez.
+    - Artışlar (tarif, zaman dilimi) bazında toplanır ve `flush_interval`
+      saniyede bir ya da bekleyen artış sayısı `max_pending`'e ulaşınca
+      arka plan thread'inde `flush_fn({(tarif_id, dilim_başı): adet})` ile
+      yazılır. Yazma başarısız olursa artışlar kaybolmaz, sonraki turda
+      yeniden denenir.
+    - Aynı izleyicinin aynı tarifi `dedup_window` saniye içinde tekrar
+      açması sayılmaz.
+    - `stop()` bekleyen artışları son bir kez yazar (düzgün kapanış).
+    """
+
+    def __init__(self, flush_fn, flush_interval=5.0, max_pending=500,
+                 bucket_seconds=3600, dedup_window=1800, max_dedup_entries=100000):
+        self._flush_fn = flush_fn
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.bucket_seconds = bucket_seconds
+        self.dedup_window = dedup_window
+        self.max_dedup_entries = max_dedup_entries
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = defaultdict(int)
+        self._pending_total = 0
+        self._seen = {}
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.recorded = 0
+        self.deduplicated = 0
+        self.flushed = 0
+        self.flush_errors = 0
+
+    def record(self, recipe_id, viewer=None, now=None):
+        """Bir görüntülenmeyi kaydeder; tekrar sayılmışsa False döner"""
+        now = time.time() if now is None else now
+        recipe_id = int(recipe_id)
+        bucket = int(now // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            if viewer is not None:
+                key = (viewer, recipe_id)
+                last_seen = self._seen.get(key)
+                if last_seen is not None and now - last_seen < self.dedup_window:
+                    self.deduplicated += 1
+                    return False
+                self._seen[key] = now
+                if len(self._seen) > self.max_dedup_entries:
+                    self._prune_seen(now)
+            self._pending[(recipe_id, bucket)] += 1
+            self._pending_total += 1
+            self.recorded += 1
+            full = self._pending_total >= self.max_pending
+        self._ensure_started()
+        if full:
+            self._wakeup.set()
+        return True
+
+    def pending_for(self, recipe_id):
+        """Henüz veritabanına yazılmamış görüntülenme sayısı"""
+        recipe_id = int(recipe_id)
+        with self._lock:
+            return sum(count for (rid, _), count in self._pending.items() if rid == recipe_id)
+
+    def flush(self):
+        """Bekleyen artışları hemen yazar; yazılan artış sayısını döndürür"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, defaultdict(int)
+                total, self._pending_total = self._pending_total, 0
+            try:
+                self._flush_fn(dict(batch))
+            except Exception as e:
+                self.flush_errors += 1
+                self.logger.error(f"Görüntülenme sayıları yazılamadı: {str(e)}")
+                # Artışları geri koy, bir sonraki turda tekrar denenecek
+                with self._lock:
+                    for key, count in batch.items():
+                        self._pending[key] += count
+                    self._pending_total += total
+                return 0
+            self.flushed += total
+            return total
+
+    def stop(self):
+        """Arka plan thread'ini durdurur ve kalan artışları yazar"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': self._pending_total,
+                'recorded': self.recorded,
+                'deduplicated': self.deduplicated,
+                'flushed': self.flushed,
+                'flush_errors': self.flush_errors,
+            }
+
+    def _prune_seen(self, now):
+        cutoff = now - self.dedup_window
+        self._seen = {key: seen for key, seen in self._seen.items() if seen >= cutoff}
+        if len(self._seen) > self.max_dedup_entries:
+            # Pencere içindeki kayıtlar bile sığmıyorsa belleği korumak için sıfırla
+            self._seen = {}
+
+    def _ensure_started(self):
+        if self._thread is not None or self._stopped.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='view-counter', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
@@ -0,0 +1,122 @@
+import datetime
+import decimal
+import itertools
+
+# MessagePack ve CBOR isteğe bağlıdır; kurulu olmayan biçim istenirse JSON döner
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+CBOR = 'cbor'
+
+MIMETYPES = {
+    JSON: 'application/json',
+    MSGPACK: 'application/msgpack',
+    CBOR: 'application/cbor',
+}
+
+# Accept başlığında tanınan adlar; sıra eşit kalitede tercih sırasıdır (JSON önce)
+_OFFERS = (
+    ('application/json', JSON),
+    ('application/msgpack', MSGPACK),
+    ('application/vnd.msgpack', MSGPACK),
+    ('application/x-msgpack', MSGPACK),
+    ('application/cbor', CBOR),
+)
+
+
+def available_formats():
+    formats = [JSON]
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    if cbor2 is not None:
+        formats.append(CBOR)
+    return formats
+
+
+def negotiate_format(accept_mimetypes, formats=None):
+    """`request.accept_mimetypes`'a göre 'json', 'msgpack' ya da 'cbor'.
+
+    Başlık yoksa, `*/*` ise ya da istenen biçimin kütüphanesi kurulu değilse
+    JSON seçilir. `formats` yanıtın üretilebileceği biçimleri sınırlar.
+    """
+    formats = [fmt for fmt in available_formats() if formats is None or fmt in formats]
+    offers = [mimetype for mimetype, name in _OFFERS if name in formats]
+    best = accept_mimetypes.best_match(offers, default=MIMETYPES[JSON])
+    return dict(_OFFERS).get(best, JSON)
+
+
+def _plain(obj):
+    """JSON sağlayıcısıyla aynı veri modeli: DECIMAL -> float, tarih/saat -> ISO 8601"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    raise TypeError(f"{type(obj).__name__} serileştirilemez")
+
+
+_CONVERTED = (decimal.Decimal, datetime.date, datetime.time)
+# İçine inilmesi ya da dönüştürülmesi gereken tipler; geri kalan değerlere dokunulmaz
+_VISITED = frozenset((dict, list, tuple, decimal.Decimal, datetime.datetime, datetime.date, datetime.time))
+
+
+def _plain_tree(obj):
+    """CBOR için yerel DECIMAL/tarih etiketleri yerine JSON'daki değerleri koyar.
+
+    Yalnızca değişen bir değer içeren sözlük/liste kopyalanır; sorgu yolları
+    satırları zaten dönüştürdüğü için çoğu yanıt olduğu gibi yazılır.
+    """
+    if isinstance(obj, dict):
+        changed = None
+        for key, value in obj.items():
+            if type(value) in _VISITED:
+                new = _plain_tree(value)
+                if new is not value:
+                    if changed is None:
+                        changed = dict(obj)
+                    changed[key] = new
+        return obj if changed is None else changed
+    if isinstance(obj, (list, tuple)):
+        changed = None
+        for index, value in enumerate(obj):
+            if type(value) in _VISITED:
+                new = _plain_tree(value)
+                if new is not value:
+                    if changed is None:
+                        changed = list(obj)
+                    changed[index] = new
+        return obj if changed is None else changed
+    if isinstance(obj, _CONVERTED):
+        return _plain(obj)
+    return obj
+
+
+def encode(obj, fmt):
+    """Nesneyi MessagePack ya da CBOR baytlarına çevirir"""
+    if fmt == MSGPACK:
+        return msgpack.packb(obj, default=_plain, use_bin_type=True)
+    if fmt == CBOR:
+        return cbor2.dumps(_plain_tree(obj))
+    raise ValueError(f"Bilinmeyen biçim: {fmt}")
+
+
+def iter_cbor_array(items, batch_size=200):
+    """Öğe sayısı bilinmeden akıtılabilen belirsiz uzunluklu CBOR dizisi (RFC 8949 3.2.2).
+
+    MessagePack'te dizi boyu başta yazıldığı için akış karşılığı yoktur.
+    """
+    yield b'\x9f'
+    while True:
+        batch = list(itertools.islice(items, batch_size))
+        if not batch:
+            break
+        yield b''.join(cbor2.dumps(_plain_tree(item)) for item in batch)
+    yield b'\xff'